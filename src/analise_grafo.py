@@ -0,0 +1,659 @@
+import heapq
+import importlib
+import os
+import time
+from collections import OrderedDict
+from itertools import islice
+
+# =================================================================================
+#  ALGORITMOS DE GRAFO (SEM PYQT5)
+# =================================================================================
+# Este módulo não depende da interface gráfica: pode ser usado por scripts, processos de trabalho
+# e ferramentas de linha de comando. O networkx e o numpy só são importados no primeiro uso,
+# então importar este módulo é praticamente instantâneo.
+
+class _ModuloPreguicoso:
+    """Substituto de um módulo que só o importa no primeiro acesso a um atributo."""
+
+    def __init__(self, nome):
+        self._nome, self._modulo = nome, None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return getattr(self._modulo, atributo)
+
+nx = _ModuloPreguicoso('networkx')
+np = _ModuloPreguicoso('numpy')
+
+# Limites padrão usados pelos relatórios de rotas para evitar esgotar memória/tempo em grafos densos.
+MAX_ROTAS_PADRAO = 5000     # Número máximo de rotas enumeradas por consulta.
+ROTAS_MELHORES_PADRAO = 5   # Quantidade de rotas de menor custo exibidas nos relatórios.
+TAMANHO_CACHE_ROTAS = 32    # Quantidade de análises de rotas mantidas no cache da visualização.
+TEMPO_LIMITE_PADRAO = 5.0   # Tempo máximo (em segundos) gasto enumerando rotas.
+LOTE_ROTAS_PARCIAIS = 200   # Quantidade de rotas por lote entregue durante o cálculo em segundo plano.
+TAREFAS_POR_PROCESSO = 4    # Subárvores de busca por processo na enumeração paralela (equilibra a carga).
+DENSIDADE_FLOYD_WARSHALL = 0.25 # Fração de arestas (em relação a n²) a partir da qual o índice usa Floyd–Warshall.
+MAX_NOS_INDICE_CAMINHOS = 4000  # Maior grafo indexado: as duas tabelas n x n ocupam 16·n² bytes (~256 MB aqui).
+
+# =================================================================================
+#  FUNÇÕES DE MANIPULAÇÃO E CÁLCULO DE GRAFO (NETWORKX)
+# =================================================================================
+
+def extrair_arestas_da_matriz(matriz, apenas_triangulo_superior=False):
+    """
+    Extrai as arestas (células com peso positivo) de uma matriz de adjacência, que pode ser
+    uma lista de listas ou um numpy.ndarray. Retorna as listas (linhas, colunas, pesos) em
+    ordem de linha, com pesos convertidos para números Python.
+    """
+    mat = np.asarray(matriz)
+    if mat.size == 0:
+        return [], [], []
+    mascara = mat > 0 # Células com conexão (peso > 0).
+    if apenas_triangulo_superior:
+        mascara = np.triu(mascara) # Mantém a diagonal e o triângulo superior.
+    linhas, colunas = np.nonzero(mascara) # Extração vetorizada das células não nulas.
+    return linhas.tolist(), colunas.tolist(), mat[linhas, colunas].tolist()
+
+def construir_grafo_nx_da_matriz(rotulos, matriz, e_direcionado=False):
+    """
+    Constrói um objeto NetworkX Graph ou DiGraph a partir de rótulos e uma matriz de adjacência
+    (lista de listas ou numpy.ndarray). O custo da construção cresce com o número de células não nulas.
+    """
+    # Cria um grafo direcionado (DiGraph) ou não direcionado (Graph) com base na flag 'e_direcionado'.
+    G = nx.DiGraph() if e_direcionado else nx.Graph()
+    G.add_nodes_from(rotulos) # Adiciona todos os nós ao grafo.
+    linhas, colunas, pesos = extrair_arestas_da_matriz(matriz)
+    # Adiciona todas as arestas com peso positivo em uma única chamada.
+    G.add_weighted_edges_from((rotulos[i], rotulos[j], peso) for i, j, peso in zip(linhas, colunas, pesos))
+    return G
+
+def construir_grafo_nx_esparso(rotulos, indptr, indices, pesos, e_direcionado=False):
+    """
+    Constrói um Graph/DiGraph do NetworkX a partir de uma adjacência CSR (ver `Grafo.adjacencia_esparsa`).
+    O custo é proporcional ao número de nós mais o de arestas, e não ao quadrado do número de nós.
+    """
+    G = nx.DiGraph() if e_direcionado else nx.Graph()
+    G.add_nodes_from(rotulos) # Adiciona todos os nós ao grafo.
+    # Percorre apenas as células não nulas de cada linha, inserindo todas as arestas de uma vez.
+    G.add_weighted_edges_from(
+        (rotulos[i], rotulos[indices[k]], pesos[k])
+        for i in range(len(rotulos))
+        for k in range(indptr[i], indptr[i + 1])
+    )
+    return G
+
+class EnumeradorRotas:
+    """
+    Enumera sob demanda as rotas simples entre uma origem e um destino de um grafo NetworkX.
+
+    A iteração é uma busca em profundidade que produz cada rota assim que é encontrada, sem
+    materializar a lista completa. Limites opcionais:
+      - max_nos: comprimento máximo da rota em arestas (equivalente ao 'cutoff' do NetworkX);
+      - max_rotas: número máximo de rotas produzidas;
+      - tempo_limite: tempo máximo de enumeração, em segundos;
+      - custo_maximo: descarta rotas (e prefixos) com custo acima do limite (pesos não negativos).
+    Com com_custo=True produz pares (caminho, custo): o custo é acumulado durante a busca, de modo
+    que cada prefixo compartilhado entre rotas é somado uma única vez.
+    `cancelar` pode ser um threading.Event: quando sinalizado, a enumeração para na próxima iteração.
+    Ao final da iteração, `truncado` indica se a enumeração foi interrompida por max_rotas,
+    tempo_limite ou cancelamento (`motivo` informa qual) e `total` conta as rotas produzidas.
+    """
+
+    def __init__(self, G, origem, destino, max_nos=None, max_rotas=None, tempo_limite=None, custo_maximo=None,
+                 com_custo=False, cancelar=None):
+        self.G, self.origem, self.destino = G, origem, destino
+        self.com_custo = com_custo # Produz (caminho, custo) em vez de apenas o caminho.
+        self.cancelar = cancelar   # Evento que interrompe a enumeração (ex.: botão "Cancelar" da interface).
+        self.max_nos = max_nos
+        self.max_rotas = max_rotas
+        self.tempo_limite = tempo_limite
+        self.custo_maximo = custo_maximo
+        self.truncado = False # Indica se a enumeração parou antes de esgotar as rotas.
+        self.motivo = None    # 'max_rotas', 'tempo_limite' ou 'cancelado' quando truncado.
+        self.total = 0        # Número de rotas produzidas até o momento.
+
+    def _interromper(self, motivo):
+        """Marca a enumeração como truncada pelo motivo informado."""
+        self.truncado, self.motivo = True, motivo
+
+    def __iter__(self):
+        G, origem, destino = self.G, self.origem, self.destino
+        for no in (origem, destino):
+            if no not in G:
+                raise nx.NodeNotFound(f"Nó {no} não está no grafo.")
+        self.truncado, self.motivo, self.total = False, None, 0
+        inicio = time.monotonic()
+
+        if origem == destino:
+            self.total = 1
+            yield ([origem], 0) if self.com_custo else [origem] # A rota trivial, como no NetworkX.
+            return
+
+        limite = len(G) - 1 if self.max_nos is None else self.max_nos # Comprimento máximo em arestas.
+        if limite < 1:
+            return
+        adjacencia = G.adj # Sucessores em DiGraph, vizinhos em Graph.
+
+        caminho, custos, visitados = [origem], [0], {origem} # Prefixo atual, custos acumulados e nós usados.
+        pilha = [iter(adjacencia[origem].items())]           # Vizinhos ainda não explorados de cada nó do prefixo.
+        while pilha:
+            if self.tempo_limite is not None and time.monotonic() - inicio > self.tempo_limite:
+                self._interromper('tempo_limite')
+                return
+            if self.cancelar is not None and self.cancelar.is_set():
+                self._interromper('cancelado')
+                return
+            proximo = next(pilha[-1], None)
+            if proximo is None:
+                # Todos os vizinhos do último nó foram explorados: retrocede.
+                pilha.pop()
+                visitados.discard(caminho.pop())
+                custos.pop()
+                continue
+            vizinho, atributos = proximo
+            if vizinho in visitados:
+                continue
+            custo = custos[-1] + atributos.get('weight', 1)
+            if self.custo_maximo is not None and custo > self.custo_maximo:
+                continue # Poda: nenhuma extensão deste prefixo respeita o custo máximo.
+            if vizinho == destino:
+                self.total += 1
+                yield (caminho + [destino], custo) if self.com_custo else caminho + [destino]
+                if self.max_rotas is not None and self.total >= self.max_rotas:
+                    self._interromper('max_rotas')
+                    return
+            elif len(caminho) < limite:
+                # Avança para o vizinho, que ainda pode levar ao destino dentro do limite de comprimento.
+                caminho.append(vizinho)
+                custos.append(custo)
+                visitados.add(vizinho)
+                pilha.append(iter(adjacencia[vizinho].items()))
+
+def descrever_truncamento(enumerador):
+    """Retorna uma frase explicando por que a enumeração de rotas foi interrompida."""
+    if enumerador.motivo == 'max_rotas':
+        return f"Enumeração interrompida após {enumerador.total} rotas (limite de rotas atingido)."
+    if enumerador.motivo == 'cancelado':
+        return f"Enumeração cancelada após {enumerador.total} rotas."
+    return f"Enumeração interrompida após {enumerador.total} rotas (limite de tempo atingido)."
+
+def obter_todas_rotas(G, origem, destino, max_nos=None, max_rotas=None, tempo_limite=None):
+    """
+    Obtém em uma lista as rotas simples entre uma origem e um destino em um grafo NetworkX.
+    Para grafos grandes prefira iterar diretamente sobre um `EnumeradorRotas`.
+    """
+    # 'max_nos' limita o comprimento máximo do caminho (como o 'cutoff' do NetworkX).
+    return list(EnumeradorRotas(G, origem, destino, max_nos, max_rotas, tempo_limite))
+
+# ---------------------------------------------------------------------------------
+#  Enumeração paralela de rotas (ProcessPoolExecutor)
+# ---------------------------------------------------------------------------------
+
+_adjacencia_trabalhador = None # Cópia compacta do grafo recebida por cada processo do pool.
+
+def _iniciar_processo_rotas(adjacencia):
+    """Inicializador do pool: guarda a cópia do grafo uma única vez por processo, e não por tarefa."""
+    global _adjacencia_trabalhador
+    _adjacencia_trabalhador = adjacencia
+
+def _resumir_subarvore_rotas(prefixo, custo_prefixo, destino, limite, k, prazo):
+    """
+    Enumera as rotas simples que começam com `prefixo` (índices de nós) e terminam em `destino`.
+    Retorna (total, k menores como [(custo, caminho)], maior (custo, caminho) ou None, truncado).
+    `prazo` é um instante absoluto (time.time()) após o qual a busca é interrompida.
+    """
+    adjacencia = _adjacencia_trabalhador
+    total, menores, maior = 0, [], None # 'menores' é um heap máximo (custo negado) com as k menores rotas.
+    caminho, custos = list(prefixo), [custo_prefixo]
+    visitados = set(prefixo)
+    pilha = [iter(adjacencia[caminho[-1]])]
+    passos = 0
+    while pilha:
+        passos += 1
+        if prazo is not None and passos % 4096 == 0 and time.time() > prazo:
+            return total, sorted((-c, caminho) for c, _, caminho in menores), maior, True
+        proximo = next(pilha[-1], None)
+        if proximo is None:
+            pilha.pop()
+            if len(caminho) > len(prefixo):
+                visitados.discard(caminho.pop()) # Nunca retrocede além do prefixo da tarefa.
+                custos.pop()
+            continue
+        vizinho, peso = proximo
+        if vizinho in visitados:
+            continue
+        custo = custos[-1] + peso
+        if vizinho == destino:
+            total += 1
+            if len(menores) < k:
+                heapq.heappush(menores, (-custo, total, caminho + [destino]))
+            elif k and -menores[0][0] > custo:
+                heapq.heapreplace(menores, (-custo, total, caminho + [destino]))
+            if maior is None or custo > maior[0]:
+                maior = (custo, caminho + [destino])
+        elif len(caminho) < limite:
+            caminho.append(vizinho)
+            custos.append(custo)
+            visitados.add(vizinho)
+            pilha.append(iter(adjacencia[vizinho]))
+    return total, sorted((-c, caminho) for c, _, caminho in menores), maior, False
+
+def _prefixos_rotas(adjacencia, origem, destino, limite, alvo):
+    """
+    Divide a árvore de busca a partir da origem em prefixos independentes (primeiro salto e, se a
+    origem tiver poucos vizinhos para ocupar `alvo` tarefas, os saltos seguintes).
+    Retorna (prefixos como (caminho, custo), rotas que chegaram ao destino durante a divisão).
+    """
+    prefixos, completas = [([origem], 0)], []
+    expandiu = True
+    while expandiu and len(prefixos) < alvo:
+        expandidos, expandiu = [], False
+        for caminho, custo in prefixos:
+            if len(caminho) >= limite:
+                expandidos.append((caminho, custo)) # Não pode crescer mais: continua como está.
+                continue
+            expandiu = True
+            for vizinho, peso in adjacencia[caminho[-1]]:
+                if vizinho == destino:
+                    completas.append((custo + peso, caminho + [destino]))
+                elif vizinho not in caminho:
+                    expandidos.append((caminho + [vizinho], custo + peso))
+        prefixos = expandidos
+    return prefixos, completas
+
+def resumir_rotas_paralelo(G, origem, destino, max_nos=None, k=ROTAS_MELHORES_PADRAO, processos=None,
+                           tempo_limite=None):
+    """
+    Enumera todas as rotas simples entre origem e destino em paralelo, sem materializar a lista.
+
+    Cada prefixo de rota (o primeiro salto a partir da origem, aprofundado quando há poucos vizinhos)
+    é a raiz de uma subárvore de busca independente; as subárvores são distribuídas entre processos
+    de um ProcessPoolExecutor, que recebem uma cópia compacta do grafo (listas de (vizinho, peso)
+    indexadas por inteiros). Os resultados parciais são combinados em um dicionário:
+      - 'total': número de rotas simples (dentro de max_nos arestas);
+      - 'melhores': as k rotas de menor custo, como (caminho, custo);
+      - 'mais_curta' / 'mais_longa': (caminho, custo) da rota de menor / maior custo, ou None;
+      - 'truncado': se o tempo_limite interrompeu alguma subárvore (os valores são então parciais).
+    Com processos=1 a enumeração é feita no próprio processo.
+    """
+    for no in (origem, destino):
+        if no not in G:
+            raise nx.NodeNotFound(f"Nó {no} não está no grafo.")
+    resumo = {'total': 0, 'melhores': [], 'mais_curta': None, 'mais_longa': None, 'truncado': False}
+    if origem == destino:
+        resumo.update(total=1, melhores=[([origem], 0)], mais_curta=([origem], 0), mais_longa=([origem], 0))
+        return resumo
+    nos = list(G.nodes)
+    indice = {no: i for i, no in enumerate(nos)}
+    adjacencia = [[(indice[v], atributos.get('weight', 1)) for v, atributos in G.adj[u].items()] for u in nos]
+    s, t = indice[origem], indice[destino]
+    limite = len(nos) - 1 if max_nos is None else max_nos # Comprimento máximo em arestas.
+    if limite < 1:
+        return resumo
+
+    processos = processos or os.cpu_count() or 1
+    prefixos, completas = _prefixos_rotas(adjacencia, s, t, limite, processos * TAREFAS_POR_PROCESSO)
+    prazo = None if tempo_limite is None else time.time() + tempo_limite
+    parciais = [(len(completas), sorted(completas)[:k], max(completas, default=None), False)]
+    if processos == 1 or len(prefixos) == 1:
+        _iniciar_processo_rotas(adjacencia)
+        parciais += [_resumir_subarvore_rotas(p, c, t, limite, k, prazo) for p, c in prefixos]
+    elif prefixos:
+        from concurrent.futures import ProcessPoolExecutor # Importado só quando há processos a criar.
+        with ProcessPoolExecutor(min(processos, len(prefixos)), initializer=_iniciar_processo_rotas,
+                                 initargs=(adjacencia,)) as executor:
+            futuros = [executor.submit(_resumir_subarvore_rotas, p, c, t, limite, k, prazo) for p, c in prefixos]
+            parciais += [futuro.result() for futuro in futuros]
+
+    # Combina os resultados: soma os totais, une os top-k parciais e escolhe a maior rota.
+    melhores, maior = [], None
+    for total, menores, maior_parcial, truncado in parciais:
+        resumo['total'] += total
+        resumo['truncado'] |= truncado
+        melhores = heapq.nsmallest(k, melhores + menores)
+        if maior_parcial is not None and (maior is None or maior_parcial[0] > maior[0]):
+            maior = maior_parcial
+    resumo['melhores'] = [([nos[i] for i in caminho], custo) for custo, caminho in melhores]
+    resumo['mais_curta'] = resumo['melhores'][0] if resumo['melhores'] else None
+    if maior is not None:
+        resumo['mais_longa'] = ([nos[i] for i in maior[1]], maior[0])
+    return resumo
+
+def obter_k_rotas_mais_curtas(G, origem, destino, k=ROTAS_MELHORES_PADRAO, cancelar=None):
+    """
+    Obtém as k rotas simples de menor custo, em ordem crescente de custo, como uma lista de (caminho, custo).
+
+    Usa o algoritmo de Yen (shortest_simple_paths do NetworkX), que encontra cada nova rota com
+    buscas de Dijkstra em tempo polinomial, sem enumerar todas as rotas simples do grafo.
+    Se o evento `cancelar` for sinalizado, retorna as rotas encontradas até então.
+    """
+    rotas = []
+    try:
+        for caminho in islice(nx.shortest_simple_paths(G, origem, destino, weight='weight'), k):
+            rotas.append((caminho, nx.path_weight(G, caminho, weight='weight')))
+            if cancelar is not None and cancelar.is_set():
+                break
+    except nx.NetworkXNoPath:
+        pass # Nenhuma rota entre os nós.
+    return rotas
+
+def obter_caminho_mais_curto(G, origem, destino):
+    """Obtém o caminho mais curto (menor custo) entre uma origem e um destino usando o algoritmo de Dijkstra."""
+    try:
+        # Usa dijkstra_path do NetworkX, que encontra o caminho de menor custo em grafos ponderados.
+        return nx.dijkstra_path(G, origem, destino, weight='weight')
+    except nx.NetworkXNoPath:
+        return None # Retorna None se não houver caminho.
+
+def _nos_candidatos_rota(G, origem, destino):
+    """Retorna os nós que podem aparecer em alguma rota origem -> destino (vazio se não houver rota)."""
+    if G.is_directed():
+        # Um nó só está em uma rota se for alcançável a partir da origem e alcançar o destino.
+        alcancaveis = nx.descendants(G, origem)
+        if destino not in alcancaveis:
+            return set()
+        return (alcancaveis & nx.ancestors(G, destino)) | {origem, destino}
+    componente = nx.node_connected_component(G, origem)
+    return componente if destino in componente else set()
+
+def _rota_mais_longa_dag(G, nos, origem, destino):
+    """Programação dinâmica em ordem topológica: rota de maior custo em um grafo acíclico, em tempo linear."""
+    melhor, anterior = {origem: 0}, {} # Maior custo conhecido até cada nó e o predecessor correspondente.
+    for u in nx.topological_sort(G.subgraph(nos)):
+        if u not in melhor:
+            continue
+        for v, atributos in G.adj[u].items():
+            if v in nos:
+                custo = melhor[u] + atributos.get('weight', 1)
+                if custo > melhor.get(v, -float('inf')):
+                    melhor[v], anterior[v] = custo, u
+    caminho = [destino]
+    while caminho[-1] != origem:
+        caminho.append(anterior[caminho[-1]])
+    return {'caminho': caminho[::-1], 'custo': melhor[destino], 'exato': True}
+
+def _rota_mais_longa_busca(G, nos, origem, destino, tempo_limite, cancelar, inicial):
+    """
+    Busca em profundidade com poda por limite superior (branch and bound) para grafos com ciclos.
+
+    A busca parte de uma rota conhecida `inicial` (caminho, custo), então sempre há uma resposta,
+    mesmo se o tempo acabar antes de a busca chegar ao destino. Os nós visitados são um bitset (int);
+    ao entrar em um nó, uma busca em largura sobre os nós não visitados verifica se o destino ainda é
+    alcançável (se não for, o ramo é descartado) e soma o maior peso de entrada de cada nó alcançável,
+    o que dá o limite superior do custo de qualquer continuação.
+    """
+    nos = list(nos)
+    indice = {no: k for k, no in enumerate(nos)}
+    vizinhos = [[] for _ in nos]  # Para cada nó: (índice do vizinho, peso), do maior para o menor peso.
+    max_entrada = [0] * len(nos)  # Maior peso de aresta que chega a cada nó.
+    for u in nos:
+        for v, atributos in G.adj[u].items():
+            if v in indice:
+                peso = atributos.get('weight', 1)
+                vizinhos[indice[u]].append((indice[v], peso))
+                max_entrada[indice[v]] = max(max_entrada[indice[v]], peso)
+    for lista in vizinhos:
+        lista.sort(key=lambda par: -par[1]) # Explora primeiro as arestas caras para encontrar boas rotas cedo.
+
+    s, t = indice[origem], indice[destino]
+
+    def limite_restante(v, visitados):
+        """Soma dos maiores pesos de entrada dos nós alcançáveis de v sem repetir nós, ou None se t não for alcançável."""
+        vistos, pilha, soma, alcanca = visitados | 1 << v, [v], 0, False
+        while pilha:
+            for w, _ in vizinhos[pilha.pop()]:
+                if not vistos >> w & 1:
+                    vistos |= 1 << w
+                    soma += max_entrada[w]
+                    if w == t:
+                        alcanca = True # A rota termina em t: não continua a partir dele.
+                    else:
+                        pilha.append(w)
+        return soma if alcanca else None
+
+    melhor_caminho, melhor_custo = [indice[no] for no in inicial[0]], inicial[1]
+    exato = True
+    caminho, proximos = [s], [0]                          # Rota parcial e próximo vizinho a explorar em cada nó.
+    custos = [0]
+    visitados = 1 << s                                    # Bitset dos nós da rota parcial.
+    inicio = time.monotonic()
+    while caminho:
+        if (tempo_limite is not None and time.monotonic() - inicio > tempo_limite) or \
+                (cancelar is not None and cancelar.is_set()):
+            exato = False # Retorna a melhor rota encontrada até aqui.
+            break
+        u, k = caminho[-1], proximos[-1]
+        if k == len(vizinhos[u]):
+            # Todos os vizinhos explorados: retrocede.
+            visitados &= ~(1 << u)
+            caminho.pop(); proximos.pop(); custos.pop()
+            continue
+        proximos[-1] = k + 1
+        v, peso = vizinhos[u][k]
+        if visitados >> v & 1:
+            continue
+        custo = custos[-1] + peso
+        if v == t:
+            if custo > melhor_custo:
+                melhor_custo, melhor_caminho = custo, caminho + [t]
+            continue
+        restante = limite_restante(v, visitados)
+        if restante is None or custo + restante <= melhor_custo:
+            # Poda: t não é mais alcançável, ou nem usando as arestas mais caras a rota superaria a melhor conhecida.
+            continue
+        caminho.append(v); proximos.append(0); custos.append(custo)
+        visitados |= 1 << v
+
+    return {'caminho': [nos[k] for k in melhor_caminho], 'custo': melhor_custo, 'exato': exato}
+
+def obter_rota_mais_longa(G, origem, destino, tempo_limite=None, cancelar=None, rotas_conhecidas=None):
+    """
+    Obtém a rota simples de maior custo entre origem e destino sem precisar da lista de todas as rotas.
+
+    Retorna um dicionário {'caminho', 'custo', 'exato'} ou None se não houver rota. Em grafos
+    direcionados acíclicos a solução é exata e linear; nos demais casos (problema NP-difícil) é
+    usada uma busca com poda, e 'exato' é False se o tempo_limite ou o evento `cancelar` interromper a busca.
+    A busca parte da mais cara das `rotas_conhecidas` ((caminho, custo), ex.: as rotas de Yen) ou, se
+    não forem informadas, da rota de Dijkstra: interrompida, ela devolve ao menos essa rota.
+    """
+    for no in (origem, destino):
+        if no not in G:
+            raise nx.NodeNotFound(f"Nó {no} não está no grafo.")
+    if origem == destino:
+        return {'caminho': [origem], 'custo': 0, 'exato': True}
+    nos = _nos_candidatos_rota(G, origem, destino)
+    if not nos:
+        return None
+    if G.is_directed() and nx.is_directed_acyclic_graph(G.subgraph(nos)):
+        return _rota_mais_longa_dag(G, nos, origem, destino)
+    if rotas_conhecidas:
+        inicial = max(rotas_conhecidas, key=lambda rota: rota[1])
+    else:
+        caminho = obter_caminho_mais_curto(G, origem, destino)
+        inicial = (caminho, nx.path_weight(G, caminho, weight='weight'))
+    return _rota_mais_longa_busca(G, nos, origem, destino, tempo_limite, cancelar, inicial)
+
+def obter_caminho_mais_longo_seguro(G, origem, destino, todas_rotas=None):
+    """
+    Obtém o caminho mais longo (maior custo) entre uma origem e um destino.
+    Se `todas_rotas` for informada, escolhe entre elas; caso contrário usa `obter_rota_mais_longa`.
+    """
+    if todas_rotas is None:
+        resultado = obter_rota_mais_longa(G, origem, destino)
+        return resultado['caminho'] if resultado else None
+    if not todas_rotas:
+        return None # Retorna None se não houver rotas.
+    # Encontra o caminho com o maior 'weight' (custo total) entre todas as rotas fornecidas.
+    return max(todas_rotas, key=lambda caminho: nx.path_weight(G, caminho, weight='weight'))
+
+def calcular_analise_rotas(G, origem, destino, max_nos=None, max_rotas=MAX_ROTAS_PADRAO,
+                           tempo_limite=TEMPO_LIMITE_PADRAO, k=ROTAS_MELHORES_PADRAO, listar_rotas=True,
+                           cancelar=None, ao_encontrar_rotas=None, tamanho_lote=LOTE_ROTAS_PARCIAIS):
+    """
+    Reúne em um dicionário a análise de rotas entre origem e destino:
+      - 'rotas': as rotas simples enumeradas dentro dos limites, como (caminho, custo) (se listar_rotas);
+      - 'truncado' e 'aviso_truncamento': se a enumeração foi interrompida e por quê;
+      - 'melhores': as k rotas de menor custo, como (caminho, custo);
+      - 'mais_curta': (caminho, custo) da rota de menor custo, ou None;
+      - 'mais_longa': o resultado de `obter_rota_mais_longa`, ou None;
+      - 'cancelado': se o evento `cancelar` interrompeu a análise (as etapas seguintes são omitidas).
+    A listagem é feita primeiro; `ao_encontrar_rotas`, se informado, recebe as rotas em lotes de
+    `tamanho_lote` à medida que são encontradas.
+    """
+    analise = {'origem': origem, 'destino': destino, 'rotas': [], 'truncado': False, 'aviso_truncamento': None,
+               'melhores': [], 'mais_curta': None, 'mais_longa': None, 'cancelado': False}
+    if listar_rotas:
+        enumerador = EnumeradorRotas(G, origem, destino, max_nos, max_rotas, tempo_limite, com_custo=True,
+                                     cancelar=cancelar)
+        rotas, lote = analise['rotas'], []
+        for rota in enumerador:
+            rotas.append(rota)
+            if ao_encontrar_rotas is not None:
+                lote.append(rota)
+                if len(lote) >= tamanho_lote:
+                    ao_encontrar_rotas(lote)
+                    lote = []
+        if lote:
+            ao_encontrar_rotas(lote) # Entrega as rotas restantes do último lote.
+        if enumerador.truncado:
+            analise['truncado'], analise['aviso_truncamento'] = True, descrever_truncamento(enumerador)
+
+    if cancelar is not None and cancelar.is_set():
+        analise['cancelado'] = True
+        return analise
+    melhores = obter_k_rotas_mais_curtas(G, origem, destino, k, cancelar)
+    analise['melhores'] = melhores
+    analise['mais_curta'] = melhores[0] if melhores else None # A primeira rota de Yen é a de Dijkstra.
+    if melhores:
+        analise['mais_longa'] = obter_rota_mais_longa(G, origem, destino, tempo_limite, cancelar, melhores)
+    analise['cancelado'] = cancelar is not None and cancelar.is_set()
+    return analise
+
+class CacheLRU:
+    """Cache de tamanho fixo que descarta o item usado há mais tempo (LRU)."""
+
+    def __init__(self, capacidade=TAMANHO_CACHE_ROTAS):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor da chave (marcando-o como usado recentemente) ou `padrao`."""
+        if chave not in self._itens:
+            return padrao
+        self._itens.move_to_end(chave)
+        return self._itens[chave]
+
+    def guardar(self, chave, valor):
+        """Armazena um valor, descartando o item menos usado se a capacidade for excedida."""
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def limpar(self):
+        """Remove todos os itens do cache."""
+        self._itens.clear()
+
+class IndiceCaminhosMinimos:
+    """
+    Índice de caminhos mínimos entre todos os pares de nós de um grafo NetworkX.
+
+    As tabelas de distâncias e predecessores (matrizes n x n do numpy) são calculadas uma única vez:
+    com Floyd–Warshall vetorizado em grafos densos e com um Dijkstra por origem em grafos esparsos.
+    Depois disso, custo e rota mais curta entre quaisquer dois nós são respondidos em O(tamanho da rota).
+    `versao` registra a versão do grafo para a qual o índice foi calculado. Grafos com mais de `max_nos`
+    nós são recusados com ValueError antes de qualquer alocação.
+    """
+
+    def __init__(self, G, versao=None, densidade_floyd=DENSIDADE_FLOYD_WARSHALL, max_nos=MAX_NOS_INDICE_CAMINHOS):
+        n = G.number_of_nodes()
+        if max_nos is not None and n > max_nos:
+            raise ValueError(f"O índice de caminhos mínimos aceita até {max_nos} nós (o grafo tem {n}); as "
+                             f"tabelas n x n ocupariam {16 * n * n / 1e9:.1f} GB.")
+        self.versao = versao
+        self.nos = list(G.nodes)
+        self._indice = {no: i for i, no in enumerate(self.nos)}
+        self._dist = np.full((n, n), np.inf) # Distância mínima de i a j (inf se não houver rota).
+        np.fill_diagonal(self._dist, 0)
+        self._pred = np.full((n, n), -1, dtype=np.int64) # Predecessor de j na rota mínima a partir de i.
+        # Custos são devolvidos como int quando todos os pesos são inteiros (como nas demais rotas).
+        self._pesos_inteiros = all(isinstance(p, (int, np.integer)) for _, _, p in G.edges(data='weight', default=1))
+        arestas = G.number_of_edges() * (1 if G.is_directed() else 2)
+        self.metodo = 'floyd_warshall' if n and arestas >= densidade_floyd * n * n else 'dijkstra'
+        if self.metodo == 'floyd_warshall':
+            self._calcular_floyd_warshall(G)
+        else:
+            self._calcular_dijkstra(G)
+
+    def _calcular_floyd_warshall(self, G):
+        """Floyd–Warshall com cada iteração de k feita sobre a matriz inteira (O(n³), sem laços por par)."""
+        dist, pred, indice = self._dist, self._pred, self._indice
+        for u, v, peso in G.edges(data='weight', default=1):
+            i, j = indice[u], indice[v]
+            if i == j:
+                continue # Laços nunca fazem parte de uma rota mínima.
+            for a, b in ((i, j),) if G.is_directed() else ((i, j), (j, i)):
+                if peso < dist[a, b]:
+                    dist[a, b], pred[a, b] = peso, a
+        for k in range(len(self.nos)):
+            novo = dist[:, k, None] + dist[k] # Custo de i a j passando por k, para todos os pares.
+            melhora = novo < dist
+            # A linha e a coluna k nunca melhoram (dist[k, k] = 0), então podem ser atualizadas no lugar.
+            np.copyto(dist, novo, where=melhora)
+            np.copyto(pred, np.broadcast_to(pred[k], pred.shape), where=melhora)
+
+    def _calcular_dijkstra(self, G):
+        """Um Dijkstra a partir de cada nó: O(n·(n + m)·log n), melhor que Floyd–Warshall em grafos esparsos."""
+        indice, n = self._indice, len(self.nos)
+        # Adjacência por índices inteiros, montada uma vez e reaproveitada por todas as origens.
+        adjacencia = [[(indice[v], atributos.get('weight', 1)) for v, atributos in G.adj[u].items()] for u in self.nos]
+        infinito = float('inf')
+        for s in range(n):
+            dist, pred = [infinito] * n, [-1] * n
+            dist[s] = 0
+            fila = [(0, s)]
+            while fila:
+                d, u = heapq.heappop(fila)
+                if d > dist[u]:
+                    continue # Entrada obsoleta da fila.
+                for v, peso in adjacencia[u]:
+                    nova = d + peso
+                    if nova < dist[v]:
+                        dist[v], pred[v] = nova, u
+                        heapq.heappush(fila, (nova, v))
+            self._dist[s] = dist # Atribuição da linha inteira de uma vez.
+            self._pred[s] = pred
+
+    def _indices(self, origem, destino):
+        """Converte os rótulos de origem e destino em índices das tabelas."""
+        for no in (origem, destino):
+            if no not in self._indice:
+                raise nx.NodeNotFound(f"Nó {no} não está no grafo.")
+        return self._indice[origem], self._indice[destino]
+
+    def custo(self, origem, destino):
+        """Retorna o custo da rota mais curta entre origem e destino, ou None se não houver rota."""
+        i, j = self._indices(origem, destino)
+        distancia = self._dist[i, j]
+        if np.isinf(distancia):
+            return None
+        return int(distancia) if self._pesos_inteiros else float(distancia)
+
+    def caminho(self, origem, destino):
+        """Reconstrói a rota mais curta seguindo a tabela de predecessores, ou None se não houver rota."""
+        i, j = self._indices(origem, destino)
+        if np.isinf(self._dist[i, j]):
+            return None
+        caminho = [j]
+        while caminho[-1] != i:
+            caminho.append(int(self._pred[i, caminho[-1]]))
+        return [self.nos[k] for k in reversed(caminho)]
+
+    def rota_mais_curta(self, origem, destino):
+        """Retorna (caminho, custo) da rota mais curta, ou None se não houver rota."""
+        caminho = self.caminho(origem, destino)
+        return None if caminho is None else (caminho, self.custo(origem, destino))
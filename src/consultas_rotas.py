@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from analise_grafo import (construir_grafo_nx_da_matriz, obter_k_rotas_mais_curtas, obter_rota_mais_longa,
+                           ROTAS_MELHORES_PADRAO, TEMPO_LIMITE_PADRAO)
+from rotulos import resolver_rotulo  # Rótulos digitados: exatos ou, se ausentes, em maiúsculas.
+
+# =================================================================================
+#  CONSULTAS DE ROTAS EM LOTE (SEM INTERFACE GRÁFICA)
+# =================================================================================
+# Uso: python consultas_rotas.py dados_grafo.txt pares.txt -f csv -o resultados.csv
+# O grafo é lido do arquivo TXT salvo por "Salvar Grafo (TXT)" ou de um arquivo binário .grafo;
+# os pares (origem, destino), um por linha, vêm de um arquivo ou da entrada padrão ("-").
+
+COLUNAS_CSV = ['origem', 'destino', 'mais_curta', 'custo_mais_curta', 'mais_longa', 'custo_mais_longa',
+               'mais_longa_exata', 'melhores', 'erro']
+
+def ler_grafo_txt(arquivo):
+    """
+    Lê a matriz de adjacência de um arquivo salvo por "Salvar Grafo (TXT)".
+    Retorna (rotulos, matriz, e_direcionado). A seção de resultados de rotas é ignorada.
+    """
+    linhas = iter(arquivo)
+    for linha in linhas:
+        if "MATRIZ DE ADJACÊNCIA" in linha:
+            e_direcionado = "Não-Orientado" not in linha
+            break
+    else:
+        raise ValueError("Cabeçalho da matriz de adjacência não encontrado.")
+
+    cabecalho = next(linhas, "").strip()
+    if not cabecalho or cabecalho.startswith("Nenhum nó"):
+        return [], [], e_direcionado # Grafo salvo sem nós.
+    rotulos = cabecalho.split()
+    next(linhas, None) # Linha de traços abaixo do cabeçalho.
+    matriz = []
+    for linha in linhas:
+        if "|" not in linha:
+            break # Fim da matriz (linha em branco antes dos resultados).
+        rotulo, valores = linha.split("|", 1)
+        valores = [float(v) if "." in v else int(v) for v in valores.split()]
+        if rotulo.strip() != rotulos[len(matriz)] or len(valores) != len(rotulos):
+            raise ValueError(f"Linha da matriz inválida: {linha.strip()}")
+        matriz.append(valores)
+    if len(matriz) != len(rotulos):
+        raise ValueError("A matriz de adjacência está incompleta.")
+    return rotulos, matriz, e_direcionado
+
+def ler_pares(arquivo, nos=()):
+    """
+    Itera sobre os pares (origem, destino) de um arquivo: um par por linha, separado por vírgula,
+    ponto e vírgula, tabulação ou espaço. Linhas vazias, comentários (#) e o cabeçalho "origem,destino" são ignorados.
+    Os rótulos valem como escritos; com `nos` informado, um rótulo ausente é procurado também em maiúsculas
+    (ver `resolver_rotulo`).
+    """
+    for linha in arquivo:
+        campos = linha.replace(",", " ").replace(";", " ").split()
+        if not campos or campos[0].startswith("#") or campos[0].lower() == "origem":
+            continue
+        if len(campos) != 2:
+            raise ValueError(f"Par inválido: {linha.strip()}")
+        yield resolver_rotulo(campos[0], nos), resolver_rotulo(campos[1], nos)
+
+def consultar_par(G, origem, destino, k=ROTAS_MELHORES_PADRAO, tempo_limite=TEMPO_LIMITE_PADRAO, mais_longa=True):
+    """
+    Calcula para um par: a rota mais curta, as k melhores e (opcionalmente) a mais longa.
+    Retorna um dicionário serializável em JSON; pares com nós inexistentes recebem 'erro'.
+    """
+    resultado = {'origem': origem, 'destino': destino, 'mais_curta': None, 'melhores': [], 'mais_longa': None,
+                 'erro': None}
+    for no in (origem, destino):
+        if no not in G:
+            resultado['erro'] = f"Nó {no} não está no grafo."
+            return resultado
+    melhores = obter_k_rotas_mais_curtas(G, origem, destino, k)
+    resultado['melhores'] = [{'caminho': caminho, 'custo': custo} for caminho, custo in melhores]
+    if melhores:
+        resultado['mais_curta'] = resultado['melhores'][0] # A primeira rota de Yen é a de Dijkstra.
+        if mais_longa:
+            resultado['mais_longa'] = obter_rota_mais_longa(G, origem, destino, tempo_limite, rotas_conhecidas=melhores)
+    return resultado
+
+# ---------------------------------------------------------------------------------
+#  Execução em paralelo: cada processo recebe o grafo uma única vez (initializer)
+# ---------------------------------------------------------------------------------
+
+_contexto_processo = None # (G, k, tempo_limite, mais_longa) do processo atual.
+
+def _iniciar_processo_consultas(G, k, tempo_limite, mais_longa):
+    """Inicializador do pool: guarda o grafo e os parâmetros da consulta no processo."""
+    global _contexto_processo
+    _contexto_processo = (G, k, tempo_limite, mais_longa)
+
+def _consultar_par_processo(par):
+    """Consulta um par usando o grafo guardado pelo inicializador do processo."""
+    G, k, tempo_limite, mais_longa = _contexto_processo
+    return consultar_par(G, par[0], par[1], k, tempo_limite, mais_longa)
+
+def consultar_pares(G, pares, k=ROTAS_MELHORES_PADRAO, tempo_limite=TEMPO_LIMITE_PADRAO, mais_longa=True,
+                    processos=None, tamanho_bloco=64):
+    """
+    Consulta um lote de pares sobre o mesmo grafo, produzindo os resultados na ordem dos pares.
+    Com processos > 1 os pares são distribuídos em blocos entre processos de um ProcessPoolExecutor.
+    """
+    processos = processos or os.cpu_count() or 1
+    if processos == 1:
+        for origem, destino in pares:
+            yield consultar_par(G, origem, destino, k, tempo_limite, mais_longa)
+        return
+    from concurrent.futures import ProcessPoolExecutor # Importado só quando há processos a criar.
+    with ProcessPoolExecutor(processos, initializer=_iniciar_processo_consultas,
+                             initargs=(G, k, tempo_limite, mais_longa)) as executor:
+        yield from executor.map(_consultar_par_processo, pares, chunksize=tamanho_bloco)
+
+def _formatar_rota(rota):
+    """Converte uma rota {'caminho', 'custo'} em texto para o CSV."""
+    return "" if rota is None else " → ".join(rota['caminho'])
+
+def escrever_resultados(resultados, saida, formato='jsonl'):
+    """Escreve os resultados como JSON Lines (um objeto por linha) ou CSV. Retorna quantos foram escritos."""
+    total = 0
+    if formato == 'csv':
+        escritor = csv.DictWriter(saida, fieldnames=COLUNAS_CSV)
+        escritor.writeheader()
+    for resultado in resultados:
+        if formato == 'csv':
+            curta, longa = resultado['mais_curta'], resultado['mais_longa']
+            escritor.writerow({
+                'origem': resultado['origem'], 'destino': resultado['destino'],
+                'mais_curta': _formatar_rota(curta), 'custo_mais_curta': curta['custo'] if curta else "",
+                'mais_longa': _formatar_rota(longa), 'custo_mais_longa': longa['custo'] if longa else "",
+                'mais_longa_exata': longa['exato'] if longa else "",
+                'melhores': " | ".join(f"{_formatar_rota(rota)} ({rota['custo']})" for rota in resultado['melhores']),
+                'erro': resultado['erro'] or "",
+            })
+        else:
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        total += 1
+    return total
+
+def main(argumentos=None):
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Consulta rotas em lote sobre um grafo salvo em TXT.")
+    parser.add_argument('grafo', help="arquivo TXT ou .grafo salvo pelo aplicativo")
+    parser.add_argument('pares', nargs='?', default='-', help="arquivo com pares origem,destino ('-' = entrada padrão)")
+    parser.add_argument('-f', '--formato', choices=['jsonl', 'csv'], default='jsonl', help="formato de saída")
+    parser.add_argument('-o', '--saida', default='-', help="arquivo de saída ('-' = saída padrão)")
+    parser.add_argument('-k', type=int, default=ROTAS_MELHORES_PADRAO, help="quantidade de melhores rotas por par")
+    parser.add_argument('-p', '--processos', type=int, default=None, help="processos em paralelo (padrão: CPUs)")
+    parser.add_argument('--tempo-limite', type=float, default=TEMPO_LIMITE_PADRAO,
+                        help="tempo máximo (s) da busca pela rota mais longa de cada par")
+    parser.add_argument('--sem-mais-longa', action='store_true', help="não calcula a rota mais longa")
+    args = parser.parse_args(argumentos)
+    from formato_grafo import abrir_grafo, EXTENSAO # Importado aqui: o formato binário depende do numpy.
+
+    # O grafo é construído uma única vez para todo o lote.
+    if args.grafo.endswith(EXTENSAO):
+        G = abrir_grafo(args.grafo).para_networkx()
+    else:
+        with open(args.grafo, encoding='utf-8') as arquivo:
+            rotulos, matriz, e_direcionado = ler_grafo_txt(arquivo)
+        G = construir_grafo_nx_da_matriz(rotulos, matriz, e_direcionado)
+
+    entrada = sys.stdin if args.pares == '-' else open(args.pares, encoding='utf-8')
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8', newline='')
+    try:
+        resultados = consultar_pares(G, ler_pares(entrada, G), args.k, args.tempo_limite, not args.sem_mais_longa,
+                                     args.processos)
+        total = escrever_resultados(resultados, saida, args.formato)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+    print(f"{total} pares consultados.", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
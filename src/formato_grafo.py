@@ -0,0 +1,258 @@
+import struct
+from array import array
+import numpy as np
+from nucleo_grafo import Grafo  # Núcleo do grafo em Python puro (sem PyQt5).
+
+# =================================================================================
+#  FORMATO BINÁRIO DE GRAFOS (.grafo)
+# =================================================================================
+# Layout do arquivo (little-endian, seções alinhadas em 8 bytes):
+#   cabeçalho (64 bytes) | arestas | indptr | rótulos | posições
+#   - cabeçalho: assinatura, versão, flags, número de nós e de arestas e o deslocamento de cada seção;
+#   - arestas: registros (destino int64, peso float64) agrupados por origem (CSR);
+#   - indptr: int64[n + 1]; as arestas que saem do nó k ficam em arestas[indptr[k]:indptr[k + 1]];
+#   - rótulos: int64[n + 1] com os deslocamentos de cada rótulo seguido dos rótulos em UTF-8;
+#   - posições: float64[n, 2] com (x, y) de cada nó.
+# Em grafos não direcionados cada aresta é gravada uma única vez, na orientação em que foi inserida.
+# As arestas vêm primeiro para que o escritor possa gravá-las em fluxo, sem mantê-las em memória;
+# as seções pequenas (indptr, rótulos, posições) são gravadas no fechamento.
+
+ASSINATURA = b'GRAFOBIN'
+VERSAO_FORMATO = 1
+CABECALHO = struct.Struct('<8sIIQQQQQQ')  # assinatura, versão, flags, n, m e os 4 deslocamentos.
+FLAG_DIRECIONADO = 1                     # O grafo é direcionado.
+FLAG_PESOS_INTEIROS = 2                  # Todos os pesos são inteiros (convertidos de volta ao carregar).
+TIPO_ARESTA = np.dtype([('destino', '<i8'), ('peso', '<f8')])
+EXTENSAO = '.grafo'
+
+def _alinhar(arquivo):
+    """Completa o arquivo com zeros até a próxima posição múltipla de 8."""
+    resto = arquivo.tell() % 8
+    if resto:
+        arquivo.write(b'\0' * (8 - resto))
+
+class EscritorGrafo:
+    """
+    Grava um arquivo .grafo em fluxo: as arestas vão para o disco em blocos, à medida que são
+    adicionadas, e só os nós (rótulos e posições) e o indptr ficam em memória.
+
+    As arestas devem ser adicionadas em ordem não decrescente de origem (índice do nó). Os índices
+    são os devolvidos por `adicionar_no`; uma aresta pode referenciar nós adicionados depois dela.
+    Use como gerenciador de contexto ou chame `fechar` ao final.
+    """
+
+    def __init__(self, caminho, e_direcionado=False, tamanho_bloco=65536):
+        self.caminho = caminho
+        self.e_direcionado = e_direcionado
+        self._arquivo = open(caminho, 'wb')
+        self._arquivo.write(b'\0' * CABECALHO.size)  # O cabeçalho é preenchido no fechamento.
+        self._rotulos, self._x, self._y = [], array('d'), array('d')
+        self._indptr = array('q', [0])        # Início de cada linha já fechada (mais o início da atual).
+        self._bloco = np.empty(tamanho_bloco, TIPO_ARESTA)
+        self._no_bloco = 0                    # Registros ocupados no bloco atual.
+        self.numero_arestas = 0
+        self._maior_indice = -1               # Maior índice de nó referenciado por uma aresta.
+        self._pesos_inteiros = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        if tipo is None:
+            self.fechar()
+        else:
+            self._arquivo.close()  # Arquivo incompleto: sem cabeçalho, não será aceito na leitura.
+
+    @property
+    def numero_nos(self):
+        return len(self._rotulos)
+
+    def adicionar_no(self, rotulo, x=0.0, y=0.0):
+        """Adiciona um nó e retorna seu índice no arquivo."""
+        self._rotulos.append(rotulo)
+        self._x.append(x)
+        self._y.append(y)
+        return len(self._rotulos) - 1
+
+    def _avancar_ate(self, origem):
+        """Fecha as linhas anteriores à origem informada (que não podem mais receber arestas)."""
+        if origem < len(self._indptr) - 1:
+            raise ValueError("As arestas devem ser adicionadas em ordem não decrescente de origem.")
+        self._maior_indice = max(self._maior_indice, origem)
+        while len(self._indptr) < origem + 1:
+            self._indptr.append(self.numero_arestas)
+
+    def adicionar_aresta(self, origem, destino, peso=1):
+        """Adiciona a aresta origem -> destino (índices de nós)."""
+        self._avancar_ate(origem)
+        if self._no_bloco == len(self._bloco):
+            self._descarregar()
+        self._bloco[self._no_bloco] = (destino, peso)
+        self._no_bloco += 1
+        self.numero_arestas += 1
+        self._maior_indice = max(self._maior_indice, destino)
+        if self._pesos_inteiros and not isinstance(peso, (int, np.integer)):
+            self._pesos_inteiros = False
+
+    def adicionar_linha(self, origem, destinos, pesos):
+        """Adiciona de uma vez todas as arestas que saem de `origem` (arrays de destinos e pesos)."""
+        destinos, pesos = np.asarray(destinos, dtype=np.int64), np.asarray(pesos)
+        if not len(destinos):
+            return
+        self._avancar_ate(origem)
+        self._descarregar()
+        registros = np.empty(len(destinos), TIPO_ARESTA)
+        registros['destino'], registros['peso'] = destinos, pesos
+        registros.tofile(self._arquivo)  # Vai direto para o disco, sem passar pelo bloco.
+        self.numero_arestas += len(destinos)
+        self._maior_indice = max(self._maior_indice, int(destinos.max()))
+        if self._pesos_inteiros and pesos.dtype.kind not in 'iu':
+            self._pesos_inteiros = False
+
+    def adicionar_bloco(self, origens, destinos, pesos):
+        """Adiciona um bloco de arestas em arrays já ordenados por origem, sem laços em Python."""
+        origens = np.asarray(origens, dtype=np.int64)
+        destinos, pesos = np.asarray(destinos, dtype=np.int64), np.asarray(pesos)
+        if not len(origens):
+            return
+        if np.any(origens[1:] < origens[:-1]):
+            raise ValueError("As arestas devem ser adicionadas em ordem não decrescente de origem.")
+        primeira, ultima = int(origens[0]), int(origens[-1])
+        self._avancar_ate(primeira)
+        # Início, dentro do arquivo, de cada linha aberta pelo bloco (da primeira + 1 até a última origem).
+        self._indptr.extend((self.numero_arestas + np.searchsorted(origens, np.arange(primeira + 1, ultima + 1)))
+                            .tolist())
+        self._descarregar()
+        registros = np.empty(len(destinos), TIPO_ARESTA)
+        registros['destino'], registros['peso'] = destinos, pesos
+        registros.tofile(self._arquivo)
+        self.numero_arestas += len(destinos)
+        self._maior_indice = max(self._maior_indice, ultima, int(destinos.max()))
+        if self._pesos_inteiros and pesos.dtype.kind not in 'iu':
+            self._pesos_inteiros = False
+
+    def _descarregar(self):
+        """Grava no arquivo os registros acumulados no bloco."""
+        if self._no_bloco:
+            self._bloco[:self._no_bloco].tofile(self._arquivo)
+            self._no_bloco = 0
+
+    def fechar(self):
+        """Grava as seções finais e o cabeçalho e fecha o arquivo."""
+        self._descarregar()
+        n = len(self._rotulos)
+        if self._maior_indice >= n:
+            self._arquivo.close()
+            raise ValueError("Há arestas referenciando nós que não foram adicionados.")
+        self._avancar_ate(n)
+        arquivo = self._arquivo
+
+        _alinhar(arquivo)
+        deslocamento_indptr = arquivo.tell()
+        np.frombuffer(self._indptr, dtype=np.int64).astype('<i8').tofile(arquivo)
+
+        deslocamento_rotulos = arquivo.tell()
+        codificados = [str(rotulo).encode('utf-8') for rotulo in self._rotulos]
+        inicios = np.zeros(n + 1, dtype='<i8')
+        np.cumsum([len(c) for c in codificados], out=inicios[1:])
+        inicios.tofile(arquivo)
+        arquivo.write(b''.join(codificados))
+        _alinhar(arquivo)
+
+        deslocamento_posicoes = arquivo.tell()
+        np.column_stack([np.frombuffer(self._x, dtype=np.float64),
+                         np.frombuffer(self._y, dtype=np.float64)]).astype('<f8').tofile(arquivo)
+
+        flags = (FLAG_DIRECIONADO if self.e_direcionado else 0) | (FLAG_PESOS_INTEIROS if self._pesos_inteiros else 0)
+        arquivo.seek(0)
+        arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO_FORMATO, flags, n, self.numero_arestas, CABECALHO.size,
+                                     deslocamento_indptr, deslocamento_rotulos, deslocamento_posicoes))
+        arquivo.close()
+
+class GrafoBinario:
+    """
+    Grafo aberto de um arquivo .grafo. Com mapear=True (padrão) as seções são mapeadas em memória
+    (numpy.memmap): abrir o arquivo não lê nem interpreta as arestas, que são carregadas sob demanda
+    pelo sistema operacional. Os arrays `indptr`, `destinos`, `pesos` e `posicoes` são somente leitura.
+    """
+
+    def __init__(self, caminho, mapear=True):
+        self.caminho = caminho
+        dados = np.memmap(caminho, dtype=np.uint8, mode='r') if mapear else np.fromfile(caminho, dtype=np.uint8)
+        if len(dados) < CABECALHO.size:
+            raise ValueError("Arquivo de grafo inválido (muito curto).")
+        (assinatura, versao, flags, n, m, desl_arestas, desl_indptr, desl_rotulos,
+         desl_posicoes) = CABECALHO.unpack(bytes(dados[:CABECALHO.size]))
+        if assinatura != ASSINATURA:
+            raise ValueError("Arquivo de grafo inválido (assinatura não reconhecida).")
+        if versao != VERSAO_FORMATO:
+            raise ValueError(f"Versão {versao} do formato de grafo não suportada.")
+        self.e_direcionado = bool(flags & FLAG_DIRECIONADO)
+        self.pesos_inteiros = bool(flags & FLAG_PESOS_INTEIROS)
+        self.numero_nos, self.numero_arestas = n, m
+        arestas = np.frombuffer(dados, TIPO_ARESTA, m, desl_arestas)
+        self.destinos, self.pesos = arestas['destino'], arestas['peso']
+        self.indptr = np.frombuffer(dados, '<i8', n + 1, desl_indptr)
+        self._inicios_rotulos = np.frombuffer(dados, '<i8', n + 1, desl_rotulos)
+        self._texto_rotulos = dados[desl_rotulos + 8 * (n + 1):]
+        self.posicoes = np.frombuffer(dados, '<f8', 2 * n, desl_posicoes).reshape(n, 2)
+        self._rotulos = None
+
+    @property
+    def rotulos(self):
+        """Rótulos dos nós, decodificados no primeiro acesso."""
+        if self._rotulos is None:
+            texto, inicios = bytes(self._texto_rotulos[:self._inicios_rotulos[-1]]), self._inicios_rotulos.tolist()
+            self._rotulos = [texto[a:b].decode('utf-8') for a, b in zip(inicios, inicios[1:])]
+        return self._rotulos
+
+    def origens(self):
+        """Array com a origem (índice) de cada aresta, expandido a partir do indptr."""
+        return np.repeat(np.arange(self.numero_nos, dtype=np.int64), np.diff(self.indptr))
+
+    def lista_pesos(self):
+        """Pesos como números Python (int quando o arquivo foi gravado só com pesos inteiros)."""
+        return (self.pesos.astype(np.int64) if self.pesos_inteiros else self.pesos).tolist()
+
+    def arestas(self):
+        """Itera sobre as arestas como tuplas (rótulo de origem, rótulo de destino, peso)."""
+        rotulos = self.rotulos
+        for i, j, peso in zip(self.origens().tolist(), self.destinos.tolist(), self.lista_pesos()):
+            yield rotulos[i], rotulos[j], peso
+
+    def para_networkx(self):
+        """Constrói o Graph/DiGraph do NetworkX usado pelas funções de análise (ver `analise_grafo`)."""
+        import networkx as nx
+        G = nx.DiGraph() if self.e_direcionado else nx.Graph()
+        G.add_nodes_from(self.rotulos)
+        G.add_weighted_edges_from(self.arestas())
+        return G
+
+    def para_grafo(self, grafo=None):
+        """Carrega o conteúdo em um núcleo `Grafo` (novo ou o informado, que é limpo antes)."""
+        if grafo is None:
+            grafo = Grafo(self.e_direcionado)
+        grafo.carregar_indexado(self.rotulos, self.posicoes[:, 0].tolist(), self.posicoes[:, 1].tolist(),
+                                self.origens().tolist(), self.destinos.tolist(), self.lista_pesos(), self.e_direcionado)
+        return grafo
+
+def salvar_grafo(caminho, grafo):
+    """Grava um núcleo `Grafo` em um arquivo .grafo."""
+    rotulos, xs, ys, origens, destinos, pesos = grafo.exportar_indexado()
+    origens = np.frombuffer(origens, dtype=np.int64)
+    ordem = np.argsort(origens, kind='stable')  # Agrupa as arestas por origem (CSR).
+    inteiros = all(isinstance(peso, int) for peso in pesos)
+    pesos = np.asarray(pesos, dtype=np.int64 if inteiros else np.float64)[ordem]
+    destinos = np.frombuffer(destinos, dtype=np.int64)[ordem]
+    with EscritorGrafo(caminho, grafo.e_direcionado) as escritor:
+        for rotulo, x, y in zip(rotulos, xs, ys):
+            escritor.adicionar_no(rotulo, x, y)
+        escritor.adicionar_bloco(origens[ordem], destinos, pesos)
+
+def abrir_grafo(caminho, mapear=True):
+    """Abre um arquivo .grafo (mapeado em memória por padrão). Ver `GrafoBinario`."""
+    return GrafoBinario(caminho, mapear)
+
+def carregar_grafo(caminho, grafo=None):
+    """Lê um arquivo .grafo para um núcleo `Grafo` (novo ou o informado)."""
+    return abrir_grafo(caminho).para_grafo(grafo)
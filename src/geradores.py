@@ -0,0 +1,295 @@
+import argparse
+import sys
+import time
+import numpy as np
+from nucleo_grafo import Grafo  # Núcleo do grafo em Python puro (sem PyQt5).
+from formato_grafo import EscritorGrafo  # Formato binário (.grafo).
+from layout_grafo import posicoes_circulares  # Layout circular inicial (o mesmo da importação).
+from rotulos import gerar_rotulos  # Rótulos sequenciais A..Z, AA, AB...
+
+# =================================================================================
+#  GERADORES DE GRAFOS ALEATÓRIOS (SEMEADOS E VETORIZADOS)
+# =================================================================================
+# Uso: python geradores.py gnm 100000 1000000 grafo.grafo --semente 42
+# Modelos: Erdős–Rényi G(n, m) e G(n, p), Barabási–Albert, grade viária e DAG aleatório. As arestas
+# são sorteadas em blocos pelo numpy (numpy.random.Generator): a mesma semente produz sempre o mesmo
+# grafo, e um grafo de um milhão de arestas é gerado em poucos segundos. O resultado pode ser gravado
+# direto em um arquivo .grafo (sem passar pelo núcleo) ou carregado de uma vez em um `Grafo`.
+
+PESO_MINIMO_PADRAO, PESO_MAXIMO_PADRAO = 1, 100  # Pesos inteiros sorteados (como no "Grafo Aleatório").
+ESPACAMENTO_GRADE = 80.0                          # Distância entre cruzamentos vizinhos na grade viária.
+MODELOS = {                                       # Nome usado na linha de comando -> descrição.
+    'gnm': "Erdős–Rényi G(n, m)",
+    'gnp': "Erdős–Rényi G(n, p)",
+    'ba': "Barabási–Albert",
+    'grade': "Grade viária",
+    'dag': "DAG aleatório",
+}
+
+class GrafoGerado:
+    """
+    Grafo produzido por um gerador: n nós (ids 0..n-1) e arrays numpy com as extremidades e os pesos
+    das arestas, sem repetições nem laços e ordenadas por origem (ordem CSR do formato .grafo).
+    """
+
+    def __init__(self, origens, destinos, pesos, posicoes, e_direcionado, rotulos=None):
+        self.origens, self.destinos, self.pesos = origens, destinos, pesos
+        self.posicoes = posicoes  # float64[n, 2] com (x, y) de cada nó.
+        self.e_direcionado = e_direcionado
+        self._rotulos = rotulos
+
+    @property
+    def numero_nos(self):
+        return len(self.posicoes)
+
+    @property
+    def numero_arestas(self):
+        return len(self.origens)
+
+    @property
+    def rotulos(self):
+        """Rótulos dos nós (A, B, ... Z, AA...), gerados no primeiro acesso se não foram informados."""
+        if self._rotulos is None:
+            self._rotulos = gerar_rotulos(self.numero_nos)
+        return self._rotulos
+
+    @rotulos.setter
+    def rotulos(self, rotulos):
+        self._rotulos = list(rotulos)
+
+    def para_grafo(self, grafo=None):
+        """Carrega o grafo gerado em um núcleo `Grafo` (novo ou o informado, que é limpo antes)."""
+        if grafo is None:
+            grafo = Grafo(self.e_direcionado)
+        grafo.carregar_indexado(self.rotulos, self.posicoes[:, 0].tolist(), self.posicoes[:, 1].tolist(),
+                                self.origens.tolist(), self.destinos.tolist(), self.pesos.tolist(), self.e_direcionado)
+        return grafo
+
+    def salvar(self, caminho):
+        """Grava o grafo gerado em um arquivo .grafo (as arestas já estão em ordem CSR)."""
+        with EscritorGrafo(caminho, self.e_direcionado) as escritor:
+            for rotulo, (x, y) in zip(self.rotulos, self.posicoes.tolist()):
+                escritor.adicionar_no(rotulo, x, y)
+            escritor.adicionar_bloco(self.origens, self.destinos, self.pesos)
+
+def _gerador(semente):
+    """Gerador do numpy para a semente informada (None = semente aleatória)."""
+    return np.random.default_rng(semente)
+
+def _numero_pares(n, direcionado):
+    """Quantidade de arestas possíveis entre n nós, sem laços."""
+    return n * (n - 1) if direcionado else n * (n - 1) // 2
+
+def _pares_distintos(rng, n, m, direcionado):
+    """
+    Sorteia uniformemente m pares distintos (i, j), i != j (com i < j se não direcionado), em ordem CSR.
+    Os pares são sorteados em blocos e repetições são descartadas após uma ordenação; se m passa de
+    metade dos pares possíveis, sorteia diretamente m posições da lista de todos os pares.
+    """
+    total = _numero_pares(n, direcionado)
+    if m > total:
+        raise ValueError(f"Um grafo com {n} nós admite no máximo {total} arestas (pedidas: {m}).")
+    if 2 * m > total:
+        # Grafo denso: a lista de todos os pares tem menos de 2m elementos.
+        if direcionado:
+            i, j = np.divmod(np.arange(n * n, dtype=np.int64), n)
+            i, j = i[i != j], j[i != j]
+        else:
+            i, j = np.triu_indices(n, 1)
+        escolhidos = np.sort(rng.choice(total, m, replace=False))
+        return i[escolhidos].astype(np.int64), j[escolhidos].astype(np.int64)
+
+    chaves = np.empty(0, dtype=np.int64)
+    while len(chaves) < m:
+        sorteios = (m - len(chaves)) * 9 // 8 + 16  # Folga para os pares repetidos e os laços descartados.
+        i, j = rng.integers(0, n, sorteios), rng.integers(0, n, sorteios)
+        if not direcionado:
+            i, j = np.minimum(i, j), np.maximum(i, j)  # A-B e B-A são a mesma aresta.
+        # A chave i * n + j ordena por origem; pares já sorteados são descartados.
+        chaves = _unicos_ordenados(np.concatenate([chaves, (i * n + j)[i != j]]))
+    if len(chaves) > m:
+        chaves = np.sort(rng.choice(chaves, m, replace=False))  # Subconjunto uniforme dos pares sorteados.
+    return np.divmod(chaves, n)
+
+def _unicos_ordenados(chaves):
+    """Valores distintos de `chaves`, em ordem crescente (ordenação + comparação com o vizinho)."""
+    chaves = np.sort(chaves)
+    if len(chaves):
+        chaves = chaves[np.concatenate(([True], chaves[1:] != chaves[:-1]))]
+    return chaves
+
+def _pesos_aleatorios(rng, quantidade, peso_minimo, peso_maximo):
+    """Pesos inteiros uniformes em [peso_minimo, peso_maximo]."""
+    return rng.integers(peso_minimo, peso_maximo + 1, quantidade, dtype=np.int64)
+
+def _ordenar_csr(origens, destinos, pesos):
+    """Ordena as arestas por origem (e por destino dentro de cada origem)."""
+    ordem = np.lexsort((destinos, origens))
+    return origens[ordem], destinos[ordem], pesos[ordem]
+
+def gerar_gnm(n, m, direcionado=False, semente=None, peso_minimo=PESO_MINIMO_PADRAO, peso_maximo=PESO_MAXIMO_PADRAO):
+    """Erdős–Rényi G(n, m): m arestas distintas sorteadas uniformemente entre n nós."""
+    rng = _gerador(semente)
+    origens, destinos = _pares_distintos(rng, n, m, direcionado)
+    return GrafoGerado(origens, destinos, _pesos_aleatorios(rng, m, peso_minimo, peso_maximo),
+                       posicoes_circulares(n), direcionado)
+
+def gerar_gnp(n, p, direcionado=False, semente=None, peso_minimo=PESO_MINIMO_PADRAO, peso_maximo=PESO_MAXIMO_PADRAO):
+    """
+    Erdős–Rényi G(n, p): cada aresta possível existe com probabilidade p. O número de arestas é
+    sorteado de uma binomial e as arestas, como em G(n, m), o que dá exatamente a mesma distribuição
+    sem testar cada um dos n² pares.
+    """
+    if not 0 <= p <= 1:
+        raise ValueError("A probabilidade p deve estar entre 0 e 1.")
+    rng = _gerador(semente)
+    m = int(rng.binomial(_numero_pares(n, direcionado), p))
+    origens, destinos = _pares_distintos(rng, n, m, direcionado)
+    return GrafoGerado(origens, destinos, _pesos_aleatorios(rng, m, peso_minimo, peso_maximo),
+                       posicoes_circulares(n), direcionado)
+
+def gerar_barabasi_albert(n, ligacoes, direcionado=False, semente=None, peso_minimo=PESO_MINIMO_PADRAO,
+                          peso_maximo=PESO_MAXIMO_PADRAO):
+    """
+    Barabási–Albert: cada nó novo se liga a `ligacoes` nós existentes, escolhidos com probabilidade
+    proporcional ao grau (ligação preferencial). Segue o algoritmo de Batagelj e Brandes: o alvo de uma
+    ligação é uma extremidade sorteada entre as ligações anteriores, e as cadeias "o alvo de uma ligação
+    anterior" são resolvidas por saltos de ponteiros vetorizados. Ligações repetidas de um mesmo nó são
+    descartadas, então o número de arestas fica ligeiramente abaixo de ligacoes * (n - ligacoes).
+    Se direcionado, as arestas vão do nó novo para o existente.
+    """
+    if not 1 <= ligacoes < n:
+        raise ValueError("O número de ligações por nó deve estar entre 1 e n - 1.")
+    rng = _gerador(semente)
+    total = ligacoes * (n - ligacoes)  # Ligações k = 0..total-1; as do nó v ocupam um bloco de `ligacoes`.
+    k = np.arange(total, dtype=np.int64)
+    fontes = ligacoes + k // ligacoes  # O primeiro nó novo (ligacoes) se liga a todos os nós iniciais.
+    alvos = np.empty(total, dtype=np.int64)
+    alvos[:ligacoes] = np.arange(ligacoes)
+    resolvido = np.zeros(total, dtype=bool)
+    resolvido[:ligacoes] = True
+
+    # As ligações anteriores ao bloco do nó formam a lista 2 * inicio de extremidades (fonte, alvo, fonte...);
+    # sortear uma posição dessa lista é sortear um nó com probabilidade proporcional ao grau.
+    resto = k[ligacoes:]
+    posicoes = (rng.random(len(resto)) * (2 * (resto - resto % ligacoes))).astype(np.int64)
+    referencias = np.full(total, -1, dtype=np.int64)
+    par = posicoes % 2 == 0
+    alvos[resto[par]] = fontes[posicoes[par] // 2]  # Posição par: a fonte de uma ligação anterior.
+    resolvido[resto[par]] = True
+    pendentes = resto[~par]
+    referencias[pendentes] = posicoes[~par] // 2   # Posição ímpar: o alvo (ainda desconhecido) de uma ligação anterior.
+    while len(pendentes):
+        alvo_referencia = referencias[pendentes]
+        prontos = resolvido[alvo_referencia]
+        alvos[pendentes[prontos]] = alvos[alvo_referencia[prontos]]
+        resolvido[pendentes[prontos]] = True
+        pendentes = pendentes[~prontos]
+        referencias[pendentes] = referencias[referencias[pendentes]]  # Salto de ponteiro: encurta a cadeia pela metade.
+
+    origens, destinos = fontes, alvos
+    if not direcionado:
+        origens, destinos = np.minimum(fontes, alvos), np.maximum(fontes, alvos)
+    chaves = _unicos_ordenados(origens * n + destinos)  # Descarta as ligações repetidas (já em ordem CSR).
+    origens, destinos = np.divmod(chaves, n)
+    return GrafoGerado(origens, destinos, _pesos_aleatorios(rng, len(chaves), peso_minimo, peso_maximo),
+                       posicoes_circulares(n), direcionado)
+
+def gerar_grade_viaria(linhas, colunas, direcionado=False, semente=None, prob_remocao=0.1, prob_diagonal=0.05,
+                       deslocamento=0.2):
+    """
+    Grade viária: cruzamentos em uma grade linhas x colunas ligados aos vizinhos da direita e de baixo.
+    Cada rua é removida com probabilidade `prob_remocao`, diagonais são criadas com probabilidade
+    `prob_diagonal` e os cruzamentos são deslocados aleatoriamente (fração `deslocamento` do espaçamento).
+    O peso de uma rua é o seu comprimento (em décimos do espaçamento) multiplicado por um fator de
+    trânsito entre 1 e 1,5. Se direcionado, cada rua mantida tem mão dupla (uma aresta em cada sentido).
+    """
+    if linhas < 1 or colunas < 1:
+        raise ValueError("A grade deve ter ao menos uma linha e uma coluna.")
+    rng = _gerador(semente)
+    n = linhas * colunas
+    ids = np.arange(n, dtype=np.int64).reshape(linhas, colunas)
+    ruas = [
+        (ids[:, :-1].ravel(), ids[:, 1:].ravel()),   # Horizontais.
+        (ids[:-1, :].ravel(), ids[1:, :].ravel()),   # Verticais.
+    ]
+    diagonais = (ids[:-1, :-1].ravel(), ids[1:, 1:].ravel())
+    sorteio = rng.random(len(diagonais[0])) < prob_diagonal
+    ruas.append((diagonais[0][sorteio], diagonais[1][sorteio]))
+    origens = np.concatenate([a for a, _ in ruas])
+    destinos = np.concatenate([b for _, b in ruas])
+    mantidas = rng.random(len(origens)) >= prob_remocao
+    origens, destinos = origens[mantidas], destinos[mantidas]
+
+    linha, coluna = np.divmod(np.arange(n), colunas)
+    posicoes = np.column_stack([coluna, linha]).astype(np.float64) * ESPACAMENTO_GRADE
+    posicoes += rng.uniform(-deslocamento, deslocamento, (n, 2)) * ESPACAMENTO_GRADE
+    if direcionado:
+        origens, destinos = np.concatenate([origens, destinos]), np.concatenate([destinos, origens])
+    comprimentos = np.hypot(*(posicoes[destinos] - posicoes[origens]).T) / ESPACAMENTO_GRADE
+    pesos = np.maximum(1, np.rint(10 * comprimentos * rng.uniform(1.0, 1.5, len(origens)))).astype(np.int64)
+    return GrafoGerado(*_ordenar_csr(origens, destinos, pesos), posicoes, direcionado)
+
+def gerar_dag(n, m, semente=None, peso_minimo=PESO_MINIMO_PADRAO, peso_maximo=PESO_MAXIMO_PADRAO):
+    """
+    DAG aleatório: m arestas distintas i -> j com i antes de j em uma ordem topológica sorteada
+    (uma permutação dos nós), então o grafo nunca tem ciclos e os rótulos não revelam a ordem.
+    """
+    rng = _gerador(semente)
+    anteriores, posteriores = _pares_distintos(rng, n, m, False)  # Pares i < j na ordem topológica.
+    ordem = rng.permutation(n)  # Posição na ordem topológica -> id do nó.
+    pesos = _pesos_aleatorios(rng, m, peso_minimo, peso_maximo)
+    return GrafoGerado(*_ordenar_csr(ordem[anteriores], ordem[posteriores], pesos), posicoes_circulares(n), True)
+
+def main(argumentos=None):
+    """Ponto de entrada da linha de comando: gera um grafo aleatório e grava um arquivo .grafo."""
+    parser = argparse.ArgumentParser(description="Gera um grafo aleatório (semeado) e grava um arquivo .grafo.")
+    semente = argparse.ArgumentParser(add_help=False)
+    semente.add_argument('--semente', type=int, default=None, help="semente do gerador (padrão: aleatória)")
+    pesos = argparse.ArgumentParser(add_help=False)
+    pesos.add_argument('--pesos', type=int, nargs=2, default=(PESO_MINIMO_PADRAO, PESO_MAXIMO_PADRAO),
+                       metavar=('MIN', 'MAX'), help="intervalo dos pesos inteiros sorteados")
+    direcao = argparse.ArgumentParser(add_help=False)
+    direcao.add_argument('--direcionado', action='store_true', help="gera um grafo direcionado")
+    modelos = parser.add_subparsers(dest='modelo', required=True, metavar='MODELO')
+
+    gnm = modelos.add_parser('gnm', parents=[semente, pesos, direcao], help=MODELOS['gnm'])
+    gnm.add_argument('n', type=int, help="número de nós")
+    gnm.add_argument('m', type=int, help="número de arestas")
+    gnp = modelos.add_parser('gnp', parents=[semente, pesos, direcao], help=MODELOS['gnp'])
+    gnp.add_argument('n', type=int, help="número de nós")
+    gnp.add_argument('p', type=float, help="probabilidade de cada aresta")
+    ba = modelos.add_parser('ba', parents=[semente, pesos, direcao], help=MODELOS['ba'])
+    ba.add_argument('n', type=int, help="número de nós")
+    ba.add_argument('ligacoes', type=int, help="ligações de cada nó novo")
+    grade = modelos.add_parser('grade', parents=[semente, direcao], help=MODELOS['grade'])
+    grade.add_argument('linhas', type=int, help="linhas da grade")
+    grade.add_argument('colunas', type=int, help="colunas da grade")
+    grade.add_argument('--remocao', type=float, default=0.1, help="probabilidade de remover cada rua")
+    grade.add_argument('--diagonal', type=float, default=0.05, help="probabilidade de criar cada diagonal")
+    dag = modelos.add_parser('dag', parents=[semente, pesos], help=MODELOS['dag'])
+    dag.add_argument('n', type=int, help="número de nós")
+    dag.add_argument('m', type=int, help="número de arestas")
+    for subparser in (gnm, gnp, ba, grade, dag):
+        subparser.add_argument('saida', help="arquivo .grafo a gravar")
+    args = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    intervalo = {'peso_minimo': args.pesos[0], 'peso_maximo': args.pesos[1]} if 'pesos' in args else {}
+    if args.modelo == 'gnm':
+        gerado = gerar_gnm(args.n, args.m, args.direcionado, args.semente, **intervalo)
+    elif args.modelo == 'gnp':
+        gerado = gerar_gnp(args.n, args.p, args.direcionado, args.semente, **intervalo)
+    elif args.modelo == 'ba':
+        gerado = gerar_barabasi_albert(args.n, args.ligacoes, args.direcionado, args.semente, **intervalo)
+    elif args.modelo == 'grade':
+        gerado = gerar_grade_viaria(args.linhas, args.colunas, args.direcionado, args.semente, args.remocao,
+                                    args.diagonal)
+    else:
+        gerado = gerar_dag(args.n, args.m, args.semente, **intervalo)
+    gerado.salvar(args.saida)
+    print(f"{MODELOS[args.modelo]}: {gerado.numero_nos:,} nós, {gerado.numero_arestas:,} arestas "
+          f"em {time.perf_counter() - inicio:.2f} s -> {args.saida}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
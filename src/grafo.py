@@ -1,14 +1,43 @@
 import networkx as nx
+import numpy as np
 import random
+from array import array
+from contextlib import contextmanager
 from PyQt5.QtWidgets import (
-    QGraphicsView, QGraphicsEllipseItem, QGraphicsLineItem,
+    QGraphicsView, QGraphicsItem, QGraphicsEllipseItem,
     QGraphicsTextItem, QGraphicsScene, QGraphicsDropShadowEffect,
     QMessageBox, QInputDialog
 )
 from PyQt5.QtGui import (QPen, QColor, QFont, QPainter, QBrush, QPolygonF,
-                         QPainterPath, QTransform)
-from PyQt5.QtCore import Qt, pyqtSignal, QPointF, QRectF
+                         QPainterPath, QPainterPathStroker, QTransform)
+from PyQt5.QtCore import Qt, pyqtSignal, QPointF, QRectF, QLineF, QTimer
 from math import cos, sin, atan2, pi, sqrt, radians
+from nucleo_grafo import Grafo  # Núcleo do grafo em Python puro (sem PyQt5).
+from formato_grafo import salvar_grafo, carregar_grafo  # Formato binário (.grafo).
+from indice_espacial import GradeEspacial  # Índice em grade das arestas (culling e cliques).
+from rotulos import AlocadorRotulos  # Rótulos livres (A..Z, AA, AB...) para novos nós.
+from geradores import gerar_gnm  # Geradores de grafos aleatórios (semeados, vetorizados).
+from layout_grafo import posicoes_circulares  # Layout circular dos nós gerados.
+# Algoritmos e constantes de rotas (módulo sem PyQt5), reexportados para quem importa de 'grafo'.
+from analise_grafo import (
+    MAX_ROTAS_PADRAO, ROTAS_MELHORES_PADRAO, TAMANHO_CACHE_ROTAS, TEMPO_LIMITE_PADRAO, LOTE_ROTAS_PARCIAIS,
+    TAREFAS_POR_PROCESSO, DENSIDADE_FLOYD_WARSHALL, extrair_arestas_da_matriz, construir_grafo_nx_da_matriz,
+    construir_grafo_nx_esparso, EnumeradorRotas, descrever_truncamento, obter_todas_rotas,
+    resumir_rotas_paralelo, obter_k_rotas_mais_curtas, obter_caminho_mais_curto, obter_rota_mais_longa,
+    obter_caminho_mais_longo_seguro, calcular_analise_rotas, CacheLRU, IndiceCaminhosMinimos, MAX_NOS_INDICE_CAMINHOS
+)
+
+# Níveis de detalhe: fator de escala da visualização abaixo do qual cada elemento é simplificado.
+LOD_ROTULOS = 0.45          # Rótulos dos nós e pesos das arestas são ocultados.
+LOD_SETAS = 0.35            # Pontas de seta das arestas direcionadas deixam de ser desenhadas.
+LOD_EFEITOS = 0.6           # Sombra do nó selecionado e antialiasing são desativados.
+LOD_LINHAS_AGRUPADAS = 0.2  # Arestas viram linhas simples de 1 pixel, sem curvas nem setas; nós viram quadrados.
+ZOOM_MINIMO, ZOOM_MAXIMO = 0.02, 8.0 # Limites do zoom pela roda do mouse.
+FATOR_ZOOM = 1.15           # Fator de zoom por passo da roda do mouse.
+INTERVALO_NOTIFICACAO_MS = 50 # Espera após a última alteração antes de emitir grafoAlterado (agrupa rajadas).
+TOLERANCIA_CLIQUE = 4       # Distância máxima (em pixels da tela) de um clique até a linha de uma aresta.
+# Maior grafo desenhado: cada nó e aresta é um item da cena (~4 s de carga no limite). Grafos maiores vão para arquivo.
+MAX_NOS_EXIBICAO, MAX_ARESTAS_EXIBICAO = 5_000, 20_000
 
 # =================================================================================
 #  ITENS GRÁFICOS (NÓS E ARESTAS)
@@ -74,33 +103,47 @@ class ItemNo(QGraphicsEllipseItem):
                 aresta.atualizar_geometria()
         return super().itemChange(change, value)
 
-    def definir_selecionado(self, esta_selecionado):
+    def paint(self, painter, option, widget=None):
+        """Desenha o nó; com a visualização muito afastada, apenas um quadrado preenchido."""
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < LOD_LINHAS_AGRUPADAS:
+            painter.fillRect(self.rect(), self.brush()) # Sem contorno nem antialiasing.
+            return
+        super().paint(painter, option, widget)
+
+    def definir_selecionado(self, esta_selecionado, efeitos_visiveis=True):
         """Define o estado de seleção do nó, ativando/desativando a sombra e mudando a cor."""
-        self.sombra.setEnabled(esta_selecionado) # Ativa ou desativa a sombra.
+        # A sombra só é ativada se a visualização que contém o nó estiver próxima o bastante
+        # (`efeitos_visiveis`, ver VisualizadorGrafo.aplicar_nivel_detalhe).
+        self.sombra.setEnabled(esta_selecionado and efeitos_visiveis)
         self.setBrush(self.pincel_selecionado if esta_selecionado else self.pincel_normal) # Muda a cor de preenchimento.
 
-class ItemAresta(QGraphicsLineItem):
-    """Representa uma aresta, com lógica para desenhar linhas retas ou curvas."""
+class ItemAresta:
+    """
+    Representa uma aresta, com lógica para calcular linhas retas ou curvas. Não é um item da cena:
+    o desenho e a detecção de cliques ficam com a CamadaArestas, e apenas o texto do peso é um item.
+    """
 
     def __init__(self, no_origem: ItemNo, no_destino: ItemNo, peso: int = 1, e_direcionada=False):
-        super().__init__()
         self.no_origem = no_origem     # Nó de origem da aresta.
         self.no_destino = no_destino   # Nó de destino da aresta.
         self.peso = peso               # Peso da aresta.
         self.e_direcionada = e_direcionada # Indica se a aresta é direcionada.
         self.tamanho_seta = 12         # Tamanho da seta (se for direcionada).
         self.e_reciproca = False       # Flag para indicar se há uma aresta recíproca (para desenhar curva).
+        self.camada = None             # CamadaArestas que desenha esta aresta (definida ao registrá-la).
+        self.indice_camada = -1        # Posição da aresta nos arrays da camada.
 
-        self._caminho = QPainterPath() # Objeto QPainterPath para desenhar a linha (pode ser reta ou curva).
-        self.setZValue(-1)             # Define o Z-Value para que as arestas fiquem atrás dos nós.
-        self.caneta_linha = QPen(QColor("#4C566A"), 2.5) # Define a caneta para desenhar a linha da aresta.
-        self.setPen(self.caneta_linha) # Aplica a caneta.
+        self._caminho = QPainterPath() # Caminho da aresta (pode ser reta ou curva).
+        self.linha = QLineF()          # Segmento entre as bordas dos nós.
+        self.seta = None               # Polígono da seta no destino (apenas arestas direcionadas).
+        self.caixa = QRectF()          # Região ocupada pela aresta e sua seta.
 
         # Cria um item de texto para exibir o peso da aresta.
         self.item_texto_aresta = QGraphicsTextItem(str(self.peso))
         font = QFont("Segoe UI", 10) # Define a fonte do texto do peso.
         self.item_texto_aresta.setFont(font)
         self.item_texto_aresta.setDefaultTextColor(QColor("#D8DEE9")) # Cor do texto.
+        self.item_texto_aresta.aresta = self # Referência de volta: um clique no peso chega à aresta em O(1).
 
         # Adiciona a aresta às listas de arestas dos nós de origem e destino.
         self.no_origem.adicionar_aresta(self)
@@ -116,18 +159,8 @@ class ItemAresta(QGraphicsLineItem):
         self.peso = peso
         self.item_texto_aresta.setPlainText(str(self.peso))
 
-    def boundingRect(self):
-        """Retorna o retângulo delimitador do item, ajustado para incluir a seta e texto."""
-        # O ajuste é para garantir que a área de redesenho seja suficiente.
-        return self._caminho.boundingRect().adjusted(-20, -20, 20, 20)
-
-    def shape(self):
-        """Retorna a forma exata da aresta para detecção de colisão e eventos de clique."""
-        return self._caminho
-
     def atualizar_geometria(self):
-        """Atualiza a posição e forma da aresta com base nas posições dos nós."""
-        self.prepareGeometryChange() # Notifica a cena sobre uma mudança iminente na geometria.
+        """Recalcula a forma da aresta (e da seta) com base nas posições dos nós e avisa a camada de desenho."""
         p1 = self.no_origem.pos()  # Posição do nó de origem.
         p2 = self.no_destino.pos() # Posição do nó de destino.
 
@@ -145,6 +178,7 @@ class ItemAresta(QGraphicsLineItem):
         ponto_final = p2 - QPointF(dx_destino, dy_destino)
 
         self._caminho = QPainterPath(ponto_inicial) # Inicia o caminho da aresta.
+        self.linha = QLineF(ponto_inicial, ponto_final)
 
         if self.e_reciproca:
             # Se houver uma aresta recíproca, desenha uma curva para evitar sobreposição.
@@ -165,25 +199,24 @@ class ItemAresta(QGraphicsLineItem):
         else:
             self._caminho.lineTo(ponto_final) # Desenha uma linha reta.
 
+        if self.e_direcionada:
+            # A seta é calculada uma única vez por mudança de geometria, não a cada pintura.
+            self.seta = self.calcular_seta(ponto_final, self._caminho.angleAtPercent(1))
+        margem = self.tamanho_seta + 2 # Folga para a seta e a espessura da linha.
+        self.caixa = self._caminho.boundingRect().adjusted(-margem, -margem, margem, margem)
+
         # Posiciona o texto do peso da aresta no meio do caminho.
         posicao_texto = self._caminho.pointAtPercent(0.5)
         self.item_texto_aresta.setPos(posicao_texto)
-        self.update() # Solicita uma atualização de pintura do item.
+        if self.camada is not None:
+            self.camada.atualizar(self) # Redesenha apenas a região antiga e a nova da aresta.
 
-    def paint(self, painter, option, widget=None):
-        """Método de pintura para desenhar a aresta e a seta (se aplicável)."""
-        painter.setRenderHint(QPainter.Antialiasing) # Ativa o antialiasing para um desenho suave.
-        painter.setPen(self.caneta_linha)          # Aplica a caneta definida.
-        painter.drawPath(self._caminho)            # Desenha o caminho (linha ou curva).
-
-        if self.e_direcionada:
-            # Se a aresta for direcionada, desenha uma seta no ponto final.
-            painter.setBrush(QBrush(QColor("#88C0D0"))) # Define a cor de preenchimento para a seta.
-            angulo_no_fim = self._caminho.angleAtPercent(1) # Obtém o ângulo no final do caminho.
-            self.desenhar_seta(painter, self._caminho.pointAtPercent(1), angulo_no_fim) # Desenha a seta.
+    def caminho(self):
+        """Caminho (reta ou curva) da aresta, em coordenadas da cena."""
+        return self._caminho
 
-    def desenhar_seta(self, painter, ponto, angulo_graus):
-        """Desenha uma seta triangular em um dado ponto com um determinado ângulo."""
+    def calcular_seta(self, ponto, angulo_graus):
+        """Retorna o polígono de uma seta triangular em um dado ponto com um determinado ângulo."""
         s = self.tamanho_seta # Tamanho da seta.
         # Define os pontos de um triângulo para formar a cabeça da seta.
         cabeca_seta = QPolygonF([
@@ -196,20 +229,194 @@ class ItemAresta(QGraphicsLineItem):
         transformar = QTransform()
         transformar.translate(ponto.x(), ponto.y()) # Translada para o ponto desejado.
         transformar.rotate(-angulo_graus)           # Rotaciona a seta para alinhar com o ângulo da aresta.
-        painter.drawPolygon(transformar.map(cabeca_seta)) # Desenha a seta transformada.
+        return transformar.map(cabeca_seta)
+
+class CamadaArestas(QGraphicsItem):
+    """
+    Item único que desenha todas as arestas da cena (retas, curvas e setas) em uma chamada de `paint`,
+    a partir das geometrias pré-calculadas pelos ItemAresta. Uma grade espacial e o array contíguo de
+    caixas localizam as arestas que cruzam a região exposta (suja) ou um clique, e só elas são tratadas.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setZValue(-1) # Atrás dos nós.
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption) # Preenche option.exposedRect na pintura.
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.caneta = QPen(QColor("#4C566A"), 2.5)      # Caneta das linhas.
+        self.caneta_simples = QPen(QColor("#4C566A"), 0) # Caneta cosmética: 1 pixel em qualquer escala.
+        self.pincel_seta = QBrush(QColor("#88C0D0"))    # Preenchimento das setas.
+        self._arestas = []        # Posição -> ItemAresta.
+        self._linhas = []         # Posição -> QLineF da aresta.
+        self._curvas = []         # Posição -> QPainterPath (apenas arestas curvas; None nas retas).
+        self._setas = []          # Posição -> QPolygonF da seta (None em arestas não direcionadas).
+        self._caixas = array('d') # Caixas (x0, y0, x1, y1) das arestas, em sequência.
+        self._limites = QRectF()  # União das caixas (apenas cresce).
+        self.grade = GradeEspacial() # Células da cena -> arestas que passam por elas.
+
+    def __len__(self):
+        return len(self._arestas)
+
+    def adicionar(self, aresta):
+        """Registra uma aresta na camada e calcula sua geometria."""
+        aresta.camada, aresta.indice_camada = self, len(self._arestas)
+        self._arestas.append(aresta)
+        self._linhas.append(None)
+        self._curvas.append(None)
+        self._setas.append(None)
+        self._caixas.extend((0.0, 0.0, 0.0, 0.0))
+        aresta.atualizar_geometria() # Preenche a posição recém-criada (ver `atualizar`).
+
+    def remover(self, aresta):
+        """Remove uma aresta da camada em O(1), movendo a última para a posição liberada."""
+        i, ultima = aresta.indice_camada, len(self._arestas) - 1
+        if i < 0:
+            return
+        self.update(self._caixa(i))
+        if i != ultima:
+            movida = self._arestas[ultima]
+            movida.indice_camada = i
+            self._arestas[i], self._linhas[i] = movida, self._linhas[ultima]
+            self._curvas[i], self._setas[i] = self._curvas[ultima], self._setas[ultima]
+            self._caixas[4 * i:4 * i + 4] = self._caixas[4 * ultima:]
+        for lista in (self._arestas, self._linhas, self._curvas, self._setas):
+            lista.pop()
+        del self._caixas[4 * ultima:]
+        self.grade.remover(aresta)
+        aresta.camada, aresta.indice_camada = None, -1
+
+    def atualizar(self, aresta):
+        """Copia a geometria atual de uma aresta e redesenha apenas as regiões antiga e nova."""
+        i = aresta.indice_camada
+        antiga, nova = self._caixa(i), aresta.caixa
+        self._linhas[i] = aresta.linha
+        self._curvas[i] = aresta.caminho() if aresta.e_reciproca else None
+        self._setas[i] = aresta.seta if aresta.e_direcionada else None
+        self._caixas[4 * i:4 * i + 4] = array('d', (nova.left(), nova.top(), nova.right(), nova.bottom()))
+        if self._curvas[i] is None:
+            # Retas entram apenas nas células que atravessam (com folga para a seta).
+            linha = aresta.linha
+            self.grade.inserir_segmento(aresta, linha.x1(), linha.y1(), linha.x2(), linha.y2(), aresta.tamanho_seta + 2)
+        else:
+            self.grade.inserir_caixa(aresta, nova.left(), nova.top(), nova.right(), nova.bottom())
+        if not self._limites.contains(nova):
+            self.prepareGeometryChange() # O retângulo delimitador da camada vai crescer.
+            self._limites = self._limites.united(nova)
+        self.update(nova if antiga.isEmpty() else antiga.united(nova))
+
+    def aresta_em(self, ponto, tolerancia):
+        """
+        Retorna a aresta desenhada mais acima que passa a até `tolerancia` do ponto (coordenadas da cena),
+        ou None. Apenas as arestas cuja caixa contém o ponto têm o traçado testado.
+        """
+        candidatas = self._indices_visiveis(QRectF(ponto.x() - tolerancia, ponto.y() - tolerancia,
+                                                   2 * tolerancia, 2 * tolerancia))
+        if not candidatas:
+            return None
+        contorno = QPainterPathStroker()
+        contorno.setWidth(2 * tolerancia)
+        for i in reversed(candidatas): # A última desenhada fica por cima.
+            if contorno.createStroke(self._arestas[i].caminho()).contains(ponto):
+                return self._arestas[i]
+        return None
+
+    def _caixa(self, i):
+        """Caixa registrada da aresta na posição i."""
+        x0, y0, x1, y1 = self._caixas[4 * i:4 * i + 4]
+        return QRectF(QPointF(x0, y0), QPointF(x1, y1))
+
+    def _indices_visiveis(self, retangulo):
+        """
+        Posições (em ordem de desenho) das arestas cuja caixa cruza o retângulo. Regiões pequenas são
+        consultadas na grade (que também devolve todas as arestas longas); quando a região cobre muitas
+        células (visualização afastada) ou há muitas arestas longas, um teste vetorizado sobre o array de
+        caixas inteiro sai mais barato.
+        """
+        x0, y0, x1, y1 = retangulo.left(), retangulo.top(), retangulo.right(), retangulo.bottom()
+        caixas = np.frombuffer(self._caixas, dtype=np.float64).reshape(-1, 4)
+        grade = self.grade
+        if grade.numero_celulas(x0, y0, x1, y1) * 32 + len(grade.longas) <= len(self._arestas):
+            indices = np.fromiter((aresta.indice_camada for aresta in grade.consultar(x0, y0, x1, y1)), dtype=np.int64)
+            indices.sort()
+            caixas = caixas[indices]
+        else:
+            indices = None
+        dentro = np.flatnonzero((caixas[:, 0] <= x1) & (caixas[:, 2] >= x0) & (caixas[:, 1] <= y1) & (caixas[:, 3] >= y0))
+        return (dentro if indices is None else indices[dentro]).tolist()
+
+    def boundingRect(self):
+        return self._limites
+
+    def shape(self):
+        """Forma vazia: a camada nunca intercepta cliques (os cliques em arestas são resolvidos por `aresta_em`)."""
+        return QPainterPath()
+
+    def paint(self, painter, option, widget=None):
+        """Desenha as arestas visíveis na região exposta, conforme o nível de detalhe."""
+        if not self._arestas:
+            return
+        visiveis = self._indices_visiveis(option.exposedRect)
+        if not visiveis:
+            return
+        linhas, curvas, setas = self._linhas, self._curvas, self._setas
+        nivel = option.levelOfDetailFromTransform(painter.worldTransform())
+        if nivel < LOD_LINHAS_AGRUPADAS:
+            # Visualização muito afastada: todas as arestas como linhas simples, sem curvas nem setas.
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(self.caneta_simples)
+            painter.drawLines([linhas[i] for i in visiveis])
+            return
+
+        painter.setRenderHint(QPainter.Antialiasing, nivel >= LOD_EFEITOS) # Antialiasing apenas de perto.
+        painter.setPen(self.caneta)
+        retas = [linhas[i] for i in visiveis if curvas[i] is None]
+        if retas:
+            painter.drawLines(retas) # Uma única chamada de desenho para todas as retas.
+        for i in visiveis:
+            if curvas[i] is not None:
+                painter.drawPath(curvas[i])
+        if nivel >= LOD_SETAS:
+            painter.setBrush(self.pincel_seta)
+            for i in visiveis:
+                if setas[i] is not None:
+                    painter.drawPolygon(setas[i])
 
 class VisualizadorGrafo(QGraphicsView):
-    grafoAlterado = pyqtSignal() # Sinal emitido quando o grafo é alterado (adicionar/deletar nós/arestas, editar).
+    """
+    Visualização Qt de um `Grafo`. O núcleo é a fonte da verdade; a visualização apenas
+    observa suas alterações e mantém os itens gráficos correspondentes.
+    """
+    # Sinal emitido quando o grafo é alterado (adicionar/deletar nós/arestas, editar). As alterações são agrupadas:
+    # uma rajada gera um único sinal após INTERVALO_NOTIFICACAO_MS, e um lote (ver `lote`) gera um único sinal ao final.
+    grafoAlterado = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self.setRenderHint(QPainter.Antialiasing) # Ativa o antialiasing para renderização suave.
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse) # O zoom acompanha a posição do mouse.
         self.cena = QGraphicsScene()              # Cria a cena gráfica onde os itens serão desenhados.
         self.setScene(self.cena)                  # Define a cena para a view.
-        self.nos, self.arestas = {}, []           # Dicionário para nós (rótulo: objeto ItemNo) e lista para arestas.
-        self.e_direcionada = False                # Flag para indicar se o grafo é direcionado.
+        self.camada_arestas = CamadaArestas()     # Desenha todas as arestas em uma única pintura.
+        self.cena.addItem(self.camada_arestas)
+        self.nos = {}                             # Dicionário para nós (rótulo: objeto ItemNo).
+        self.indice_arestas = {}                  # Índice de arestas: (rótulo origem, rótulo destino) -> ItemAresta.
+        self.grafo = Grafo()                      # Núcleo do grafo (fonte da verdade para nós, arestas e pesos).
+        self.grafo.observar(self._ao_alterar_grafo) # A visualização reage a cada alteração do núcleo.
+        self.alocador_rotulos = AlocadorRotulos(self.grafo) # Rótulos para nós gerados ou criados com o mouse.
+        self.cache_rotas = CacheLRU(TAMANHO_CACHE_ROTAS) # Análises de rotas por (versão do grafo, consulta).
+        self.grafo_nx = nx.Graph() # Grafo NetworkX de análise, atualizado incrementalmente a cada alteração.
+        self.modo_analise = False  # Modo "Analisar Grafo": consultas de rota mínima respondidas por um índice.
+        self.indice_caminhos = None # IndiceCaminhosMinimos da versão atual (None quando invalidado).
         self.setBackgroundBrush(QBrush(QColor("#262b33"))) # Define a cor de fundo da cena.
         self.no_selecionado = None                # Armazena o nó atualmente selecionado.
+        self.rotulos_visiveis = True              # Nível de detalhe atual (ver aplicar_nivel_detalhe).
+        self.efeitos_visiveis = True              # Falso quando o zoom desta visualização está abaixo de LOD_EFEITOS.
+        self._profundidade_lote = 0               # Lotes de alterações abertos (ver iniciar_lote/finalizar_lote).
+        self._alteracao_pendente = False          # Há alterações ainda não notificadas por grafoAlterado.
+        self._temporizador_alteracao = QTimer(self) # Adia (e agrupa) a emissão de grafoAlterado.
+        self._temporizador_alteracao.setSingleShot(True)
+        self._temporizador_alteracao.setInterval(INTERVALO_NOTIFICACAO_MS)
+        self._temporizador_alteracao.timeout.connect(self._emitir_alteracao)
 
         # Flags para controlar os diferentes modos de interação do usuário.
         self.modo_adicionar_nos = False
@@ -217,9 +424,83 @@ class VisualizadorGrafo(QGraphicsView):
         self.modo_editar_pesos = False
         self.modo_deletar = False
 
+    @property
+    def escala(self):
+        """Fator de zoom atual da visualização."""
+        return self.transform().m11()
+
+    def wheelEvent(self, event):
+        """Aproxima/afasta a visualização com a roda do mouse, entre ZOOM_MINIMO e ZOOM_MAXIMO."""
+        fator = FATOR_ZOOM ** (event.angleDelta().y() / 120) # Um passo da roda equivale a 120.
+        fator = min(max(self.escala * fator, ZOOM_MINIMO), ZOOM_MAXIMO) / self.escala
+        if fator != 1:
+            self.scale(fator, fator)
+            self.aplicar_nivel_detalhe()
+
+    def aplicar_nivel_detalhe(self):
+        """
+        Mostra/oculta os elementos que dependem do zoom. Os itens só são percorridos quando um limiar
+        é cruzado; setas, curvas e antialiasing das arestas são decididos na pintura da CamadaArestas.
+        """
+        escala = self.escala
+        rotulos, efeitos = escala >= LOD_ROTULOS, escala >= LOD_EFEITOS
+        if rotulos != self.rotulos_visiveis:
+            self.rotulos_visiveis = rotulos
+            for no in self.nos.values():
+                no.item_texto.setVisible(rotulos)
+            for aresta in self.indice_arestas.values():
+                aresta.item_texto_aresta.setVisible(rotulos)
+        if efeitos != self.efeitos_visiveis:
+            self.efeitos_visiveis = efeitos
+            self.setRenderHint(QPainter.Antialiasing, efeitos)
+            if self.no_selecionado:
+                self.no_selecionado.definir_selecionado(True, efeitos) # Reavalia a sombra do nó selecionado.
+
+    def iniciar_lote(self):
+        """Abre um lote de alterações: grafoAlterado fica suspenso até o `finalizar_lote` correspondente."""
+        self._profundidade_lote += 1
+
+    def finalizar_lote(self):
+        """Fecha um lote; ao fechar o mais externo, emite grafoAlterado uma única vez (se algo mudou)."""
+        self._profundidade_lote -= 1
+        if self._profundidade_lote == 0 and self._alteracao_pendente:
+            self._temporizador_alteracao.stop()
+            self._emitir_alteracao() # Imediato: quem fez o lote já encontra a interface atualizada.
+
+    @contextmanager
+    def lote(self):
+        """Contexto para alterações em massa: `with visualizador.lote(): ...` gera um único grafoAlterado."""
+        self.iniciar_lote()
+        try:
+            yield self
+        finally:
+            self.finalizar_lote()
+
+    def _agendar_alteracao(self):
+        """Registra uma alteração; fora de um lote, (re)inicia a espera antes de emitir grafoAlterado."""
+        self._alteracao_pendente = True
+        if not self._profundidade_lote:
+            self._temporizador_alteracao.start() # Reiniciar o temporizador agrupa alterações seguidas.
+
+    def _emitir_alteracao(self):
+        """Emite grafoAlterado se houver alterações pendentes."""
+        if self._alteracao_pendente:
+            self._alteracao_pendente = False
+            self.grafoAlterado.emit()
+
+    @property
+    def arestas(self):
+        """Visão dos itens de aresta na ordem de inserção (sem cópia)."""
+        return self.indice_arestas.values()
+
+    @property
+    def e_direcionada(self):
+        """Indica se o grafo é direcionado (delegado ao núcleo)."""
+        return self.grafo.e_direcionado
+
     def definir_tipo_grafo(self, e_direcionada: bool):
-        """Define se o grafo é direcionado ou não."""
-        self.e_direcionada = e_direcionada
+        """Define se o grafo é direcionado ou não. O grafo atual é limpo."""
+        self.grafo.limpar(e_direcionado=e_direcionada)
 
     def definir_modo_adicionar_nos(self, ativado: bool):
         """Ativa/desativa o modo de adicionar nós e muda o cursor."""
@@ -242,137 +523,268 @@ class VisualizadorGrafo(QGraphicsView):
         self.setCursor(Qt.CrossCursor if ativado else Qt.ArrowCursor)
 
     def adicionar_no(self, rotulo, x, y):
-        """Adiciona um novo nó à cena e ao dicionário de nós."""
-        if rotulo in self.nos: # Evita adicionar nós com rótulos duplicados.
-            return
-        no = ItemNo(rotulo, x, y) # Cria uma nova instância de ItemNo.
-        self.nos[rotulo] = no    # Adiciona o nó ao dicionário.
-        self.cena.addItem(no)   # Adiciona o nó à cena gráfica.
+        """Adiciona um novo nó ao grafo (rótulos duplicados são ignorados pelo núcleo)."""
+        self.grafo.adicionar_no(rotulo, x, y)
 
     def adicionar_aresta(self, rotulo1, rotulo2, peso):
-        """Adiciona uma nova aresta entre dois nós na cena."""
-        no1, no2 = self.nos.get(rotulo1), self.nos.get(rotulo2)
-        # Verifica se os nós existem e se a aresta já não existe (para evitar duplicatas).
-        if not (no1 and no2) or any(e.no_origem == no1 and e.no_destino == no2 for e in self.arestas):
-            return
-
-        nova_aresta = ItemAresta(no1, no2, peso, self.e_direcionada) # Cria uma nova instância de ItemAresta.
-
-        if self.e_direcionada:
-            # Se o grafo for direcionado, verifica se existe uma aresta oposta
-            # para marcar a nova aresta como recíproca (para desenho curvo).
-            aresta_oposta = next((e for e in self.arestas if e.no_origem == no2 and e.no_destino == no1), None)
-            if aresta_oposta:
-                nova_aresta.e_reciproca = True # Marca a nova aresta como recíproca.
-
-        self.arestas.append(nova_aresta)        # Adiciona a nova aresta à lista de arestas.
-        self.cena.addItem(nova_aresta)         # Adiciona a aresta à cena gráfica.
-        nova_aresta.adicionar_texto_a_cena(self.cena) # Adiciona o texto do peso à cena.
-        nova_aresta.atualizar_geometria()       # Atualiza a geometria da aresta.
-        self.grafoAlterado.emit()               # Emite o sinal de que o grafo foi alterado.
+        """Adiciona uma nova aresta entre dois nós (duplicatas são ignoradas pelo núcleo)."""
+        self.grafo.adicionar_aresta(rotulo1, rotulo2, peso)
 
     def deletar_aresta(self, aresta_para_deletar):
-        """Deleta uma aresta da cena e das listas internas."""
-        if aresta_para_deletar not in self.arestas: # Verifica se a aresta existe.
-            return
-
-        # Verifica se há uma aresta oposta para remover a flag de reciprocidade.
-        aresta_oposta = next((e for e in self.arestas if
-                              e.no_origem == aresta_para_deletar.no_destino and e.no_destino == aresta_para_deletar.no_origem),
-                             None)
-
-        if aresta_para_deletar.scene():
-            # Remove a aresta e seu texto associado da cena.
-            self.cena.removeItem(aresta_para_deletar.item_texto_aresta)
-            self.cena.removeItem(aresta_para_deletar)
-
-        self.arestas.remove(aresta_para_deletar) # Remove a aresta da lista interna.
-
-        # Remove a aresta das listas de arestas dos nós conectados.
-        if aresta_para_deletar in aresta_para_deletar.no_origem.arestas: aresta_para_deletar.no_origem.arestas.remove(aresta_para_deletar)
-        if aresta_para_deletar in aresta_para_deletar.no_destino.arestas: aresta_para_deletar.no_destino.arestas.remove(aresta_para_deletar)
-
-        if aresta_oposta:
-            aresta_oposta.e_reciproca = False # Desativa a flag de reciprocidade.
-            aresta_oposta.atualizar_geometria() # Atualiza a geometria da aresta oposta (agora será reta).
-
-        self.grafoAlterado.emit() # Emite o sinal de que o grafo foi alterado.
+        """Deleta do grafo a aresta representada pelo item informado."""
+        self.grafo.remover_aresta(aresta_para_deletar.no_origem.rotulo, aresta_para_deletar.no_destino.rotulo)
 
     def limpar(self):
-        """Limpa todos os nós e arestas da cena e das listas internas."""
-        self.cena.clear() # Limpa todos os itens da cena.
-        self.nos, self.arestas, self.no_selecionado = {}, [], None # Reinicializa as listas e o nó selecionado.
+        """Limpa todos os nós e arestas do grafo."""
+        self.grafo.limpar()
 
     def gerar_matriz_adjacencia(self):
-        """Gera a matriz de adjacência do grafo atual."""
-        rotulos = sorted(self.nos.keys()) # Obtém os rótulos dos nós em ordem alfabética.
-        tamanho = len(rotulos)           # Número de nós.
-        mapa_indice = {rotulo: i for i, rotulo in enumerate(rotulos)} # Mapeia rótulos para índices.
-        mat = [[0] * tamanho for _ in range(tamanho)] # Inicializa a matriz com zeros.
-
-        for aresta in self.arestas:
-            # Obtém os índices dos nós de origem e destino da aresta.
-            i, j = mapa_indice[aresta.no_origem.rotulo], mapa_indice[aresta.no_destino.rotulo]
-            mat[i][j] = aresta.peso # Define o peso na matriz.
-            if not self.e_direcionada:
-                mat[j][i] = aresta.peso # Se não for direcionado, a matriz é simétrica.
-        return rotulos, mat # Retorna os rótulos e a matriz de adjacência.
-
-    def atualizar_da_matriz(self, rotulos, matriz):
-        """Atualiza o grafo na visualização com base em uma nova matriz de adjacência."""
-        self.limpar() # Limpa o grafo atual.
-        n = len(rotulos)
-        if n == 0:
-            return # Não faz nada se não houver rótulos.
-
-        # Calcula posições para os nós em um círculo.
-        centro_x, centro_y, raio = self.width() / 2, self.height() / 2, min(self.width(), self.height()) * 0.35
-        for i, rotulo in enumerate(rotulos):
-            angulo = 2 * pi * i / n # Calcula o ângulo para posicionar o nó.
-            self.adicionar_no(rotulo, centro_x + raio * cos(angulo), centro_y + raio * sin(angulo)) # Adiciona o nó.
-
-        for i in range(n):
-            for j in range(n):
-                if matriz[i][j] > 0: # Se houver uma conexão (peso > 0).
-                    if not self.e_direcionada and j < i:
-                        continue # Evita adicionar arestas duplicadas em grafos não direcionados (considera apenas uma direção).
-                    self.adicionar_aresta(rotulos[i], rotulos[j], int(matriz[i][j])) # Adiciona a aresta.
-
-    def gerar_nos_aleatorios(self, n_nos):
-        """Gera um número especificado de nós aleatoriamente e algumas arestas."""
-        self.limpar() # Limpa o grafo existente.
-        if n_nos <= 0:
-            return
-
-        rotulos = [chr(ord('A') + i) for i in range(n_nos)] # Gera rótulos de 'A' em diante.
-        centro_x, centro_y = self.width() / 2, self.height() / 2 # Centro da cena.
-        raio = min(centro_x, centro_y) * 0.7 # Raio para distribuir os nós em um círculo.
+        """Gera a matriz de adjacência densa do grafo atual (usada apenas para exibição)."""
+        return self.grafo.matriz_adjacencia() # Retorna os rótulos (ordem alfabética) e a matriz de adjacência.
+
+    def gerar_adjacencia_esparsa(self):
+        """Gera a adjacência esparsa (CSR) do grafo atual: (rotulos, indptr, indices, pesos)."""
+        return self.grafo.adjacencia_esparsa()
+
+    def salvar_arquivo(self, caminho):
+        """Grava o grafo atual (com as posições atuais dos nós na cena) em um arquivo .grafo."""
+        for rotulo, item_no in self.nos.items():
+            self.grafo.mover_no(rotulo, item_no.x(), item_no.y()) # Posições após eventuais arrastos.
+        salvar_grafo(caminho, self.grafo)
+
+    def carregar_arquivo(self, caminho):
+        """Substitui o grafo atual pelo conteúdo de um arquivo .grafo (inclusive o tipo do grafo)."""
+        with self.lote():
+            carregar_grafo(caminho, self.grafo)
+
+    @property
+    def versao(self):
+        """Versão do grafo, incrementada a cada alteração (ver `Grafo.versao`)."""
+        return self.grafo.versao
+
+    def consultar_rotas(self, origem, destino, max_nos=None, max_rotas=MAX_ROTAS_PADRAO,
+                        tempo_limite=TEMPO_LIMITE_PADRAO, k=ROTAS_MELHORES_PADRAO, listar_rotas=True):
+        """
+        Retorna a análise de rotas do grafo atual (ver `calcular_analise_rotas`). Os resultados ficam em
+        um cache LRU indexado pela versão do grafo, então consultas repetidas sem alterações são imediatas.
+        """
+        chave = self.chave_consulta_rotas(origem, destino, max_nos, max_rotas, tempo_limite, k, listar_rotas)
+        resultado = self.cache_rotas.obter(chave)
+        if resultado is None:
+            # O grafo de análise já está pronto; não é preciso reconstruí-lo a cada consulta.
+            resultado = calcular_analise_rotas(self.grafo_nx, origem, destino, max_nos, max_rotas, tempo_limite, k,
+                                               listar_rotas)
+            self.cache_rotas.guardar(chave, resultado)
+        return resultado
+
+    def chave_consulta_rotas(self, origem, destino, max_nos=None, max_rotas=MAX_ROTAS_PADRAO,
+                             tempo_limite=TEMPO_LIMITE_PADRAO, k=ROTAS_MELHORES_PADRAO, listar_rotas=True):
+        """Retorna a chave do cache de rotas para uma consulta na versão atual do grafo."""
+        return self.versao, origem, destino, self.e_direcionada, max_nos, max_rotas, tempo_limite, k, listar_rotas
+
+    def definir_modo_analise(self, ativado: bool):
+        """
+        Ativa/desativa o modo de análise. Ao ativar, o índice de caminhos mínimos é calculado imediatamente;
+        se o grafo for grande demais para o índice (ValueError) ou faltar memória, o modo continua desativado.
+        """
+        self.modo_analise = ativado
+        if ativado:
+            try:
+                self.obter_indice_caminhos()
+            except (ValueError, MemoryError):
+                self.modo_analise, self.indice_caminhos = False, None
+                raise
+        else:
+            self.indice_caminhos = None # Libera as tabelas n x n.
+
+    def obter_indice_caminhos(self):
+        """Retorna o índice de caminhos mínimos da versão atual do grafo, calculando-o se necessário."""
+        if self.indice_caminhos is None or self.indice_caminhos.versao != self.versao:
+            self.indice_caminhos = IndiceCaminhosMinimos(self.grafo_nx, self.versao)
+        return self.indice_caminhos
+
+    def consultar_caminho_mais_curto(self, origem, destino):
+        """
+        Retorna (caminho, custo) da rota mais curta, ou None. No modo de análise a consulta usa o
+        índice de caminhos mínimos; fora dele (ou se o grafo cresceu além do limite do índice), um
+        Dijkstra sobre o grafo de análise.
+        """
+        if self.modo_analise and len(self.grafo) <= MAX_NOS_INDICE_CAMINHOS:
+            return self.obter_indice_caminhos().rota_mais_curta(origem, destino)
+        caminho = obter_caminho_mais_curto(self.grafo_nx, origem, destino)
+        return None if caminho is None else (caminho, nx.path_weight(self.grafo_nx, caminho, weight='weight'))
+
+    def _buscar_item_aresta(self, rotulo_origem, rotulo_destino):
+        """Retorna em O(1) o ItemAresta que representa a aresta origem -> destino, se existir."""
+        return self.indice_arestas.get((rotulo_origem, rotulo_destino))
+
+    def _atualizar_grafo_nx(self, evento, *dados):
+        """Aplica uma alteração do núcleo ao grafo NetworkX de análise, em tempo constante (ou proporcional ao grau)."""
+        G = self.grafo_nx
+        if evento == 'no_adicionado':
+            G.add_node(dados[0])
+        elif evento == 'aresta_adicionada':
+            G.add_edge(dados[0], dados[1], weight=dados[2])
+        elif evento == 'aresta_removida':
+            G.remove_edge(dados[0], dados[1])
+        elif evento == 'no_removido':
+            G.remove_node(dados[0]) # As arestas já foram removidas pelos eventos anteriores.
+        elif evento == 'no_renomeado':
+            nx.relabel_nodes(G, {dados[0]: dados[1]}, copy=False) # Reaponta apenas as arestas do nó.
+        elif evento == 'peso_alterado':
+            G[dados[0]][dados[1]]['weight'] = dados[2]
+        elif evento == 'limpo':
+            self.grafo_nx = nx.DiGraph() if self.e_direcionada else nx.Graph()
+
+    def _ao_alterar_grafo(self, evento, *dados):
+        """Mantém os itens gráficos e o grafo de análise sincronizados com as alterações do núcleo do grafo."""
+        self._atualizar_grafo_nx(evento, *dados)
+        self.indice_caminhos = None # O índice de caminhos mínimos deixa de valer a cada alteração.
+        if evento == 'no_adicionado':
+            rotulo, x, y = dados
+            no = ItemNo(rotulo, x, y) # Cria uma nova instância de ItemNo.
+            no.item_texto.setVisible(self.rotulos_visiveis) # Respeita o nível de detalhe atual.
+            self.nos[rotulo] = no    # Adiciona o nó ao dicionário.
+            self.cena.addItem(no)   # Adiciona o nó à cena gráfica.
+
+        elif evento == 'aresta_adicionada':
+            rotulo1, rotulo2, peso = dados
+            nova_aresta = ItemAresta(self.nos[rotulo1], self.nos[rotulo2], peso, self.e_direcionada)
+            # Se o grafo for direcionado e existir a aresta oposta, marca a nova aresta
+            # como recíproca (para desenho curvo).
+            if self.e_direcionada and self.grafo.tem_aresta(rotulo2, rotulo1):
+                nova_aresta.e_reciproca = True
+            self.indice_arestas[(rotulo1, rotulo2)] = nova_aresta # Registra a nova aresta no índice.
+            nova_aresta.adicionar_texto_a_cena(self.cena) # Adiciona o texto do peso à cena.
+            nova_aresta.item_texto_aresta.setVisible(self.rotulos_visiveis) # Respeita o nível de detalhe atual.
+            self.camada_arestas.adicionar(nova_aresta) # Registra a geometria da aresta na camada de desenho.
+
+        elif evento == 'aresta_removida':
+            rotulo1, rotulo2 = dados
+            aresta = self.indice_arestas.pop((rotulo1, rotulo2), None) # Remove a aresta do índice.
+            if aresta is None:
+                return
+            self.camada_arestas.remover(aresta) # Deixa de desenhar a aresta (e redesenha sua região).
+            if aresta.item_texto_aresta.scene():
+                self.cena.removeItem(aresta.item_texto_aresta) # Remove o texto do peso da cena.
 
-        for i, rotulo in enumerate(rotulos):
-            angulo = 2 * pi * i / n_nos # Calcula o ângulo para posicionar o nó.
-            self.adicionar_no(rotulo, centro_x + raio * cos(angulo), centro_y + raio * sin(angulo)) # Adiciona o nó.
+            # Remove a aresta das listas de arestas dos nós conectados.
+            if aresta in aresta.no_origem.arestas: aresta.no_origem.arestas.remove(aresta)
+            if aresta in aresta.no_destino.arestas: aresta.no_destino.arestas.remove(aresta)
 
-        if n_nos <= 1:
-            return # Não pode ter arestas se houver 0 ou 1 nó.
+            # Se havia uma aresta oposta, ela deixa de ser recíproca (e volta a ser reta).
+            aresta_oposta = self._buscar_item_aresta(rotulo2, rotulo1) if self.e_direcionada else None
+            if aresta_oposta:
+                aresta_oposta.e_reciproca = False
+                aresta_oposta.atualizar_geometria()
+
+        elif evento == 'no_removido':
+            rotulo, = dados
+            no = self.nos.pop(rotulo) # Remove o nó do dicionário.
+            if no is self.no_selecionado:
+                self.no_selecionado = None
+            if no.scene():
+                self.cena.removeItem(no) # Remove o nó da cena.
+
+        elif evento == 'no_renomeado':
+            rotulo_atual, novo_rotulo = dados
+            item_no = self.nos.pop(rotulo_atual)
+            self.nos[novo_rotulo] = item_no     # Atualiza o dicionário de nós com o novo rótulo.
+            # Retira do índice as arestas do nó (custo proporcional ao grau do nó)...
+            for aresta in item_no.arestas:
+                self.indice_arestas.pop((aresta.no_origem.rotulo, aresta.no_destino.rotulo), None)
+            item_no.definir_rotulo(novo_rotulo) # Define o novo rótulo no objeto ItemNo.
+            # ...e as registra novamente com as chaves do novo rótulo.
+            for aresta in item_no.arestas:
+                self.indice_arestas[(aresta.no_origem.rotulo, aresta.no_destino.rotulo)] = aresta
+
+        elif evento == 'peso_alterado':
+            rotulo1, rotulo2, peso = dados
+            aresta = self._buscar_item_aresta(rotulo1, rotulo2)
+            if aresta:
+                aresta.definir_peso(peso) # Define o novo peso na aresta.
+
+        elif evento == 'limpo':
+            self.cena.clear() # Limpa todos os itens da cena (inclusive a camada de arestas).
+            self.camada_arestas = CamadaArestas()
+            self.cena.addItem(self.camada_arestas)
+            self.nos, self.indice_arestas, self.no_selecionado = {}, {}, None # Reinicializa os índices e o nó selecionado.
+            if self._profundidade_lote:
+                self._alteracao_pendente = True # Dentro de um lote, limpar faz parte da substituição do grafo.
+            else:
+                # Limpar não emite grafoAlterado (quem limpa atualiza a interface) e descarta notificações pendentes.
+                self._temporizador_alteracao.stop()
+                self._alteracao_pendente = False
+            return
 
-        max_arestas = random.randint(n_nos - 1, n_nos * 2) # Número aleatório de arestas a serem geradas.
-        chaves_nos = list(self.nos.keys()) # Lista dos rótulos dos nós.
-        arestas_existentes, tentativas = set(), 0 # Conjunto para rastrear arestas já adicionadas, e contador de tentativas.
+        self._agendar_alteracao() # grafoAlterado é emitido depois, uma vez por rajada ou lote.
 
-        # Tenta adicionar arestas aleatoriamente até atingir o máximo ou esgotar tentativas.
-        while len(self.arestas) < max_arestas and tentativas < max_arestas * 10:
-            n1, n2 = random.sample(chaves_nos, 2) # Seleciona dois nós aleatoriamente.
-            # Normaliza a tupla da aresta para verificar se já existe (ordem importa para direcionados, não para não direcionados).
-            aresta_para_verificar = tuple(sorted((n1, n2))) if not self.e_direcionada else (n1, n2)
+    def atualizar_da_matriz(self, rotulos, matriz):
+        """Atualiza o grafo na visualização com base em uma nova matriz de adjacência (um único grafoAlterado)."""
+        with self.lote():
+            self.limpar() # Limpa o grafo atual.
+            n = len(rotulos)
+            if n == 0:
+                return # Não faz nada se não houver rótulos.
+
+            # Calcula posições para os nós em um círculo.
+            centro_x, centro_y, raio = self.width() / 2, self.height() / 2, min(self.width(), self.height()) * 0.35
+            for i, rotulo in enumerate(rotulos):
+                angulo = 2 * pi * i / n # Calcula o ângulo para posicionar o nó.
+                self.adicionar_no(rotulo, centro_x + raio * cos(angulo), centro_y + raio * sin(angulo)) # Adiciona o nó.
+
+            # Extrai as células positivas de forma vetorizada; em grafos não direcionados considera
+            # apenas o triângulo superior para não duplicar arestas.
+            linhas, colunas, pesos = extrair_arestas_da_matriz(matriz, apenas_triangulo_superior=not self.e_direcionada)
+            # Insere todas as arestas no núcleo de uma só vez.
+            self.grafo.adicionar_arestas(
+                (rotulos[i], rotulos[j], int(peso)) for i, j, peso in zip(linhas, colunas, pesos)
+            )
+
+    def gerar_nos_aleatorios(self, n_nos, semente=None):
+        """
+        Gera n_nos nós em círculo e entre n_nos - 1 e 2 * n_nos arestas sorteadas de uma vez pelo
+        modelo G(n, m) (ver `geradores`), com pesos de 1 a 100 (um único grafoAlterado).
+        """
+        with self.lote():
+            self.limpar() # Limpa o grafo existente.
+            if n_nos <= 0:
+                return
 
-            if aresta_para_verificar not in arestas_existentes:
-                self.adicionar_aresta(n1, n2, random.randint(1, 100)) # Adiciona a aresta com peso aleatório.
-                arestas_existentes.add(aresta_para_verificar) # Adiciona ao conjunto de arestas existentes.
-            tentativas += 1
+            max_pares = n_nos * (n_nos - 1) // (1 if self.e_direcionada else 2) # Arestas possíveis, sem laços.
+            n_arestas = random.Random(semente).randint(n_nos - 1, n_nos * 2) # Mesma semente: mesmo grafo.
+            gerado = gerar_gnm(n_nos, min(n_arestas, max_pares), self.e_direcionada, semente)
+            centro_x, centro_y = self.width() / 2, self.height() / 2 # Centro da cena.
+            # Círculo com 70% do menor semieixo da vista, para caber inteiro na tela.
+            gerado.posicoes = posicoes_circulares(n_nos, (centro_x, centro_y), min(centro_x, centro_y) * 0.7)
+            gerado.rotulos = self.alocador_rotulos.alocar_varios(n_nos) # Rótulos de 'A' em diante (Z, AA, AB...).
+            gerado.para_grafo(self.grafo) # Nós e arestas entram no núcleo de uma só vez.
+
+    @staticmethod
+    def cabe_na_cena(numero_nos, numero_arestas):
+        """Indica se um grafo desse tamanho pode ser desenhado (ver MAX_NOS_EXIBICAO e MAX_ARESTAS_EXIBICAO)."""
+        return numero_nos <= MAX_NOS_EXIBICAO and numero_arestas <= MAX_ARESTAS_EXIBICAO
+
+    def carregar_gerado(self, gerado):
+        """
+        Substitui o grafo atual por um grafo de `geradores` (inclusive o tipo do grafo). ValueError se ele
+        for grande demais para a cena (ver `cabe_na_cena`).
+        """
+        if not self.cabe_na_cena(gerado.numero_nos, gerado.numero_arestas):
+            raise ValueError(f"Grafo grande demais para ser exibido ({gerado.numero_nos:,} nós e "
+                             f"{gerado.numero_arestas:,} arestas; limite de {MAX_NOS_EXIBICAO:,} nós e "
+                             f"{MAX_ARESTAS_EXIBICAO:,} arestas).")
+        with self.lote():
+            gerado.para_grafo(self.grafo)
 
     def mousePressEvent(self, event):
         """Manipula eventos de clique do mouse na cena do grafo."""
         item_clicado = self.itemAt(event.pos()) # Obtém o item da cena no ponto do clique.
+        if isinstance(item_clicado, QGraphicsTextItem) and hasattr(item_clicado, 'aresta'):
+            item_clicado = item_clicado.aresta # Clique no peso: vale como clique na própria aresta.
+        elif item_clicado is None:
+            # As arestas não são itens da cena: a camada de arestas testa o ponto (tolerância de alguns pixels).
+            item_clicado = self.camada_arestas.aresta_em(self.mapToScene(event.pos()), TOLERANCIA_CLIQUE / self.escala)
         item_no = None
         # Verifica se o item clicado é um nó ou o texto de um nó.
         if isinstance(item_clicado, ItemNo):
@@ -383,24 +795,18 @@ class VisualizadorGrafo(QGraphicsView):
         # --- MODO: ADICIONAR NÓS ---
         if self.modo_adicionar_nos:
             if item_clicado is None: # Se não clicou em nenhum item existente.
-                # Gera um rótulo sequencial (A, B, C...) para o novo nó.
-                rotulo = next((chr(ord('A') + i) for i in range(26) if chr(ord('A') + i) not in self.nos), None)
-                if rotulo:
-                    # Adiciona o nó na posição clicada na cena.
-                    self.adicionar_no(rotulo, self.mapToScene(event.pos()).x(), self.mapToScene(event.pos()).y())
-                    self.grafoAlterado.emit() # Emite sinal de alteração.
+                # Gera um rótulo sequencial livre (A, B, C... Z, AA...) para o novo nó.
+                rotulo = self.alocador_rotulos.alocar()
+                # Adiciona o nó na posição clicada na cena.
+                self.adicionar_no(rotulo, self.mapToScene(event.pos()).x(), self.mapToScene(event.pos()).y())
             return # Retorna para não processar outros modos.
 
         # --- MODO: DELETAR ITENS ---
         if self.modo_deletar:
             if isinstance(item_clicado, ItemAresta):
-                self.deletar_aresta(item_clicado) # Deleta a aresta clicada.
+                self.deletar_aresta(item_clicado) # Deleta a aresta clicada (ou cujo peso foi clicado).
             elif item_no:
                 self.deletar_no(item_no) # Deleta o nó clicado.
-            elif isinstance(item_clicado, QGraphicsTextItem):
-                # Se clicou no texto de uma aresta, encontra a aresta e a deleta.
-                texto_aresta = next((e for e in self.arestas if e.item_texto_aresta == item_clicado), None)
-                if texto_aresta: self.deletar_aresta(texto_aresta)
             return # Retorna para não processar outros modos.
 
         # --- MODO: EDITAR RÓTULO DO NÓ ---
@@ -411,15 +817,8 @@ class VisualizadorGrafo(QGraphicsView):
 
         # --- MODO: EDITAR PESO DA ARESTA ---
         if self.modo_editar_pesos:
-            aresta_para_editar = None
             if isinstance(item_clicado, ItemAresta):
-                aresta_para_editar = item_clicado
-            elif isinstance(item_clicado, QGraphicsTextItem):
-                # Se clicou no texto de uma aresta, encontra a aresta.
-                texto_aresta = next((e for e in self.arestas if e.item_texto_aresta == item_clicado), None)
-                if texto_aresta: aresta_para_editar = texto_aresta
-            if aresta_para_editar:
-                self.editar_peso_aresta(aresta_para_editar) # Abre diálogo para editar o peso da aresta.
+                self.editar_peso_aresta(item_clicado) # Abre diálogo para editar o peso da aresta.
                 return # Retorna para não processar outros modos.
 
         # --- LÓGICA DE SELEÇÃO E CRIAÇÃO DE ARESTAS (MODO PADRÃO) ---
@@ -437,7 +836,7 @@ class VisualizadorGrafo(QGraphicsView):
                 return # Retorna após processar a seleção/criação de aresta.
             else: # Se nenhum nó estava selecionado.
                 self.no_selecionado = item_no # Seleciona o nó clicado.
-                self.no_selecionado.definir_selecionado(True) # Ativa o estado de selecionado (e sombra).
+                self.no_selecionado.definir_selecionado(True, self.efeitos_visiveis) # Ativa o estado de selecionado (e sombra).
         elif self.no_selecionado: # Se clicou em um espaço vazio, mas havia um nó selecionado.
             self.no_selecionado.definir_selecionado(False) # Desseleciona o nó.
             self.no_selecionado = None # Limpa a seleção.
@@ -451,65 +850,22 @@ class VisualizadorGrafo(QGraphicsView):
             if novo_rotulo in self.nos: # Verifica se o novo rótulo já está em uso.
                 QMessageBox.warning(self, "Rótulo Inválido", f"O rótulo '{novo_rotulo}' já está em uso.")
                 return
-            self.nos[novo_rotulo] = self.nos.pop(rotulo_atual) # Atualiza o dicionário de nós com o novo rótulo.
-            item_no.definir_rotulo(novo_rotulo) # Define o novo rótulo no objeto ItemNo.
-            self.grafoAlterado.emit() # Emite sinal de alteração.
+            self.grafo.renomear_no(rotulo_atual, novo_rotulo) # O núcleo notifica a visualização.
 
     def editar_peso_aresta(self, aresta):
         """Permite ao usuário editar o peso de uma aresta."""
-        novo_peso, ok = QInputDialog.getInt(self, "Alterar Peso", "Novo peso:", aresta.peso, 1, 999)
+        peso = aresta.peso
+        if isinstance(peso, int) or float(peso).is_integer():
+            novo_peso, ok = QInputDialog.getInt(self, "Alterar Peso", "Novo peso:", int(peso), 1, max(999, int(peso)))
+        else:
+            # Pesos fracionários (ex.: de uma lista de arestas importada) são editados como números decimais.
+            novo_peso, ok = QInputDialog.getDouble(self, "Alterar Peso", "Novo peso:", peso, 0.0, max(999.0, peso), 4)
         if ok and novo_peso != aresta.peso: # Se o usuário inseriu um novo peso válido.
-            aresta.definir_peso(novo_peso) # Define o novo peso na aresta.
-            self.grafoAlterado.emit() # Emite sinal de alteração.
+            self.grafo.definir_peso(aresta.no_origem.rotulo, aresta.no_destino.rotulo, novo_peso)
 
     def deletar_no(self, no_para_deletar):
         """Deleta um nó e todas as arestas conectadas a ele."""
-        if no_para_deletar.rotulo not in self.nos: # Verifica se o nó existe.
-            return
-        arestas_para_remover = list(no_para_deletar.arestas) # Cria uma cópia da lista de arestas para evitar problemas durante a iteração.
-        for aresta in arestas_para_remover:
-            self.deletar_aresta(aresta) # Deleta cada aresta conectada.
-        del self.nos[no_para_deletar.rotulo] # Remove o nó do dicionário.
-        if no_para_deletar.scene():
-            self.cena.removeItem(no_para_deletar) # Remove o nó da cena.
-        self.grafoAlterado.emit() # Emite sinal de alteração.
-
-# =================================================================================
-#  FUNÇÕES DE MANIPULAÇÃO E CÁLCULO DE GRAFO (NETWORKX)
-# =================================================================================
-
-def construir_grafo_nx_da_matriz(rotulos, matriz, e_direcionado=False):
-    """Constrói um objeto NetworkX Graph ou DiGraph a partir de rótulos e uma matriz de adjacência."""
-    # Cria um grafo direcionado (DiGraph) ou não direcionado (Graph) com base na flag 'e_direcionado'.
-    G = nx.DiGraph() if e_direcionado else nx.Graph()
-    G.add_nodes_from(rotulos) # Adiciona todos os nós ao grafo.
-    for i in range(len(rotulos)):
-        for j in range(len(rotulos)):
-            if matriz[i][j] > 0: # Se houver um peso positivo na matriz.
-                # Adiciona uma aresta entre os nós correspondentes, com o peso especificado.
-                G.add_edge(rotulos[i], rotulos[j], weight=matriz[i][j])
-    return G
-
-def obter_todas_rotas(G, origem, destino, max_nos=None):
-    """Obtém todas as rotas simples entre uma origem e um destino em um grafo NetworkX."""
-    # Utiliza a função all_simple_paths do NetworkX para encontrar todas as rotas simples.
-    # 'cutoff' limita o comprimento máximo do caminho (número de nós).
-    return list(nx.all_simple_paths(G, source=origem, target=destino, cutoff=max_nos))
-
-def obter_caminho_mais_curto(G, origem, destino):
-    """Obtém o caminho mais curto (menor custo) entre uma origem e um destino usando o algoritmo de Dijkstra."""
-    try:
-        # Usa dijkstra_path do NetworkX, que encontra o caminho de menor custo em grafos ponderados.
-        return nx.dijkstra_path(G, origem, destino, weight='weight')
-    except nx.NetworkXNoPath:
-        return None # Retorna None se não houver caminho.
-
-def obter_caminho_mais_longo_seguro(G, origem, destino, todas_rotas):
-    """Obtém o caminho mais longo (maior custo) entre uma origem e um destino a partir de uma lista de todas as rotas."""
-    if not todas_rotas:
-        return None # Retorna None se não houver rotas.
-    # Encontra o caminho com o maior 'weight' (custo total) entre todas as rotas fornecidas.
-    return max(todas_rotas, key=lambda caminho: nx.path_weight(G, caminho, weight='weight'))
+        self.grafo.remover_no(no_para_deletar.rotulo) # O núcleo remove as arestas e notifica cada remoção.
 
 def calcular_e_formatar_rotas(visualizador_grafo: 'VisualizadorGrafo', origem: str, destino: str) -> str:
     """
@@ -520,37 +876,35 @@ def calcular_e_formatar_rotas(visualizador_grafo: 'VisualizadorGrafo', origem: s
     if not (origem in visualizador_grafo.nos and destino in visualizador_grafo.nos):
         return "Nó de origem ou destino não encontrado no grafo."
 
-    # Gera a matriz de adjacência do grafo atual na visualização.
-    rotulos, matriz = visualizador_grafo.gerar_matriz_adjacencia()
-    # Constrói um grafo NetworkX a partir da matriz de adjacência.
-    G = construir_grafo_nx_da_matriz(rotulos, matriz, visualizador_grafo.e_direcionada)
-
     try:
-        # Obtém todas as rotas simples entre a origem e o destino.
-        todas_rotas = obter_todas_rotas(G, origem, destino)
-        if not todas_rotas:
+        # A análise (melhores rotas pelo algoritmo de Yen e rota mais longa pela busca dedicada)
+        # vem do cache da visualização quando o grafo não mudou desde a última consulta.
+        analise = visualizador_grafo.consultar_rotas(origem, destino, listar_rotas=False)
+        melhores_rotas = [{'caminho': caminho, 'custo': custo} for caminho, custo in analise['melhores']]
+        if not melhores_rotas:
             return f"Nenhuma rota encontrada entre {origem} e {destino}."
-
-        # Calcula o custo total para cada rota.
-        rotas_com_custo = [{'caminho': caminho, 'custo': nx.path_weight(G, caminho, weight='weight')} for caminho in todas_rotas]
-        rotas_com_custo.sort(key=lambda x: x['custo']) # Ordena as rotas pelo custo (do menor para o maior).
+        pior_rota = analise['mais_longa']
 
         # Constrói a string de resultado formatada.
         string_resultado = f"Análise de Rota de {origem} para {destino}\n" + "=" * 40 + "\n\n"
 
         # Adiciona a melhor rota (menor custo).
-        melhor_rota = rotas_com_custo[0]
+        melhor_rota = melhores_rotas[0]
         string_resultado += f"🏆 Melhor Rota (Custo Mínimo):\n   - Caminho: {' → '.join(melhor_rota['caminho'])}\n   - Custo Total: {melhor_rota['custo']}\n\n"
 
-        # Se houver mais de uma rota, adiciona a pior rota (maior custo).
-        if len(rotas_com_custo) > 1:
-            pior_rota = rotas_com_custo[-1]
-            string_resultado += f"🚧 Pior Rota (Custo Máximo):\n   - Caminho: {' → '.join(pior_rota['caminho'])}\n   - Custo Total: {pior_rota['custo']}\n\n"
-
-        # Se houver mais de duas rotas, lista as outras rotas possíveis.
-        if len(rotas_com_custo) > 2:
-            string_resultado += "🗺️ Outras Rotas Possíveis:\n"
-            for i, info_rota in enumerate(rotas_com_custo[1:-1]): # Exclui a melhor e a pior.
+        # Se houver mais de uma rota, adiciona a pior rota (maior custo); ela falta se a análise foi cancelada.
+        if pior_rota is not None and pior_rota['caminho'] != melhor_rota['caminho']:
+            string_resultado += f"🚧 Pior Rota (Custo Máximo):\n   - Caminho: {' → '.join(pior_rota['caminho'])}\n   - Custo Total: {pior_rota['custo']}\n"
+            if not pior_rota['exato']:
+                string_resultado += "   - (melhor encontrada dentro do limite de tempo)\n"
+            string_resultado += "\n"
+
+        # Lista as demais rotas de menor custo (exceto a melhor e a pior).
+        outras_rotas = [info_rota for info_rota in melhores_rotas[1:]
+                        if pior_rota is None or info_rota['caminho'] != pior_rota['caminho']]
+        if outras_rotas:
+            string_resultado += "🗺️ Outras Rotas de Menor Custo:\n"
+            for i, info_rota in enumerate(outras_rotas):
                 string_resultado += f" {i + 1}. Caminho: {' → '.join(info_rota['caminho'])}\n     Custo: {info_rota['custo']}\n"
 
         return string_resultado.strip() # Retorna a string formatada, removendo espaços em branco extras.
@@ -0,0 +1,258 @@
+import argparse
+import csv
+import gzip
+import io
+import sys
+import time
+from array import array
+from itertools import islice
+import numpy as np
+from nucleo_grafo import Grafo  # Núcleo do grafo em Python puro (sem PyQt5).
+from formato_grafo import EscritorGrafo  # Formato binário (.grafo).
+from layout_grafo import posicoes_circulares  # Layout circular inicial dos nós importados.
+
+# =================================================================================
+#  IMPORTAÇÃO DE LISTAS DE ARESTAS (CSV / TSV / TEXTO, OPCIONALMENTE GZIP)
+# =================================================================================
+# Uso: python importador.py arestas.csv.gz grafo.grafo --direcionado
+# Cada linha traz "origem destino [peso]"; os rótulos podem ser textos quaisquer. A primeira linha que
+# não é comentário pode ser um cabeçalho (ver `ImportadorArestas`). O arquivo é lido
+# em blocos de linhas, então a memória usada não depende do tamanho do arquivo, apenas do grafo
+# (um dicionário rótulo -> id e três arrays compactos por aresta).
+
+TAMANHO_BLOCO_IMPORTACAO = 100_000  # Linhas processadas por bloco.
+# Nomes de coluna que, na origem e no destino da primeira linha, indicam um cabeçalho (sem diferenciar maiúsculas).
+NOMES_COLUNAS_CABECALHO = {'origem', 'destino', 'source', 'target', 'from', 'to', 'src', 'dst'}
+
+def abrir_texto(caminho):
+    """
+    Abre um arquivo de texto para leitura em fluxo, descompactando gzip automaticamente (pela assinatura,
+    não pela extensão). '-' lê da entrada padrão. Retorna (texto, bruto): o fluxo de texto e o fluxo
+    binário descompactado, cuja posição (tell) indica quantos bytes já foram lidos.
+    """
+    if caminho == '-':
+        bruto = sys.stdin.buffer
+    else:
+        with open(caminho, 'rb') as arquivo:
+            compactado = arquivo.read(2) == b'\x1f\x8b'
+        bruto = gzip.open(caminho, 'rb') if compactado else open(caminho, 'rb')
+    return io.TextIOWrapper(bruto, encoding='utf-8', newline=''), bruto
+
+def detectar_delimitador(caminho):
+    """Delimitador pela extensão (ignorando .gz): vírgula em .csv, tabulação em .tsv e espaços nos demais."""
+    nome = caminho.lower()
+    if nome.endswith('.gz'):
+        nome = nome[:-3]
+    if nome.endswith('.csv'):
+        return ','
+    if nome.endswith(('.tsv', '.tab')):
+        return '\t'
+    return None  # Qualquer sequência de espaços/tabulações.
+
+def ler_blocos_linhas(texto, delimitador=None, tamanho_bloco=TAMANHO_BLOCO_IMPORTACAO):
+    """
+    Itera sobre blocos de até `tamanho_bloco` linhas já divididas em campos. Com delimitador (',' ou '\\t')
+    usa o módulo csv (aceita aspas); sem delimitador divide por espaços. Linhas vazias vêm como listas
+    vazias, para que a posição no bloco corresponda à linha do arquivo (a não ser que um campo entre
+    aspas contenha quebras de linha).
+    """
+    linhas = csv.reader(texto, delimiter=delimitador) if delimitador else (linha.split() for linha in texto)
+    while True:
+        bloco = list(islice(linhas, tamanho_bloco))
+        if not bloco:
+            return
+        yield bloco
+
+def _converter_peso(texto):
+    """Converte o texto de um peso em int (se possível) ou float."""
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+class ImportadorArestas:
+    """
+    Constrói um grafo incrementalmente a partir de blocos de arestas (origem, destino, peso).
+
+    Rótulos arbitrários são mapeados para ids inteiros na ordem em que aparecem. As arestas ficam em
+    arrays compactos (24 bytes por aresta) e as duplicadas são removidas no final, mantendo a primeira
+    ocorrência (em grafos não direcionados, A-B e B-A são a mesma aresta). `estatisticas` reúne os
+    contadores e a vazão da importação.
+
+    `cabecalho` diz se a primeira linha que não é comentário é um cabeçalho: True, False ou None
+    (detectar: é cabeçalho se o campo do peso existe e não é numérico, ou se a origem e o destino são
+    nomes de coluna comuns, como "source,target"; ver NOMES_COLUNAS_CABECALHO).
+    """
+
+    def __init__(self, e_direcionado=False, coluna_origem=0, coluna_destino=1, coluna_peso=2, comentario='#',
+                 cabecalho=None):
+        self.e_direcionado = e_direcionado
+        self.colunas = (coluna_origem, coluna_destino, coluna_peso)
+        self.comentario = comentario
+        self.cabecalho = cabecalho
+        self._procurar_cabecalho = True                  # A primeira linha útil ainda não foi lida.
+        self.indices = {}                                # rótulo -> id.
+        self._origens, self._destinos = array('q'), array('q')
+        self._pesos = array('d')
+        self._pesos_inteiros = True
+        self._finalizado = None                          # (origens, destinos, pesos) sem duplicatas.
+        self.estatisticas = {'linhas': 0, 'arestas_lidas': 0, 'arestas': 0, 'duplicadas': 0, 'nos': 0,
+                             'bytes': 0, 'segundos': 0.0}
+
+    def _e_cabecalho(self, campos):
+        """Indica se a primeira linha útil (já dividida em campos) é um cabeçalho (ver `cabecalho`)."""
+        if self.cabecalho is not None:
+            return self.cabecalho
+        c_origem, c_destino, c_peso = self.colunas
+        if len(campos) > c_peso:
+            try:
+                _converter_peso(campos[c_peso])
+            except ValueError:
+                return True  # Ex.: "origem,destino,peso".
+        nomes = {campo.strip().lower() for campo in campos[c_origem:c_origem + 1] + campos[c_destino:c_destino + 1]}
+        return len(nomes) == 2 and nomes <= NOMES_COLUNAS_CABECALHO
+
+    def adicionar_bloco(self, bloco):
+        """Adiciona o próximo bloco de linhas do arquivo, já divididas em campos (ver `ler_blocos_linhas`)."""
+        c_origem, c_destino, c_peso = self.colunas
+        indices, comentario = self.indices, self.comentario
+        origens, destinos, pesos = self._origens, self._destinos, self._pesos
+        for numero, campos in enumerate(bloco, self.estatisticas['linhas'] + 1):
+            if not campos or (comentario and campos[0].startswith(comentario)):
+                continue  # Linha vazia ou comentário.
+            if self._procurar_cabecalho:
+                self._procurar_cabecalho = False
+                if self._e_cabecalho(campos):
+                    continue
+            try:
+                peso = _converter_peso(campos[c_peso]) if len(campos) > c_peso else 1
+                origem, destino = campos[c_origem].strip(), campos[c_destino].strip()
+            except (ValueError, IndexError):
+                raise ValueError(f"Linha {numero} inválida: {campos}") from None
+            if self._pesos_inteiros and not isinstance(peso, int):
+                self._pesos_inteiros = False
+            # setdefault avalia len(indices) antes da inserção: cada rótulo novo recebe o próximo id.
+            origens.append(indices.setdefault(origem, len(indices)))
+            destinos.append(indices.setdefault(destino, len(indices)))
+            pesos.append(peso)
+        self.estatisticas['linhas'] += len(bloco)  # Inclusive linhas vazias e comentários.
+        self.estatisticas['arestas_lidas'] = len(pesos)
+        self.estatisticas['nos'] = len(indices)
+        self._finalizado = None
+
+    def importar(self, caminho, delimitador='auto', tamanho_bloco=TAMANHO_BLOCO_IMPORTACAO, ao_progresso=None):
+        """
+        Lê um arquivo (ou '-' para a entrada padrão) em blocos. `ao_progresso`, se informado,
+        recebe o dicionário de estatísticas após cada bloco. Retorna as estatísticas finais.
+        """
+        if delimitador == 'auto':
+            delimitador = detectar_delimitador(caminho)
+        inicio = time.perf_counter()
+        texto, bruto = abrir_texto(caminho)
+        try:
+            for bloco in ler_blocos_linhas(texto, delimitador, tamanho_bloco):
+                self.adicionar_bloco(bloco)
+                self._atualizar_vazao(inicio, bruto)
+                if ao_progresso is not None:
+                    ao_progresso(self.estatisticas)
+        finally:
+            if bruto is not sys.stdin.buffer:
+                texto.close()
+        self.finalizar()
+        self._atualizar_vazao(inicio, bruto)
+        return self.estatisticas
+
+    def _atualizar_vazao(self, inicio, bruto):
+        """Atualiza o tempo decorrido e os bytes lidos (descompactados) nas estatísticas."""
+        self.estatisticas['segundos'] = time.perf_counter() - inicio
+        if not bruto.closed and bruto.seekable():
+            self.estatisticas['bytes'] = bruto.tell()
+
+    def finalizar(self):
+        """
+        Remove as arestas duplicadas e ordena as restantes por origem (ordem CSR).
+        Retorna (origens, destinos, pesos) como arrays do numpy.
+        """
+        if self._finalizado is not None:
+            return self._finalizado
+        origens = np.frombuffer(self._origens, dtype=np.int64)
+        destinos = np.frombuffer(self._destinos, dtype=np.int64)
+        pesos = np.frombuffer(self._pesos, dtype=np.float64)
+        if not self.e_direcionado:
+            # A-B e B-A são a mesma aresta: normaliza para (menor id, maior id).
+            origens, destinos = np.minimum(origens, destinos), np.maximum(origens, destinos)
+        n = max(len(self.indices), 1)
+        # A chave origem * n + destino ordena por origem; return_index dá a primeira ocorrência de cada aresta.
+        _, primeiras = np.unique(origens * n + destinos, return_index=True)
+        pesos = pesos[primeiras]
+        if self._pesos_inteiros:
+            pesos = pesos.astype(np.int64)
+        self._finalizado = origens[primeiras], destinos[primeiras], pesos
+        self.estatisticas['arestas'] = len(primeiras)
+        self.estatisticas['duplicadas'] = len(self._pesos) - len(primeiras)
+        return self._finalizado
+
+    @property
+    def rotulos(self):
+        """Rótulos na ordem dos ids."""
+        return list(self.indices)
+
+    def posicoes(self):
+        """Posições (x, y) iniciais dos nós em um círculo (ver `posicoes_circulares`)."""
+        return posicoes_circulares(len(self.indices))
+
+    def salvar(self, caminho):
+        """Grava o grafo importado em um arquivo .grafo (as arestas já estão em ordem CSR)."""
+        origens, destinos, pesos = self.finalizar()
+        with EscritorGrafo(caminho, self.e_direcionado) as escritor:
+            for rotulo, (x, y) in zip(self.indices, self.posicoes().tolist()):
+                escritor.adicionar_no(rotulo, x, y)
+            escritor.adicionar_bloco(origens, destinos, pesos)
+
+    def para_grafo(self, grafo=None):
+        """Carrega o grafo importado em um núcleo `Grafo` (novo ou o informado, que é limpo antes)."""
+        origens, destinos, pesos = self.finalizar()
+        if grafo is None:
+            grafo = Grafo(self.e_direcionado)
+        posicoes = self.posicoes()
+        grafo.carregar_indexado(self.rotulos, posicoes[:, 0].tolist(), posicoes[:, 1].tolist(), origens.tolist(),
+                                destinos.tolist(), pesos.tolist(), self.e_direcionado)
+        return grafo
+
+def formatar_estatisticas(estatisticas):
+    """Resumo legível das estatísticas de importação (contadores e vazão)."""
+    segundos = max(estatisticas['segundos'], 1e-9)
+    return (f"{estatisticas['linhas']:,} linhas, {estatisticas['nos']:,} nós, "
+            f"{estatisticas['arestas_lidas']:,} arestas lidas"
+            + (f" ({estatisticas['arestas']:,} únicas, {estatisticas['duplicadas']:,} duplicadas)"
+               if estatisticas['arestas'] or estatisticas['duplicadas'] else "")
+            + f" em {segundos:.2f} s: {estatisticas['linhas'] / segundos:,.0f} linhas/s, "
+            f"{estatisticas['bytes'] / segundos / 1e6:.1f} MB/s")
+
+def main(argumentos=None):
+    """Ponto de entrada da linha de comando: converte uma lista de arestas em um arquivo .grafo."""
+    parser = argparse.ArgumentParser(description="Importa uma lista de arestas (CSV/TSV/texto, gzip opcional) "
+                                                 "e grava um arquivo .grafo.")
+    parser.add_argument('entrada', help="arquivo de arestas ('-' = entrada padrão)")
+    parser.add_argument('saida', help="arquivo .grafo a gravar")
+    parser.add_argument('--direcionado', action='store_true', help="trata as arestas como direcionadas")
+    parser.add_argument('-d', '--delimitador', default='auto',
+                        help="delimitador dos campos (padrão: pela extensão; 'espacos' = espaços em branco)")
+    parser.add_argument('--colunas', type=int, nargs=3, default=(0, 1, 2), metavar=('ORIGEM', 'DESTINO', 'PESO'),
+                        help="índices das colunas de origem, destino e peso (peso ausente = 1)")
+    parser.add_argument('--cabecalho', action='store_true', default=None,
+                        help="a primeira linha (fora comentários) é um cabeçalho (padrão: detectar)")
+    parser.add_argument('--sem-cabecalho', dest='cabecalho', action='store_false',
+                        help="a primeira linha (fora comentários) já é uma aresta")
+    parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO_IMPORTACAO, help="linhas por bloco")
+    args = parser.parse_args(argumentos)
+
+    delimitador = None if args.delimitador == 'espacos' else args.delimitador.replace('\\t', '\t')
+    importador = ImportadorArestas(args.direcionado, *args.colunas, cabecalho=args.cabecalho)
+    importador.importar(args.entrada, delimitador, args.bloco,
+                        ao_progresso=lambda estatisticas: print(formatar_estatisticas(estatisticas), file=sys.stderr))
+    importador.salvar(args.saida)
+    print(formatar_estatisticas(importador.estatisticas), file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
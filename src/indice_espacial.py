@@ -0,0 +1,131 @@
+from math import floor
+
+# =================================================================================
+#  ÍNDICE ESPACIAL EM GRADE (SEM PYQT5)
+# =================================================================================
+# A cena é dividida em células quadradas; cada chave (ex.: uma aresta) é registrada nas células
+# que ocupa. Uma consulta por retângulo visita apenas as células que ele cobre, então o custo
+# depende da área consultada e não do tamanho do grafo. Chaves que ocupariam muitas células (arestas
+# longas em um layout grande) ficam em uma lista à parte, devolvida em toda consulta: assim a memória e o
+# tempo de inserção ficam limitados a MAX_CELULAS_POR_CHAVE por chave, qualquer que seja a escala da cena.
+
+TAMANHO_CELULA_PADRAO = 128.0  # Lado de cada célula, em unidades da cena (cerca de três diâmetros de nó).
+MAX_CELULAS_POR_CHAVE = 64     # Acima disso a chave vai para a lista de chaves longas.
+
+class GradeEspacial:
+    """
+    Grade uniforme de células -> conjuntos de chaves, com inserção por caixa ou por segmento de reta.
+    Chaves que cobririam mais de `max_celulas` células ficam em `longas` e entram em todas as consultas.
+    """
+
+    def __init__(self, tamanho_celula=TAMANHO_CELULA_PADRAO, max_celulas=MAX_CELULAS_POR_CHAVE):
+        self.tamanho_celula = tamanho_celula
+        self.max_celulas = max_celulas
+        self._celulas = {}  # (coluna, linha) -> conjunto de chaves.
+        self._chaves = {}   # chave -> lista das células onde foi registrada (vazia para as chaves longas).
+        self.longas = set() # Chaves longas: sem células, devolvidas por toda consulta.
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def __contains__(self, chave):
+        return chave in self._chaves
+
+    def _intervalo(self, inicio, fim):
+        """Índices das células que cobrem o intervalo [inicio, fim] de um eixo."""
+        t = self.tamanho_celula
+        return range(floor(inicio / t), floor(fim / t) + 1)
+
+    @property
+    def numero_registros(self):
+        """Total de pares (célula, chave) registrados: a memória ocupada pela grade."""
+        return sum(map(len, self._chaves.values()))
+
+    def _registrar_longa(self, chave):
+        """Registra a chave na lista de chaves longas (substituindo um registro anterior)."""
+        self.remover(chave)
+        self.longas.add(chave)
+        self._chaves[chave] = []
+
+    def _registrar(self, chave, celulas):
+        """Registra a chave nas células informadas (substituindo um registro anterior)."""
+        self.remover(chave)
+        grade = self._celulas
+        for celula in celulas:
+            conjunto = grade.get(celula)
+            if conjunto is None:
+                grade[celula] = conjunto = set()
+            conjunto.add(chave)
+        self._chaves[chave] = celulas
+
+    def inserir_caixa(self, chave, x0, y0, x1, y1):
+        """Registra a chave em todas as células cobertas pela caixa (x0, y0)-(x1, y1)."""
+        colunas, linhas = self._intervalo(x0, x1), self._intervalo(y0, y1)
+        if len(colunas) * len(linhas) > self.max_celulas:
+            return self._registrar_longa(chave)
+        self._registrar(chave, [(cx, cy) for cx in colunas for cy in linhas])
+
+    def inserir_segmento(self, chave, x0, y0, x1, y1, margem=0.0):
+        """
+        Registra a chave apenas nas células atravessadas pelo segmento (x0, y0)-(x1, y1), alargado pela
+        margem. Uma aresta na diagonal ocupa O(comprimento) células, e não toda a sua caixa; acima de
+        `max_celulas` células ela vai para as chaves longas.
+        """
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0 # Percorre as colunas da esquerda para a direita.
+        t = self.tamanho_celula
+        # O segmento atravessa ao menos (colunas + linhas - 1) células: descarta os longos sem enumerá-las.
+        colunas = len(self._intervalo(x0, x1))
+        linhas = len(self._intervalo(min(y0, y1), max(y0, y1)))
+        if colunas + linhas - 1 > self.max_celulas:
+            return self._registrar_longa(chave)
+        inclinacao = (y1 - y0) / (x1 - x0) if x1 > x0 else None
+        celulas = []
+        for cx in self._intervalo(x0 - margem, x1 + margem):
+            if inclinacao is None:
+                ya, yb = y0, y1 # Segmento vertical: uma única coluna.
+            else:
+                # Trecho do segmento dentro da coluna (alargada pela margem).
+                xa, xb = max(x0, cx * t - margem), min(x1, (cx + 1) * t + margem)
+                ya, yb = y0 + (xa - x0) * inclinacao, y0 + (xb - x0) * inclinacao
+            celulas.extend((cx, cy) for cy in self._intervalo(min(ya, yb) - margem, max(ya, yb) + margem))
+        if len(celulas) > self.max_celulas:
+            return self._registrar_longa(chave) # Limite alcançado só por causa da margem.
+        self._registrar(chave, celulas)
+
+    def remover(self, chave):
+        """Remove a chave de todas as suas células (sem efeito se não estiver registrada)."""
+        celulas = self._chaves.pop(chave, None)
+        if celulas is None:
+            return
+        self.longas.discard(chave)
+        grade = self._celulas
+        for celula in celulas:
+            conjunto = grade[celula]
+            conjunto.discard(chave)
+            if not conjunto:
+                del grade[celula] # Células vazias não ocupam memória.
+
+    def numero_celulas(self, x0, y0, x1, y1):
+        """Quantidade de células visitadas por uma consulta ao retângulo (para decidir entre a grade e uma varredura)."""
+        return len(self._intervalo(x0, x1)) * len(self._intervalo(y0, y1))
+
+    def consultar(self, x0, y0, x1, y1):
+        """
+        Retorna o conjunto de chaves registradas nas células que cruzam o retângulo, mais as chaves longas.
+        O resultado é conservador: pode incluir chaves fora do retângulo, mas nunca omite uma que o cruze.
+        """
+        grade, resultado = self._celulas, set(self.longas)
+        linhas = self._intervalo(y0, y1)
+        for cx in self._intervalo(x0, x1):
+            for cy in linhas:
+                conjunto = grade.get((cx, cy))
+                if conjunto:
+                    resultado |= conjunto
+        return resultado
+
+    def limpar(self):
+        """Remove todas as chaves."""
+        self._celulas.clear()
+        self._chaves.clear()
+        self.longas.clear()
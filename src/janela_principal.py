@@ -1,17 +1,24 @@
 import random
 import sys
 import math
-import networkx as nx
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QLineEdit, QMessageBox, QFrame, QLabel,
     QGraphicsDropShadowEffect, QStatusBar, QFileDialog, QDialog,
-    QDialogButtonBox, QSpinBox, QGridLayout, QFormLayout, QComboBox
+    QDialogButtonBox, QSpinBox, QGridLayout, QFormLayout, QComboBox, QProgressBar, QTableView,
+    QShortcut, QDoubleSpinBox, QCheckBox
 )
-from PyQt5.QtGui import QIcon, QColor, QFont
-from PyQt5.QtCore import Qt, QPointF
-from grafo import VisualizadorGrafo, construir_grafo_nx_da_matriz, obter_todas_rotas, obter_caminho_mais_curto, \
-    obter_caminho_mais_longo_seguro  # Importa classes e funções do módulo 'grafo'.
+from PyQt5.QtGui import QIcon, QColor, QFont, QKeySequence
+from PyQt5.QtCore import Qt, QPointF, QThreadPool
+from grafo import VisualizadorGrafo, MAX_ROTAS_PADRAO, MAX_NOS_EXIBICAO, MAX_ARESTAS_EXIBICAO  # Importa a visualização do grafo do módulo 'grafo'.
+from trabalhador_rotas import TrabalhadorRotas  # Cálculo de rotas em segundo plano.
+from importador import ImportadorArestas, formatar_estatisticas  # Importação de listas de arestas.
+# Matrizes de adjacência em model/view: exibição virtualizada e entrada editável.
+from modelo_matriz import ModeloMatrizAdjacencia, ModeloMatrizEditavel, ler_matriz_texto, MAX_NOS_MATRIZ_EDITAVEL
+from rotulos import gerar_rotulos, resolver_rotulo  # Rótulos sequenciais A..Z, AA, AB... para os nós.
+from geradores import (MODELOS, gerar_gnm, gerar_gnp, gerar_barabasi_albert, gerar_grade_viaria,  # Grafos aleatórios.
+                       gerar_dag)
 
 # =================================================================================
 #  FOLHA DE ESTILOS (QSS)
@@ -48,6 +55,18 @@ QComboBox::drop-down {
 QComboBox::down-arrow {
     image: url(:/icons/down-arrow.png); /* Define uma imagem para a seta do dropdown */
 }
+QTableView {
+    background-color: #2E3440; /* Mesmo fundo dos campos de texto */
+    border: 1px solid #4C566A; /* Borda */
+    border-radius: 8px; /* Borda arredondada */
+    gridline-color: #434C5E; /* Linhas da grade da matriz */
+}
+QHeaderView::section {
+    background-color: #3B4252; /* Cabeçalhos (rótulos) da matriz */
+    color: #ECEFF4; /* Cor do texto dos cabeçalhos */
+    border: none; /* Sem borda */
+    padding: 2px; /* Preenchimento interno */
+}
 QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
     border: 1px solid #88C0D0; /* Borda quando o widget está em foco */
 }
@@ -79,6 +98,17 @@ QStatusBar {
 QStatusBar::item {
     border: none; /* Remove a borda dos itens da barra de status */
 }
+QProgressBar {
+    background-color: #2E3440; /* Cor de fundo da barra de progresso */
+    border: 1px solid #4C566A; /* Borda */
+    border-radius: 8px; /* Borda arredondada */
+    text-align: center; /* Texto centralizado */
+    max-height: 16px; /* Altura máxima */
+}
+QProgressBar::chunk {
+    background-color: #88C0D0; /* Cor do preenchimento */
+    border-radius: 8px; /* Borda arredondada */
+}
 """
 
 
@@ -89,7 +119,8 @@ QStatusBar::item {
 class DialogoEntradaMatriz(QDialog):
     """
     Diálogo para permitir ao usuário inserir os dados para criar uma matriz de adjacência,
-    que será usada para gerar o grafo.
+    que será usada para gerar o grafo. A matriz pode ser digitada em uma tabela (um modelo
+    numpy, sem um widget por célula), colada da área de transferência ou importada de um arquivo.
     """
 
     def __init__(self, e_direcionada=False, parent=None):
@@ -106,97 +137,175 @@ class DialogoEntradaMatriz(QDialog):
         self.widget_passo1 = QWidget()
         layout_passo1 = QFormLayout(self.widget_passo1)
         self.spinbox_nos = QSpinBox()  # SpinBox para selecionar o número de nós.
-        self.spinbox_nos.setRange(2, 26)  # Permite de 2 a 26 nós (letras A-Z).
+        self.spinbox_nos.setRange(2, MAX_NOS_MATRIZ_EDITAVEL)  # Rótulos A..Z, AA, AB... (ver gerar_rotulos).
         self.spinbox_nos.setValue(4)  # Valor inicial.
         layout_passo1.addRow("Número de Nós:", self.spinbox_nos)  # Adiciona ao layout do passo 1.
         self.layout.addWidget(self.widget_passo1)
 
-        # Widget para o segundo passo: a grade da matriz de adjacência.
+        # Widget para o segundo passo: a tabela da matriz de adjacência.
         self.widget_passo2 = QWidget()
-        self.layout_grade = QGridLayout(self.widget_passo2)  # Layout de grade para a matriz.
+        layout_passo2 = QVBoxLayout(self.widget_passo2)
+        layout_passo2.setContentsMargins(0, 0, 0, 0)
+        self.tabela_matriz = QTableView()  # Só as células visíveis são desenhadas.
+        self.tabela_matriz.horizontalHeader().setDefaultSectionSize(44)
+        self.tabela_matriz.verticalHeader().setDefaultSectionSize(26)
+        layout_passo2.addWidget(self.tabela_matriz)
         self.layout.addWidget(self.widget_passo2)
         self.widget_passo2.hide()  # Esconde inicialmente o passo 2.
 
-        # Botões padrão (OK e Cancelar) e um botão "Gerar Tabela".
+        # Botões padrão (OK e Cancelar), "Gerar Tabela" e as opções de colar/importar uma matriz pronta.
         self.caixa_botoes = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.botao_proximo = QPushButton("Gerar Tabela")
-        self.caixa_botoes.addButton(self.botao_proximo, QDialogButtonBox.ActionRole)
+        self.botao_colar = QPushButton("Colar Matriz")
+        self.botao_importar = QPushButton("Importar Arquivo...")
+        for botao in (self.botao_proximo, self.botao_colar, self.botao_importar):
+            self.caixa_botoes.addButton(botao, QDialogButtonBox.ActionRole)
         self.layout.addWidget(self.caixa_botoes)
         self.caixa_botoes.button(QDialogButtonBox.Ok).setEnabled(False)  # Botão OK desabilitado inicialmente.
 
         # Conexão de sinais e slots.
         self.botao_proximo.clicked.connect(self.criar_grade_matriz)  # Ao clicar em "Gerar Tabela".
+        self.botao_colar.clicked.connect(self.colar_matriz)  # Ao clicar em "Colar Matriz".
+        self.botao_importar.clicked.connect(self.importar_arquivo_matriz)  # Ao clicar em "Importar Arquivo...".
+        QShortcut(QKeySequence.Paste, self, self.colar_matriz)  # Ctrl+V cola uma matriz inteira.
         self.caixa_botoes.accepted.connect(self.accept)  # Ao clicar em OK.
         self.caixa_botoes.rejected.connect(self.reject)  # Ao clicar em Cancelar.
 
-        self.entradas_matriz = []  # Lista para armazenar os QLineEdit da matriz.
+        self.modelo_matriz = None  # ModeloMatrizEditavel com a matriz em edição.
         self.rotulos = []  # Lista para armazenar os rótulos dos nós.
 
     def criar_grade_matriz(self):
-        """
-        Cria dinamicamente a grade de QLineEdit para a matriz de adjacência
-        com base no número de nós selecionado.
-        """
-        # Limpa o layout da grade caso já existam widgets.
-        for i in reversed(range(self.layout_grade.count())):
-            self.layout_grade.itemAt(i).widget().setParent(None)
-
+        """Cria a tabela (zerada) da matriz de adjacência com base no número de nós selecionado."""
         num_nos = self.spinbox_nos.value()  # Obtém o número de nós.
-        self.rotulos = [chr(ord('A') + i) for i in range(num_nos)]  # Gera rótulos (A, B, C...).
-        self.entradas_matriz = [[None] * num_nos for _ in range(num_nos)]  # Inicializa a lista de QLineEdit.
-
-        # Adiciona rótulos de coluna (A, B, C...) na primeira linha da grade.
-        for j, rotulo in enumerate(self.rotulos):
-            self.layout_grade.addWidget(QLabel(f"<b>{rotulo}</b>"), 0, j + 1, Qt.AlignCenter)
-
-        # Preenche a grade com QLineEdit para os valores da matriz.
-        for i, rotulo in enumerate(self.rotulos):
-            self.layout_grade.addWidget(QLabel(f"<b>{rotulo}</b>"), i + 1, 0)  # Adiciona rótulos de linha.
-            for j in range(num_nos):
-                entrada_linha = QLineEdit("0")  # Campo de entrada com valor inicial "0".
-                entrada_linha.setFixedWidth(40)  # Largura fixa.
-                entrada_linha.setAlignment(Qt.AlignCenter)  # Alinhamento do texto.
-
-                if i == j:  # Diagonal principal (conexão de um nó consigo mesmo).
-                    entrada_linha.setDisabled(True)  # Desabilita a edição.
-                elif not self.e_direcionada:
-                    if j < i:  # Para grafos não direcionados, a parte inferior triangular é simétrica.
-                        entrada_linha.setDisabled(True)  # Desabilita a edição.
-                    else:
-                        # Conecta o sinal textChanged para atualizar o valor simétrico na matriz.
-                        entrada_linha.textChanged.connect(
-                            lambda text, r=i, c=j: self.atualizar_valor_simetrico(text, r, c)
-                        )
-                self.layout_grade.addWidget(entrada_linha, i + 1, j + 1)  # Adiciona o QLineEdit à grade.
-                self.entradas_matriz[i][j] = entrada_linha  # Armazena a referência ao QLineEdit.
+        self.definir_matriz(gerar_rotulos(num_nos))  # Gera rótulos (A, B, C... Z, AA, AB...).
+
+    def definir_matriz(self, rotulos, matriz=None):
+        """Exibe a tabela com os rótulos e a matriz informados (zerada se None)."""
+        self.rotulos = list(rotulos)
+        self.modelo_matriz = ModeloMatrizEditavel(self.rotulos, matriz, self.e_direcionada, self)
+        self.tabela_matriz.setModel(self.modelo_matriz)
 
         self.widget_passo1.hide()  # Esconde o primeiro passo.
         self.botao_proximo.hide()  # Esconde o botão "Gerar Tabela".
         self.widget_passo2.show()  # Mostra o segundo passo (a matriz).
         self.caixa_botoes.button(QDialogButtonBox.Ok).setEnabled(True)  # Habilita o botão OK.
+        # A tabela cresce com a matriz até um tamanho confortável; matrizes maiores usam a rolagem.
+        n = len(self.rotulos)
+        self.tabela_matriz.setMinimumSize(min(60 + 44 * n, 900), min(40 + 26 * n, 600))
         self.adjustSize()  # Ajusta o tamanho do diálogo para o novo conteúdo.
 
-    def atualizar_valor_simetrico(self, texto, linha, coluna):
-        """
-        Para grafos não direcionados, mantém a simetria da matriz
-        atualizando o valor correspondente.
-        """
-        if self.entradas_matriz[coluna][linha]:
-            # Se o QLineEdit simétrico existe, atualiza seu texto.
-            self.entradas_matriz[coluna][linha].setText(texto)
+    def colar_matriz(self):
+        """Lê uma matriz inteira da área de transferência (ex.: copiada de uma planilha)."""
+        self.carregar_texto_matriz(QApplication.clipboard().text(), "área de transferência")
+
+    def importar_arquivo_matriz(self):
+        """Lê uma matriz de um arquivo de texto/CSV (inclusive o TXT salvo pelo aplicativo)."""
+        nome_arquivo, _ = QFileDialog.getOpenFileName(
+            self, "Importar Matriz", "", "Matrizes (*.txt *.csv *.tsv);;Todos os Arquivos (*)")
+        if not nome_arquivo:
+            return
+        try:
+            with open(nome_arquivo, encoding='utf-8') as arquivo:
+                texto = arquivo.read()
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao abrir o arquivo: {e}")
+            return
+        self.carregar_texto_matriz(texto, "arquivo")
+
+    def carregar_texto_matriz(self, texto, origem):
+        """Converte o texto em matriz (ver `ler_matriz_texto`) e o exibe na tabela."""
+        try:
+            rotulos, matriz = ler_matriz_texto(texto)
+        except ValueError as e:
+            QMessageBox.warning(self, "Matriz Inválida", f"Não foi possível ler a matriz da {origem}: {e}")
+            return
+        self.definir_matriz(rotulos or gerar_rotulos(len(matriz)), matriz)
 
     def obter_dados_matriz(self):
-        """Obtém os rótulos e a matriz de adjacência dos QLineEdit preenchidos."""
-        num_nos = len(self.rotulos)
-        matriz = [[0] * num_nos for _ in range(num_nos)]
-        for i in range(num_nos):
-            for j in range(num_nos):
-                try:
-                    # Converte o texto de cada QLineEdit para um inteiro.
-                    matriz[i][j] = int(self.entradas_matriz[i][j].text())
-                except (ValueError, TypeError):
-                    matriz[i][j] = 0  # Se houver erro de conversão, assume 0.
-        return self.rotulos, matriz  # Retorna os rótulos e a matriz.
+        """Obtém os rótulos e a matriz de adjacência (numpy.ndarray n x n) da tabela."""
+        return self.rotulos, self.modelo_matriz.matriz
+
+
+class DialogoGerarGrafo(QDialog):
+    """
+    Diálogo para gerar um grafo aleatório por um dos modelos de `geradores` (G(n, m), G(n, p),
+    Barabási–Albert, grade viária ou DAG), com semente opcional. O grafo gerado pode ser exibido
+    na tela ou gravado direto em um arquivo .grafo, sem desenho (obrigatório acima dos limites de exibição).
+    """
+
+    # Modelo -> (rótulo do tamanho, rótulo do parâmetro, casas decimais, mínimo, máximo e valor padrão do parâmetro).
+    PARAMETROS = {
+        'gnm': ("Número de Nós:", "Número de Arestas:", 0, 0, 1e9, 12),
+        'gnp': ("Número de Nós:", "Probabilidade (p):", 4, 0, 1, 0.3),
+        'ba': ("Número de Nós:", "Ligações por Nó:", 0, 1, 1e6, 2),
+        'grade': ("Linhas:", "Colunas:", 0, 1, 1e6, 3),
+        'dag': ("Número de Nós:", "Número de Arestas:", 0, 0, 1e9, 12),
+    }
+
+    def __init__(self, e_direcionada=False, parent=None):
+        super().__init__(parent)
+        self.e_direcionada = e_direcionada  # Tipo atual do grafo (o DAG é sempre direcionado).
+        self.setWindowTitle("Gerar Grafo por Modelo")
+        self.setMinimumWidth(350)  # Largura mínima do diálogo.
+
+        layout = QFormLayout(self)
+        self.combo_modelo = QComboBox()  # Modelo de grafo aleatório.
+        for chave, descricao in MODELOS.items():
+            self.combo_modelo.addItem(descricao, chave)
+        self.spinbox_tamanho = QSpinBox()  # Número de nós (ou linhas da grade).
+        self.spinbox_tamanho.setRange(1, 10_000_000)
+        self.spinbox_tamanho.setValue(8)
+        self.spinbox_parametro = QDoubleSpinBox()  # Arestas, probabilidade, ligações ou colunas, conforme o modelo.
+        self.spinbox_semente = QSpinBox()  # Semente do gerador (0 = aleatória).
+        self.spinbox_semente.setRange(0, 2**31 - 1)
+        self.spinbox_semente.setSpecialValueText("Aleatória")
+        self.caixa_exibir = QCheckBox("Exibir o grafo gerado")  # Desmarcado: grava um arquivo .grafo sem desenhar.
+        self.caixa_exibir.setChecked(True)
+        layout.addRow("Modelo:", self.combo_modelo)
+        layout.addRow("Número de Nós:", self.spinbox_tamanho)
+        layout.addRow("Número de Arestas:", self.spinbox_parametro)
+        layout.addRow("Semente:", self.spinbox_semente)
+        layout.addRow(self.caixa_exibir)
+
+        caixa_botoes = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        caixa_botoes.accepted.connect(self.accept)
+        caixa_botoes.rejected.connect(self.reject)
+        layout.addRow(caixa_botoes)
+        self.combo_modelo.currentIndexChanged.connect(self.ao_modelo_alterado)
+        self.ao_modelo_alterado()
+
+    @property
+    def modelo(self):
+        return self.combo_modelo.currentData()
+
+    @property
+    def exibir(self):
+        return self.caixa_exibir.isChecked()
+
+    def ao_modelo_alterado(self):
+        """Ajusta os rótulos e o intervalo do parâmetro ao modelo escolhido."""
+        rotulo_tamanho, rotulo_parametro, decimais, minimo, maximo, padrao = self.PARAMETROS[self.modelo]
+        layout = self.layout()
+        layout.labelForField(self.spinbox_tamanho).setText(rotulo_tamanho)
+        layout.labelForField(self.spinbox_parametro).setText(rotulo_parametro)
+        self.spinbox_parametro.setDecimals(decimais)
+        self.spinbox_parametro.setRange(minimo, maximo)
+        self.spinbox_parametro.setSingleStep(0.05 if decimais else 1)
+        self.spinbox_parametro.setValue(padrao)
+
+    def gerar(self):
+        """Gera o grafo com os valores informados. Retorna um `GrafoGerado` (ValueError se inválidos)."""
+        tamanho, parametro = self.spinbox_tamanho.value(), self.spinbox_parametro.value()
+        semente = self.spinbox_semente.value() or None
+        if self.modelo == 'gnm':
+            return gerar_gnm(tamanho, int(parametro), self.e_direcionada, semente)
+        if self.modelo == 'gnp':
+            return gerar_gnp(tamanho, parametro, self.e_direcionada, semente)
+        if self.modelo == 'ba':
+            return gerar_barabasi_albert(tamanho, int(parametro), self.e_direcionada, semente)
+        if self.modelo == 'grade':
+            return gerar_grade_viaria(tamanho, int(parametro), self.e_direcionada, semente)
+        return gerar_dag(tamanho, int(parametro), semente)
 
 
 class JanelaPrincipal(QMainWindow):
@@ -220,8 +329,10 @@ class JanelaPrincipal(QMainWindow):
         layout_principal.setSpacing(15)  # Espaçamento entre widgets.
 
         self.visualizador_grafo = VisualizadorGrafo()  # Instância do visualizador de grafo.
-        # Conecta o sinal grafoAlterado do visualizador para atualizar a matriz de adjacência.
-        self.visualizador_grafo.grafoAlterado.connect(self.gerar_matriz_da_visualizacao)
+        # A matriz de adjacência observa o núcleo do grafo e aplica as alterações a cada grafoAlterado
+        # (uma vez por rajada de edições ou por lote), atualizando apenas as células alteradas.
+        self.modelo_matriz_adj = ModeloMatrizAdjacencia(self.visualizador_grafo.grafo, self,
+                                                        notificacao=self.visualizador_grafo.grafoAlterado)
         layout_principal.addWidget(self.visualizador_grafo, stretch=3)  # Adiciona o visualizador ao layout.
 
         painel_controles = QFrame()  # Painel lateral para os controles.
@@ -234,8 +345,11 @@ class JanelaPrincipal(QMainWindow):
 
         # 1. Matriz de Adjacência
         layout_controles.addWidget(self.create_title_label("Matriz de Adjacência"))
-        self.entrada_matriz_adj = QTextEdit()  # Campo para exibir a matriz de adjacência.
-        layout_controles.addWidget(self.entrada_matriz_adj, stretch=2)
+        self.tabela_matriz_adj = QTableView()  # Tabela da matriz de adjacência (só as células visíveis são desenhadas).
+        self.tabela_matriz_adj.setModel(self.modelo_matriz_adj)
+        self.tabela_matriz_adj.horizontalHeader().setDefaultSectionSize(40)  # Colunas estreitas, como na matriz em texto.
+        self.tabela_matriz_adj.verticalHeader().setDefaultSectionSize(24)
+        layout_controles.addWidget(self.tabela_matriz_adj, stretch=2)
 
         # 2. Tipo de Grafo
         layout_controles.addWidget(self.create_title_label("Tipo de Grafo"))
@@ -287,6 +401,14 @@ class JanelaPrincipal(QMainWindow):
         self.botao_grafo_aleatorio = QPushButton("Grafo Aleatório")
         self.botao_deletar_grafo = QPushButton("Limpar Tudo")
         self.botao_salvar_grafo = QPushButton("Salvar Grafo (TXT)")
+        self.botao_abrir_grafo = QPushButton("Abrir Grafo")
+        self.botao_salvar_binario = QPushButton("Salvar Grafo (Binário)")
+        self.botao_importar_arestas = QPushButton("Importar Lista de Arestas")
+        self.botao_gerar_modelo = QPushButton("Gerar por Modelo")
+        self.botao_analisar_grafo = QPushButton("Analisar Grafo")
+        self.botao_analisar_grafo.setCheckable(True)  # Modo de análise: rotas mínimas por índice pré-calculado.
+        self.botao_cancelar_calculo = QPushButton("Cancelar Cálculo")
+        self.botao_cancelar_calculo.setEnabled(False)  # Habilitado apenas durante um cálculo de rotas.
 
         # Adiciona os botões de ação ao layout de grade.
         grade_acoes.addWidget(self.botao_calcular_rotas, 0, 0)
@@ -295,6 +417,12 @@ class JanelaPrincipal(QMainWindow):
         grade_acoes.addWidget(self.botao_grafo_aleatorio, 1, 1)
         grade_acoes.addWidget(self.botao_deletar_grafo, 2, 0)
         grade_acoes.addWidget(self.botao_salvar_grafo, 2, 1)
+        grade_acoes.addWidget(self.botao_abrir_grafo, 3, 0)
+        grade_acoes.addWidget(self.botao_salvar_binario, 3, 1)
+        grade_acoes.addWidget(self.botao_analisar_grafo, 4, 0)
+        grade_acoes.addWidget(self.botao_cancelar_calculo, 4, 1)
+        grade_acoes.addWidget(self.botao_importar_arestas, 5, 0)
+        grade_acoes.addWidget(self.botao_gerar_modelo, 5, 1)
         layout_controles.addLayout(grade_acoes)
 
         # Separador visual.
@@ -302,6 +430,10 @@ class JanelaPrincipal(QMainWindow):
 
         # 6. Resultados (Saída das rotas)
         layout_controles.addWidget(self.create_title_label("Resultados"))
+        self.barra_progresso = QProgressBar()  # Progresso do cálculo de rotas em segundo plano.
+        self.barra_progresso.setFormat("%v rotas")
+        self.barra_progresso.hide()  # Visível apenas durante um cálculo.
+        layout_controles.addWidget(self.barra_progresso)
         self.saida_rotas = QTextEdit()  # Campo para exibir os resultados das rotas.
         self.saida_rotas.setReadOnly(True)  # Apenas leitura.
         layout_controles.addWidget(self.saida_rotas, stretch=3)
@@ -310,6 +442,11 @@ class JanelaPrincipal(QMainWindow):
 
         self.setStatusBar(QStatusBar(self))  # Cria uma barra de status.
         self.statusBar().showMessage("Pronto.")  # Mensagem inicial na barra de status.
+        self.rotulo_resumo_grafo = QLabel()  # Contagem de nós e arestas, fixa à direita da barra de status.
+        self.statusBar().addPermanentWidget(self.rotulo_resumo_grafo)
+        self.atualizar_resumo_grafo()
+
+        self.trabalhador_rotas = None  # Cálculo de rotas em andamento (TrabalhadorRotas), se houver.
 
         # Conexões de sinais e slots para os controles.
         self.combo_tipo_grafo.currentIndexChanged.connect(self.ao_tipo_grafo_alterado)  # Ao mudar o tipo de grafo.
@@ -320,8 +457,21 @@ class JanelaPrincipal(QMainWindow):
         self.botao_gerar_matriz.clicked.connect(self.gerar_matriz_da_visualizacao)  # Ao clicar em "Gerar Matriz".
         self.botao_criar_matriz.clicked.connect(self.criar_matriz_do_input)  # Ao clicar em "Criar Matriz por Tabela".
         self.botao_grafo_aleatorio.clicked.connect(self.gerar_grafo_aleatorio)  # Ao clicar em "Grafo Aleatório".
+        self.botao_gerar_modelo.clicked.connect(self.gerar_grafo_por_modelo)  # Ao clicar em "Gerar por Modelo".
         self.botao_deletar_grafo.clicked.connect(self.deletar_grafo)  # Ao clicar em "Limpar Tudo".
         self.botao_salvar_grafo.clicked.connect(self.salvar_dados_grafo_em_txt)  # Ao clicar em "Salvar Grafo".
+        self.botao_cancelar_calculo.clicked.connect(self.cancelar_calculo_rotas)  # Ao clicar em "Cancelar Cálculo".
+        self.botao_abrir_grafo.clicked.connect(self.abrir_grafo_binario)  # Ao clicar em "Abrir Grafo".
+        self.botao_salvar_binario.clicked.connect(self.salvar_grafo_binario)  # Ao clicar em "Salvar Grafo (Binário)".
+        self.botao_importar_arestas.clicked.connect(self.importar_lista_arestas)  # Ao clicar em "Importar Lista de Arestas".
+        self.botao_analisar_grafo.toggled.connect(self.ao_alternar_modo_analise)  # Ao alternar "Analisar Grafo".
+        # grafoAlterado chega uma vez por rajada de edições ou por lote (ver VisualizadorGrafo.lote).
+        self.visualizador_grafo.grafoAlterado.connect(self.atualizar_resumo_grafo)
+
+    def atualizar_resumo_grafo(self):
+        """Atualiza a contagem de nós e arestas exibida na barra de status."""
+        grafo = self.visualizador_grafo.grafo
+        self.rotulo_resumo_grafo.setText(f"{len(grafo)} nós · {grafo.numero_arestas()} arestas")
 
     def ao_botao_modo_alternado(self):
         """
@@ -402,42 +552,22 @@ class JanelaPrincipal(QMainWindow):
         dialogo = DialogoEntradaMatriz(self.e_direcionada, self)  # Instancia o diálogo da matriz.
         if dialogo.exec_() == QDialog.Accepted:  # Se o usuário clicar em OK no diálogo.
             rotulos, matriz = dialogo.obter_dados_matriz()  # Obtém os dados da matriz preenchidos.
+            self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica ao novo grafo.
             self.visualizador_grafo.limpar()  # Limpa o grafo atual.
             self.saida_rotas.clear()  # Limpa os resultados de rotas.
-            self.visualizador_grafo.atualizar_da_matriz(rotulos, matriz)  # Atualiza o grafo visualmente.
-            self.atualizar_texto_matriz_adj(rotulos, matriz)  # Atualiza o QTextEdit da matriz.
+            self.visualizador_grafo.atualizar_da_matriz(rotulos, matriz)  # Atualiza o grafo (e a tabela da matriz).
             self.statusBar().showMessage("Matriz criada e grafo atualizado.", 4000)  # Mensagem na barra de status.
 
-    def atualizar_texto_matriz_adj(self, rotulos, mat):
-        """
-        Formata e exibe a matriz de adjacência no QTextEdit.
-        """
-        if not rotulos:
-            self.entrada_matriz_adj.setPlainText("Nenhum nó presente para gerar a matriz.")
-            return
-
-        # Constrói o cabeçalho da matriz (rótulos das colunas).
-        cabeçalho = f"    {' '.join(f'{rotulo:^3}' for rotulo in rotulos)}"
-        # Constrói a linha separadora.
-        separador = f"  {'-' * (len(cabeçalho) - 2)}"
-        string_matriz = [cabeçalho, separador]  # Lista para as linhas da matriz formatada.
-
-        # Adiciona cada linha da matriz com rótulos de linha e valores.
-        for i, rotulo_linha in enumerate(rotulos):
-            valores_linha = " ".join(f"{val:^3}" for val in mat[i])
-            string_matriz.append(f"{rotulo_linha:^3}| {valores_linha}")
-        self.entrada_matriz_adj.setPlainText("\n".join(string_matriz))  # Define o texto no QTextEdit.
-
     def gerar_grafo_aleatorio(self):
         """
         Gera um grafo com um número aleatório de nós e arestas,
         e atualiza a visualização e a matriz.
         """
         try:
+            self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica ao novo grafo.
             self.visualizador_grafo.limpar()  # Limpa o grafo atual.
             n_nos = random.randint(5, 8)  # Gera entre 5 e 8 nós aleatoriamente.
             self.visualizador_grafo.gerar_nos_aleatorios(n_nos)  # Gera os nós e arestas.
-            self.gerar_matriz_da_visualizacao()  # Atualiza a matriz exibida.
             self.saida_rotas.clear()  # Limpa os resultados de rotas.
             self.statusBar().showMessage(f"{n_nos} nós gerados aleatoriamente.", 4000)  # Mensagem na barra de status.
         except Exception as e:
@@ -445,25 +575,24 @@ class JanelaPrincipal(QMainWindow):
 
     def gerar_matriz_da_visualizacao(self):
         """
-        Gera a matriz de adjacência a partir do grafo atualmente desenhado
-        e a exibe no QTextEdit.
+        Relê a matriz de adjacência do grafo atualmente desenhado. A tabela já acompanha
+        cada alteração do grafo; o botão apenas a reinicia e volta ao início.
         """
-        try:
-            rotulos, mat = self.visualizador_grafo.gerar_matriz_adjacencia()  # Obtém a matriz do visualizador.
-            self.atualizar_texto_matriz_adj(rotulos, mat)  # Atualiza o texto da matriz.
-            if rotulos:
-                self.statusBar().showMessage("Matriz gerada a partir da visualização.",
-                                             4000)  # Mensagem na barra de status.
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro ao gerar matriz: {e}")  # Exibe erro.
+        self.modelo_matriz_adj.recarregar()
+        self.tabela_matriz_adj.scrollToTop()
+        if self.modelo_matriz_adj.rotulos:
+            self.statusBar().showMessage("Matriz gerada a partir da visualização.", 4000)  # Mensagem na barra de status.
+        else:
+            self.statusBar().showMessage("Nenhum nó presente para gerar a matriz.", 4000)
 
     def deletar_grafo(self):
         """
         Limpa completamente o grafo, a matriz de adjacência,
         os resultados de rotas e os campos de origem/destino.
         """
-        self.visualizador_grafo.limpar()  # Limpa o visualizador do grafo.
-        self.entrada_matriz_adj.clear()  # Limpa o campo da matriz.
+        self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica mais ao grafo limpo.
+        self.visualizador_grafo.limpar()  # Limpa o visualizador do grafo (e a tabela da matriz).
+        self.atualizar_resumo_grafo()  # Limpar não emite grafoAlterado.
         self.saida_rotas.clear()  # Limpa os resultados de rotas.
         self.entrada_origem.clear()  # Limpa o campo de origem.
         self.entrada_destino.clear()  # Limpa o campo de destino.
@@ -506,85 +635,326 @@ class JanelaPrincipal(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Erro", f"Erro ao salvar os dados: {e}")  # Exibe erro ao salvar.
 
-    def obter_passos_caminho_str(self, G, caminho):
+    def salvar_grafo_binario(self):
+        """Salva o grafo no formato binário (.grafo), que pode ser reaberto pelo aplicativo."""
+        if not len(self.visualizador_grafo.grafo):
+            QMessageBox.warning(self, "Aviso", "O grafo está vazio. Adicione nós e arestas primeiro.")
+            return
+        nome_arquivo, _ = QFileDialog.getSaveFileName(self, "Salvar Grafo", "grafo.grafo",
+                                                      "Grafos (*.grafo);;Todos os Arquivos (*)")
+        if nome_arquivo:
+            try:
+                self.visualizador_grafo.salvar_arquivo(nome_arquivo)
+                self.statusBar().showMessage(f"Grafo salvo em: {nome_arquivo}", 5000)
+            except Exception as e:
+                QMessageBox.critical(self, "Erro", f"Erro ao salvar o grafo: {e}")
+
+    def abrir_grafo_binario(self):
+        """Abre um grafo salvo no formato binário (.grafo), substituindo o grafo atual."""
+        nome_arquivo, _ = QFileDialog.getOpenFileName(self, "Abrir Grafo", "",
+                                                      "Grafos (*.grafo);;Todos os Arquivos (*)")
+        if not nome_arquivo:
+            return
+        try:
+            self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica ao novo grafo.
+            self.visualizador_grafo.carregar_arquivo(nome_arquivo)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao abrir o grafo: {e}")
+            return
+        self.sincronizar_tipo_grafo()  # O arquivo define o tipo do grafo.
+        self.saida_rotas.clear()  # Limpa os resultados de rotas.
+        self.statusBar().showMessage(f"Grafo carregado de: {nome_arquivo}", 5000)
+
+    def sincronizar_tipo_grafo(self):
+        """Copia o tipo do grafo carregado no visualizador para a flag e o ComboBox, sem pedir confirmação."""
+        self.e_direcionada = self.visualizador_grafo.e_direcionada
+        self.combo_tipo_grafo.blockSignals(True)
+        self.combo_tipo_grafo.setCurrentIndex(1 if self.e_direcionada else 0)
+        self.combo_tipo_grafo.blockSignals(False)
+
+    def importar_lista_arestas(self):
+        """Importa uma lista de arestas (CSV/TSV/texto, opcionalmente gzip) no tipo de grafo atual."""
+        nome_arquivo, _ = QFileDialog.getOpenFileName(
+            self, "Importar Lista de Arestas", "",
+            "Listas de Arestas (*.csv *.tsv *.txt *.gz);;Todos os Arquivos (*)")
+        if not nome_arquivo:
+            return
+        try:
+            self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica ao novo grafo.
+            importador = ImportadorArestas(self.e_direcionada)
+            importador.importar(nome_arquivo)
+            with self.visualizador_grafo.lote():  # Um único grafoAlterado (e uma atualização do resumo) ao final.
+                importador.para_grafo(self.visualizador_grafo.grafo)
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao importar a lista de arestas: {e}")
+            return
+        self.saida_rotas.clear()  # Limpa os resultados de rotas.
+        self.statusBar().showMessage(f"Importado: {formatar_estatisticas(importador.estatisticas)}", 8000)
+
+    def gerar_grafo_por_modelo(self):
+        """
+        Gera um grafo por um modelo aleatório (ver `DialogoGerarGrafo`) e o exibe, substituindo o grafo
+        atual, ou o grava em um arquivo .grafo sem desenhá-lo.
+        """
+        dialogo = DialogoGerarGrafo(self.e_direcionada, self)
+        if dialogo.exec_() != QDialog.Accepted:
+            return
+        nome_arquivo = None
+        if not dialogo.exibir:
+            nome_arquivo = self.escolher_arquivo_grafo_gerado()
+            if not nome_arquivo:
+                return
+        try:
+            inicio = time.perf_counter()
+            gerado = dialogo.gerar()
+            segundos = time.perf_counter() - inicio
+            if not nome_arquivo and not self.visualizador_grafo.cabe_na_cena(gerado.numero_nos, gerado.numero_arestas):
+                # Grande demais para a cena: o grafo é gravado em um arquivo .grafo, sem desenho.
+                QMessageBox.information(
+                    self, "Grafo Grande Demais",
+                    f"O grafo gerado ({gerado.numero_nos:,} nós e {gerado.numero_arestas:,} arestas) é grande demais "
+                    f"para ser exibido (limite de {MAX_NOS_EXIBICAO:,} nós e {MAX_ARESTAS_EXIBICAO:,} arestas). "
+                    "Escolha um arquivo .grafo para gravá-lo.")
+                nome_arquivo = self.escolher_arquivo_grafo_gerado()
+                if not nome_arquivo:
+                    return
+            inicio = time.perf_counter()  # Não conta o tempo gasto nos diálogos.
+            if nome_arquivo:
+                gerado.salvar(nome_arquivo)
+            else:
+                self.descartar_calculo_rotas()  # Um cálculo em andamento não se aplica ao novo grafo.
+                self.visualizador_grafo.carregar_gerado(gerado)
+                self.sincronizar_tipo_grafo()  # O DAG é sempre direcionado.
+                self.saida_rotas.clear()  # Limpa os resultados de rotas.
+            segundos += time.perf_counter() - inicio
+        except Exception as e:
+            QMessageBox.critical(self, "Erro", f"Erro ao gerar o grafo: {e}")
+            return
+        destino = f" e gravado em: {nome_arquivo}" if nome_arquivo else ""
+        self.statusBar().showMessage(
+            f"{MODELOS[dialogo.modelo]}: {gerado.numero_nos:,} nós e {gerado.numero_arestas:,} arestas gerados "
+            f"em {segundos:.2f} s{destino}.", 8000)
+
+    def escolher_arquivo_grafo_gerado(self):
+        """Pede o arquivo .grafo em que um grafo gerado será gravado. Retorna o caminho ou '' se cancelado."""
+        nome_arquivo, _ = QFileDialog.getSaveFileName(self, "Salvar Grafo Gerado", "grafo.grafo",
+                                                      "Grafos (*.grafo);;Todos os Arquivos (*)")
+        return nome_arquivo
+
+    def obter_passos_caminho_str(self, caminho, G=None):
         """
         Função auxiliar para gerar uma string formatada com os passos e custos
-        individuais de um caminho.
+        individuais de um caminho. Se `G` for informado (cópia usada em um cálculo em
+        segundo plano), os pesos vêm dele; caso contrário, do grafo atual.
         """
         if len(caminho) < 2:
             return ""  # Caminho muito curto, sem passos.
+        grafo = self.visualizador_grafo.grafo
         passos = []
         for i in range(len(caminho) - 1):
             u, v = caminho[i], caminho[i + 1]
-            custo_aresta = G[u][v]['weight']  # Obtém o peso da aresta.
+            # Obtém o peso da aresta (consulta O(1) no núcleo ou na cópia usada no cálculo).
+            custo_aresta = G[u][v]['weight'] if G is not None else grafo.peso(u, v)
             passos.append(f"{u}→{v}: {custo_aresta}")  # Formata o passo.
         return f" <span style='color: #A3BE8C; font-size: 13px;'>({', '.join(passos)})</span>"
 
+    def formatar_analise_rotas_html(self, analise, G=None):
+        """Monta o HTML exibido na área de resultados a partir de uma análise de rotas."""
+        origem, destino = analise['origem'], analise['destino']
+        # Configura o estilo HTML para a saída de rotas.
+        estilo = "color: #ECEFF4; font-family: 'Segoe UI', sans-serif; font-size: 14px; line-height: 1.6;"
+        html = f"<div style='{estilo}'>"
+        html += f"<h4>■ Análise de Rotas: {origem} → {destino} ■</h4>"
+        if analise['cancelado']:
+            html += "<p style='color: #BF616A;'>⛔ Cálculo cancelado: exibindo resultados parciais.</p>"
+
+        # Rotas de menor custo, obtidas diretamente (algoritmo de Yen), sem ordenar todas as rotas.
+        if analise['melhores']:
+            html += f"<p><b>🥇 As {len(analise['melhores'])} Melhores Rotas:</b></p><ol>"
+            for r_path, custo in analise['melhores']:
+                string_caminho = ' → '.join(r_path)  # Formata o caminho.
+                string_passos = self.obter_passos_caminho_str(r_path, G)  # Obtém os passos detalhados.
+                html += f"<li>{string_caminho} &nbsp; (Custo Total: <b>{custo}</b>){string_passos}</li>"
+            html += "</ol>"
+
+        if not analise['rotas']:
+            html += "<p>Nenhuma rota encontrada.</p>"  # Mensagem se não houver rotas.
+        else:
+            # As rotas são listadas na ordem em que foram encontradas; o ranking fica na seção acima.
+            html += "<p><b>Todas as Rotas Simples (ordem de descoberta):</b></p><ul>"
+            for r_path, custo in analise['rotas']:
+                string_caminho = ' → '.join(r_path)
+                string_passos = self.obter_passos_caminho_str(r_path, G)
+                html += f"<li>{string_caminho} &nbsp; (Custo Total: <b>{custo}</b>){string_passos}</li>"
+            html += "</ul>"
+            if analise['truncado']:  # Informa que a lista está incompleta.
+                html += f"<p style='color: #EBCB8B;'>⚠️ {analise['aviso_truncamento']}</p>"
+            html += "<br>"
+
+        # Exibe o caminho mais curto.
+        if analise['mais_curta']:
+            caminho_mais_curto, custo = analise['mais_curta']
+            string_caminho = ' → '.join(caminho_mais_curto)
+            string_passos = self.obter_passos_caminho_str(caminho_mais_curto, G)
+            html += f"<p><b>🏆 Rota Mais Curta (menor custo):</b><br> &nbsp; &nbsp; {string_caminho} &nbsp; (Custo: <b>{custo}</b>){string_passos}</p>"
+
+        # Exibe o caminho mais longo (busca dedicada, sem depender da lista de rotas).
+        if rota_mais_longa := analise['mais_longa']:
+            caminho_mais_longo, custo = rota_mais_longa['caminho'], rota_mais_longa['custo']
+            string_caminho = ' → '.join(caminho_mais_longo)
+            string_passos = self.obter_passos_caminho_str(caminho_mais_longo, G)
+            aviso = "" if rota_mais_longa['exato'] else " <i>(melhor encontrada dentro do limite de tempo)</i>"
+            html += f"<p><b>🧗 Rota Mais Longa Simples:</b>{aviso}<br> &nbsp; &nbsp; {string_caminho} &nbsp; (Custo: <b>{custo}</b>){string_passos}</p>"
+
+        html += "</div>"
+        return html
+
     def calcular_rotas(self):
         """
-        Calcula e exibe as rotas (todas as simples, mais curta, mais longa)
+        Calcula e exibe as rotas (melhores, todas as simples, mais curta, mais longa)
         entre os nós de origem e destino especificados.
         """
-        rotulos, matriz = self.visualizador_grafo.gerar_matriz_adjacencia()  # Obtém a matriz do grafo.
-        if not rotulos:
+        grafo = self.visualizador_grafo.grafo
+        if not len(grafo):
             QMessageBox.warning(self, "Aviso", "O grafo está vazio. Adicione nós e arestas primeiro.")
             return  # Avisa se o grafo estiver vazio.
 
-        origem = self.entrada_origem.text().strip().upper()  # Obtém e formata o nó de origem.
-        destino = self.entrada_destino.text().strip().upper()  # Obtém e formata o nó de destino.
+        # Rótulos como digitados ('a' vale 'A' se só existir o nó 'A'; ver `resolver_rotulo`).
+        origem = resolver_rotulo(self.entrada_origem.text().strip(), grafo)  # Obtém o nó de origem.
+        destino = resolver_rotulo(self.entrada_destino.text().strip(), grafo)  # Obtém o nó de destino.
 
         if not origem or not destino:
             QMessageBox.warning(self, "Aviso", "Origem e destino devem ser preenchidos.")
             return  # Avisa se origem ou destino estiverem vazios.
 
-        if origem not in rotulos or destino not in rotulos:
-            QMessageBox.warning(self, "Aviso", f"Nós inválidos. Disponíveis: {', '.join(rotulos)}")
+        if origem not in grafo or destino not in grafo:
+            QMessageBox.warning(self, "Aviso", f"Nós inválidos. Disponíveis: {', '.join(sorted(grafo.rotulos()))}")
             return  # Avisa se os nós não existirem.
 
-        try:
-            G = construir_grafo_nx_da_matriz(rotulos, matriz, self.e_direcionada)  # Constrói o grafo NetworkX.
+        if self.visualizador_grafo.modo_analise:
+            self.exibir_rota_mais_curta_indexada(origem, destino)  # Resposta imediata pelo índice.
+            return
+
+        # Se o grafo não mudou desde uma consulta igual, a análise vem direto do cache.
+        chave = self.visualizador_grafo.chave_consulta_rotas(origem, destino, max_nos=10)
+        analise = self.visualizador_grafo.cache_rotas.obter(chave)
+        if analise is not None:
+            self.saida_rotas.setHtml(self.formatar_analise_rotas_html(analise))
+            self.statusBar().showMessage(f"Rotas de {origem} a {destino} calculadas.", 4000)
+            return
 
-            # Configura o estilo HTML para a saída de rotas.
-            estilo = "color: #ECEFF4; font-family: 'Segoe UI', sans-serif; font-size: 14px; line-height: 1.6;"
-            html = f"<div style='{estilo}'>"
-            html += f"<h4>■ Análise de Rotas: {origem} → {destino} ■</h4>"
+        # Caso contrário, o cálculo roda em segundo plano sobre uma cópia do grafo de análise.
+        self.cancelar_calculo_rotas()  # Interrompe um cálculo anterior ainda em andamento.
+        trabalhador = TrabalhadorRotas(self.visualizador_grafo.grafo_nx.copy(), origem, destino, max_nos=10)
+        # As funções recebem o próprio trabalhador para ignorar sinais de cálculos já substituídos.
+        trabalhador.sinais.rotasParciais.connect(lambda lote, t=trabalhador: self.ao_receber_rotas_parciais(t, lote))
+        trabalhador.sinais.progresso.connect(lambda total, t=trabalhador: self.ao_progresso_rotas(t, total))
+        trabalhador.sinais.concluido.connect(
+            lambda analise, t=trabalhador, c=chave: self.ao_concluir_rotas(t, c, analise))
+        trabalhador.sinais.erro.connect(lambda mensagem, t=trabalhador: self.ao_erro_rotas(t, mensagem))
+        self.trabalhador_rotas = trabalhador
+
+        self.saida_rotas.setHtml(f"<h4>■ Calculando rotas: {origem} → {destino}... ■</h4>")
+        self.barra_progresso.setRange(0, MAX_ROTAS_PADRAO)
+        self.barra_progresso.setValue(0)
+        self.barra_progresso.show()
+        self.botao_cancelar_calculo.setEnabled(True)
+        self.statusBar().showMessage(f"Calculando rotas de {origem} a {destino}...")
+        QThreadPool.globalInstance().start(trabalhador)
+
+    def ao_alternar_modo_analise(self, ativado):
+        """Ativa/desativa o modo de análise, pré-calculando os caminhos mínimos entre todos os pares."""
+        inicio = time.perf_counter()
+        try:
+            self.visualizador_grafo.definir_modo_analise(ativado)
+        except (ValueError, MemoryError) as e:
+            # Grafo grande demais para as tabelas n x n: o modo de análise fica desativado.
+            self.botao_analisar_grafo.blockSignals(True)
+            self.botao_analisar_grafo.setChecked(False)
+            self.botao_analisar_grafo.blockSignals(False)
+            mensagem = "Memória insuficiente para as tabelas n x n." if isinstance(e, MemoryError) else str(e)
+            QMessageBox.warning(self, "Analisar Grafo", f"Não foi possível ativar o modo de análise. {mensagem}")
+            return
+        if ativado:
+            indice = self.visualizador_grafo.indice_caminhos
+            metodo = "Floyd–Warshall" if indice.metodo == 'floyd_warshall' else "Dijkstra por origem"
+            self.statusBar().showMessage(
+                f"Modo de análise ativado: caminhos mínimos de {len(indice.nos)} nós calculados "
+                f"({metodo}, {time.perf_counter() - inicio:.2f} s).", 6000)
+        else:
+            self.statusBar().showMessage("Modo de análise desativado.", 4000)
+
+    def exibir_rota_mais_curta_indexada(self, origem, destino):
+        """Exibe a rota mais curta obtida do índice de caminhos mínimos (recalculado se o grafo mudou)."""
+        rota = self.visualizador_grafo.consultar_caminho_mais_curto(origem, destino)
+        estilo = "color: #ECEFF4; font-family: 'Segoe UI', sans-serif; font-size: 14px; line-height: 1.6;"
+        html = f"<div style='{estilo}'><h4>■ Rota Mais Curta (modo de análise): {origem} → {destino} ■</h4>"
+        if rota is None:
+            html += "<p>Nenhuma rota encontrada.</p>"
+        else:
+            caminho, custo = rota
+            string_passos = self.obter_passos_caminho_str(caminho)  # Detalha os passos do caminho.
+            html += (f"<p><b>🏆 Rota Mais Curta (menor custo):</b><br> &nbsp; &nbsp; {' → '.join(caminho)} "
+                     f"&nbsp; (Custo: <b>{custo}</b>){string_passos}</p>")
+        html += ("<p style='color: #D8DEE9;'><small>Desative \"Analisar Grafo\" para enumerar todas as rotas "
+                 "e calcular a mais longa.</small></p></div>")
+        self.saida_rotas.setHtml(html)
+        self.statusBar().showMessage(f"Rota mais curta de {origem} a {destino} consultada no índice.", 4000)
+
+    def ao_receber_rotas_parciais(self, trabalhador, lote):
+        """Exibe imediatamente um lote de rotas encontradas pelo cálculo em segundo plano."""
+        if trabalhador is not self.trabalhador_rotas:
+            return  # Sinal de um cálculo já substituído ou cancelado.
+        linhas = [f"• {' → '.join(caminho)} &nbsp; (Custo Total: <b>{custo}</b>)" for caminho, custo in lote]
+        self.saida_rotas.append("<br>".join(linhas))
+
+    def ao_progresso_rotas(self, trabalhador, total):
+        """Atualiza a barra de progresso com a quantidade de rotas encontradas."""
+        if trabalhador is self.trabalhador_rotas:
+            self.barra_progresso.setValue(min(total, self.barra_progresso.maximum()))
+
+    def ao_concluir_rotas(self, trabalhador, chave, analise):
+        """Exibe a análise completa (ou parcial, se cancelada) e a guarda no cache de rotas."""
+        if trabalhador is not self.trabalhador_rotas:
+            return
+        self.finalizar_calculo_rotas()
+        if not analise['cancelado']:
+            self.visualizador_grafo.cache_rotas.guardar(chave, analise)  # Resultados parciais não vão para o cache.
+        # Os passos usam os pesos da cópia do grafo usada no cálculo (o grafo pode ter sido editado).
+        self.saida_rotas.setHtml(self.formatar_analise_rotas_html(analise, trabalhador.G))
+        estado = "canceladas" if analise['cancelado'] else "calculadas"
+        self.statusBar().showMessage(f"Rotas de {analise['origem']} a {analise['destino']} {estado}.", 4000)
+
+    def ao_erro_rotas(self, trabalhador, mensagem):
+        """Informa um erro ocorrido no cálculo em segundo plano."""
+        if trabalhador is not self.trabalhador_rotas:
+            return
+        self.finalizar_calculo_rotas()
+        QMessageBox.critical(self, "Erro", f"Erro fatal ao processar grafo: {mensagem}")  # Exibe erro fatal.
 
-            todas_rotas = obter_todas_rotas(G, origem, destino, max_nos=10)  # Obtém todas as rotas simples.
+    def cancelar_calculo_rotas(self):
+        """Pede a interrupção do cálculo de rotas em andamento, se houver."""
+        if self.trabalhador_rotas is not None:
+            self.trabalhador_rotas.cancelar()
+            self.statusBar().showMessage("Cancelando cálculo de rotas...")
 
-            if not todas_rotas:
-                html += "<p>Nenhuma rota encontrada.</p>"  # Mensagem se não houver rotas.
-            else:
-                html += "<p><b>Todas as Rotas Simples:</b></p><ul>"
-                rotas_com_custo = []
-                for r_path in todas_rotas:
-                    custo = nx.path_weight(G, r_path, 'weight')  # Calcula o custo de cada rota.
-                    rotas_com_custo.append((r_path, custo))
-
-                # Ordena as rotas por custo e depois por tamanho do caminho.
-                rotas_com_custo.sort(key=lambda x: (x[1], len(x[0])))
-
-                for r_path, custo in rotas_com_custo:
-                    string_caminho = ' → '.join(r_path)  # Formata o caminho.
-                    string_passos = self.obter_passos_caminho_str(G, r_path)  # Obtém os passos detalhados.
-                    html += f"<li>{string_caminho} &nbsp; (Custo Total: <b>{custo}</b>){string_passos}</li>"
-                html += "</ul><br>"
-
-            # Obtém e exibe o caminho mais curto.
-            if caminho_mais_curto := obter_caminho_mais_curto(G, origem, destino):
-                custo = nx.path_weight(G, caminho_mais_curto, 'weight')
-                string_caminho = ' → '.join(caminho_mais_curto)
-                string_passos = self.obter_passos_caminho_str(G, caminho_mais_curto)
-                html += f"<p><b>🏆 Rota Mais Curta (menor custo):</b><br> &nbsp; &nbsp; {string_caminho} &nbsp; (Custo: <b>{custo}</b>){string_passos}</p>"
-
-            # Obtém e exibe o caminho mais longo (entre as rotas simples encontradas).
-            if caminho_mais_longo := obter_caminho_mais_longo_seguro(G, origem, destino, todas_rotas):
-                custo = nx.path_weight(G, caminho_mais_longo, 'weight')
-                string_caminho = ' → '.join(caminho_mais_longo)
-                string_passos = self.obter_passos_caminho_str(G, caminho_mais_longo)
-                html += f"<p><b>🧗 Rota Mais Longa Simples:</b><br> &nbsp; &nbsp; {string_caminho} &nbsp; (Custo: <b>{custo}</b>){string_passos}</p>"
-
-            html += "</div>"
-            self.saida_rotas.setHtml(html)  # Define o HTML na área de resultados.
-            self.statusBar().showMessage(f"Rotas de {origem} a {destino} calculadas.", 4000)  # Mensagem de sucesso.
-        except Exception as e:
-            QMessageBox.critical(self, "Erro", f"Erro fatal ao processar grafo: {e}")  # Exibe erro fatal.
\ No newline at end of file
+    def descartar_calculo_rotas(self):
+        """
+        Interrompe o cálculo em andamento e o desliga da janela (o grafo foi substituído): os sinais que
+        ele ainda emitir são ignorados, em vez de exibir resultados do grafo antigo.
+        """
+        if self.trabalhador_rotas is not None:
+            self.trabalhador_rotas.cancelar()
+            self.finalizar_calculo_rotas()
+
+    def finalizar_calculo_rotas(self):
+        """Restaura os controles ao fim de um cálculo de rotas."""
+        self.trabalhador_rotas = None
+        self.barra_progresso.hide()
+        self.botao_cancelar_calculo.setEnabled(False)
+
+    def closeEvent(self, event):
+        """Interrompe um cálculo de rotas em andamento ao fechar a janela."""
+        if self.trabalhador_rotas is not None:
+            self.trabalhador_rotas.cancelar()
+        super().closeEvent(event)
@@ -0,0 +1,21 @@
+import numpy as np
+
+# =================================================================================
+#  POSIÇÕES INICIAIS DOS NÓS (SEM PYQT5)
+# =================================================================================
+# Layouts usados quando os nós chegam sem coordenadas: importação de listas de arestas, geradores
+# de grafos aleatórios e o "Grafo Aleatório" da interface. Só depende do numpy.
+
+ESPACAMENTO_NOS = 50.0  # Distância aproximada entre nós vizinhos no layout circular padrão.
+
+def posicoes_circulares(n, centro=None, raio=None):
+    """
+    Posições (x, y) de n nós em um círculo, como um array float64[n, 2]. Sem `raio`, ele é proporcional
+    ao número de nós (ESPACAMENTO_NOS entre vizinhos, ao menos 250); sem `centro`, o círculo encosta
+    nos eixos (todas as coordenadas ficam positivas).
+    """
+    if raio is None:
+        raio = max(250.0, ESPACAMENTO_NOS * n / (2 * np.pi))
+    centro_x, centro_y = (raio, raio) if centro is None else centro
+    angulos = 2 * np.pi * np.arange(n) / max(n, 1)
+    return np.column_stack([centro_x + raio * np.cos(angulos), centro_y + raio * np.sin(angulos)])
@@ -0,0 +1,246 @@
+import io
+from bisect import bisect_left
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+from consultas_rotas import ler_grafo_txt  # Leitura do arquivo salvo por "Salvar Grafo (TXT)".
+
+# =================================================================================
+#  MODELO DA MATRIZ DE ADJACÊNCIA (MODEL/VIEW)
+# =================================================================================
+# A matriz nunca é materializada: cada célula é lida do núcleo do grafo sob demanda (consulta O(1)
+# na adjacência), e a QTableView só pede as células visíveis. O custo de exibição depende do
+# tamanho da janela, não de n².
+
+class ModeloMatrizAdjacencia(QAbstractTableModel):
+    """
+    Modelo de tabela (somente leitura) sobre um `Grafo`, com linhas e colunas em ordem alfabética,
+    como em `Grafo.matriz_adjacencia`. O modelo observa o núcleo e acumula as alterações: arestas e
+    pesos marcam apenas as células afetadas; nós inseridos, removidos ou renomeados (inserir uma coluna
+    custa O(n) nos cabeçalhos do Qt) pedem um reinício. As alterações acumuladas são aplicadas de uma
+    vez a cada `notificacao` (ex.: `VisualizadorGrafo.grafoAlterado`, que agrupa rajadas e lotes), ou
+    no próximo ciclo de eventos quando nenhuma notificação é informada.
+    """
+
+    def __init__(self, grafo, parent=None, notificacao=None):
+        super().__init__(parent)
+        self.grafo = grafo
+        self._rotulos = sorted(grafo.rotulos()) # Rótulos das linhas/colunas, em ordem alfabética.
+        self._recarga_pendente = False          # Nós mudaram; a tabela será reiniciada em seguida.
+        self._celulas_alteradas = None          # [linha mín., linha máx., coluna mín., coluna máx.] pendentes.
+        self._aplicacao_agendada = False        # Há um QTimer.singleShot pendente para aplicar as alterações.
+        self._notificacao = notificacao
+        if notificacao is not None:
+            notificacao.connect(self.aplicar_alteracoes)
+        grafo.observar(self._ao_alterar_grafo)
+
+    @property
+    def rotulos(self):
+        """Rótulos das linhas/colunas, em ordem alfabética."""
+        return self._rotulos
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rotulos)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rotulos)
+
+    def data(self, indice, papel=Qt.DisplayRole):
+        if not indice.isValid():
+            return None
+        if papel == Qt.DisplayRole:
+            return str(self.grafo.peso(self._rotulos[indice.row()], self._rotulos[indice.column()], 0))
+        if papel == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if papel == Qt.ToolTipRole:
+            origem, destino = self._rotulos[indice.row()], self._rotulos[indice.column()]
+            peso = self.grafo.peso(origem, destino)
+            return f"{origem} → {destino}: {'sem aresta' if peso is None else peso}"
+        return None
+
+    def headerData(self, secao, orientacao, papel=Qt.DisplayRole):
+        if papel != Qt.DisplayRole:
+            return None
+        return self._rotulos[secao] if 0 <= secao < len(self._rotulos) else None
+
+    def recarregar(self):
+        """Relê todos os rótulos do grafo (reinicia o modelo)."""
+        self._recarga_pendente, self._celulas_alteradas = False, None
+        self.beginResetModel()
+        self._rotulos = sorted(self.grafo.rotulos())
+        self.endResetModel()
+
+    def aplicar_alteracoes(self):
+        """Aplica as alterações acumuladas: um reinício, ou um único dataChanged cobrindo as células alteradas."""
+        if self._recarga_pendente:
+            self.recarregar()
+        elif self._celulas_alteradas:
+            linha_min, linha_max, coluna_min, coluna_max = self._celulas_alteradas
+            self._celulas_alteradas = None
+            self.dataChanged.emit(self.index(linha_min, coluna_min), self.index(linha_max, coluna_max),
+                                  [Qt.DisplayRole])
+
+    def _agendar_aplicacao(self):
+        """Agenda a aplicação das alterações para o próximo ciclo de eventos (uma vez por ciclo)."""
+        if not self._aplicacao_agendada:
+            self._aplicacao_agendada = True
+            QTimer.singleShot(0, self._aplicar_agendado)
+
+    def _aplicar_agendado(self):
+        self._aplicacao_agendada = False
+        self.aplicar_alteracoes()
+
+    def _marcar_celula(self, origem, destino):
+        """Inclui a célula origem -> destino (e a simétrica, se não direcionado) no retângulo pendente."""
+        linha, coluna = bisect_left(self._rotulos, origem), bisect_left(self._rotulos, destino)
+        if not self.grafo.e_direcionado:
+            linha, coluna = min(linha, coluna), max(linha, coluna)
+            linhas, colunas = (linha, coluna), (linha, coluna) # A simétrica fica no mesmo retângulo.
+        else:
+            linhas, colunas = (linha, linha), (coluna, coluna)
+        pendentes = self._celulas_alteradas
+        if pendentes is None:
+            self._celulas_alteradas = [linhas[0], linhas[1], colunas[0], colunas[1]]
+        else:
+            pendentes[0], pendentes[1] = min(pendentes[0], linhas[0]), max(pendentes[1], linhas[1])
+            pendentes[2], pendentes[3] = min(pendentes[2], colunas[0]), max(pendentes[3], colunas[1])
+
+    def _ao_alterar_grafo(self, evento, *dados):
+        """Acumula os eventos do núcleo como células alteradas ou como um reinício pendente do modelo."""
+        if evento in ('aresta_adicionada', 'aresta_removida', 'peso_alterado'):
+            if self._recarga_pendente: # Com um reinício pendente, as posições atuais já não valem.
+                return
+            self._marcar_celula(dados[0], dados[1])
+        else: # no_adicionado, no_removido, no_renomeado, limpo.
+            self._recarga_pendente = True
+            if evento == 'limpo':
+                # Limpar fora de um lote não gera notificação: a tabela é esvaziada no próximo ciclo de eventos.
+                self._agendar_aplicacao()
+                return
+        if self._notificacao is None:
+            self._agendar_aplicacao()
+
+
+# =================================================================================
+#  ENTRADA DA MATRIZ DE ADJACÊNCIA (DIÁLOGO "CRIAR MATRIZ POR TABELA")
+# =================================================================================
+
+MAX_NOS_MATRIZ_EDITAVEL = 2000  # Limite do número de nós digitado (a matriz n x n fica em memória).
+_SEPARADORES = str.maketrans({',': ' ', ';': ' ', '|': ' ', '\t': ' '}) # Separadores aceitos ao colar/importar.
+
+def _e_numero(texto):
+    """Indica se o texto representa um número."""
+    try:
+        float(texto)
+        return True
+    except ValueError:
+        return False
+
+def ler_matriz_texto(texto):
+    """
+    Lê uma matriz de adjacência colada ou importada como texto: valores separados por espaços,
+    tabulações, vírgulas ou ponto e vírgula, opcionalmente com uma linha e/ou uma coluna de rótulos.
+    O arquivo completo salvo por "Salvar Grafo (TXT)" também é aceito. Os valores são convertidos
+    de uma vez pelo numpy (sem try/except por célula). Retorna (rotulos ou None, matriz int64 n x n).
+    """
+    if "MATRIZ DE ADJACÊNCIA" in texto:
+        rotulos, matriz, _ = ler_grafo_txt(io.StringIO(texto))
+        valores = np.array(matriz, dtype=np.float64).reshape(len(rotulos), len(rotulos))
+    else:
+        # Linhas vazias e linhas de traços (separador abaixo do cabeçalho) são ignoradas.
+        linhas = [linha for linha in texto.translate(_SEPARADORES).splitlines() if linha.strip(' -')]
+        if not linhas:
+            raise ValueError("nenhum valor encontrado.")
+        rotulos = None
+        if not _e_numero(linhas[0].split()[0]):
+            rotulos, linhas = linhas[0].split(), linhas[1:] # Linha de cabeçalho com os rótulos das colunas.
+        if linhas and not _e_numero(linhas[0].split()[0]):
+            # Primeira coluna com os rótulos das linhas: retira o primeiro campo de cada linha.
+            campos = [linha.split(maxsplit=1) for linha in linhas]
+            rotulos_linhas, linhas = [c[0] for c in campos], [c[1] if len(c) > 1 else "" for c in campos]
+            if rotulos is not None and rotulos != rotulos_linhas:
+                raise ValueError("os rótulos das linhas e das colunas são diferentes.")
+            rotulos = rotulos_linhas
+        try:
+            valores = np.loadtxt(linhas, dtype=np.float64, ndmin=2) # Conversão vetorizada de todas as células.
+        except ValueError as e:
+            raise ValueError(f"valores inválidos ({e}).") from None
+
+    n = valores.shape[0]
+    if valores.shape != (n, n) or n == 0:
+        raise ValueError(f"a matriz deve ser quadrada (lida {valores.shape[0]} x {valores.shape[1]}).")
+    if rotulos is not None and (len(rotulos) != n or len(set(rotulos)) != n):
+        raise ValueError(f"são esperados {n} rótulos distintos.")
+    if (valores < 0).any() or (valores != np.round(valores)).any():
+        raise ValueError("os pesos devem ser inteiros não negativos.")
+    return rotulos, valores.astype(np.int64)
+
+class ModeloMatrizEditavel(QAbstractTableModel):
+    """
+    Modelo de tabela editável sobre uma matriz numpy n x n, usado na entrada da matriz de adjacência.
+    Não há um widget por célula: a QTableView desenha apenas as células visíveis e cria um editor
+    só para a célula em edição. Em grafos não direcionados apenas o triângulo superior é editável
+    e cada valor é espelhado na célula simétrica; a diagonal (laços) nunca é editável.
+    """
+
+    def __init__(self, rotulos, matriz=None, e_direcionada=False, parent=None):
+        super().__init__(parent)
+        self.rotulos = list(rotulos)
+        self.e_direcionada = e_direcionada
+        n = len(self.rotulos)
+        self.matriz = np.zeros((n, n), dtype=np.int64) if matriz is None else np.array(matriz, dtype=np.int64)
+        np.fill_diagonal(self.matriz, 0) # Sem laços.
+        if not e_direcionada:
+            # Mantém o triângulo superior e o espelha, como na digitação célula a célula.
+            superior = np.triu(self.matriz, 1)
+            self.matriz = superior + superior.T
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rotulos)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rotulos)
+
+    def _editavel(self, linha, coluna):
+        return linha != coluna and (self.e_direcionada or coluna > linha)
+
+    def flags(self, indice):
+        if not indice.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return flags | Qt.ItemIsEditable if self._editavel(indice.row(), indice.column()) else flags
+
+    def data(self, indice, papel=Qt.DisplayRole):
+        if not indice.isValid():
+            return None
+        if papel in (Qt.DisplayRole, Qt.EditRole):
+            return str(self.matriz[indice.row(), indice.column()])
+        if papel == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if papel == Qt.ForegroundRole and not self._editavel(indice.row(), indice.column()):
+            return QColor("#4C566A") # Células calculadas (diagonal e triângulo espelhado) em cinza.
+        return None
+
+    def setData(self, indice, valor, papel=Qt.EditRole):
+        """Grava um peso digitado (inteiro não negativo; vazio vale 0) e o espelha se não direcionado."""
+        if not indice.isValid() or papel != Qt.EditRole:
+            return False
+        try:
+            peso = int(str(valor).strip() or 0)
+        except ValueError:
+            return False
+        if peso < 0:
+            return False
+        linha, coluna = indice.row(), indice.column()
+        self.matriz[linha, coluna] = peso
+        self.dataChanged.emit(indice, indice, [Qt.DisplayRole, Qt.EditRole])
+        if not self.e_direcionada:
+            self.matriz[coluna, linha] = peso
+            simetrica = self.index(coluna, linha)
+            self.dataChanged.emit(simetrica, simetrica, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def headerData(self, secao, orientacao, papel=Qt.DisplayRole):
+        if papel != Qt.DisplayRole:
+            return None
+        return self.rotulos[secao] if 0 <= secao < len(self.rotulos) else None
@@ -0,0 +1,314 @@
+from array import array
+
+# =================================================================================
+#  NÚCLEO DO GRAFO (PYTHON PURO, SEM PYQT5)
+# =================================================================================
+
+class Grafo:
+    """
+    Núcleo do grafo independente da interface gráfica.
+
+    Cada nó recebe um id inteiro; as arestas ficam em arrays compactos (origem, destino, peso)
+    e a adjacência de cada nó mapeia o id do vizinho para a posição da aresta nesses arrays,
+    o que torna inserção, remoção e consulta de arestas operações O(1).
+    Observadores registrados com `observar` são notificados a cada alteração, e `versao`
+    cresce monotonicamente a cada alteração (útil como chave de caches).
+    """
+
+    def __init__(self, e_direcionado=False):
+        self._observadores = []  # Funções chamadas a cada alteração do grafo.
+        self.versao = 0          # Incrementada a cada alteração; nunca diminui.
+        self.limpar(e_direcionado)
+
+    # ------------------------------------------------------------------
+    #  Observadores
+    # ------------------------------------------------------------------
+
+    def observar(self, callback):
+        """Registra uma função chamada como callback(evento, *dados) a cada alteração."""
+        if callback not in self._observadores:
+            self._observadores.append(callback)
+
+    def deixar_de_observar(self, callback):
+        """Remove uma função previamente registrada com `observar`."""
+        if callback in self._observadores:
+            self._observadores.remove(callback)
+
+    def _notificar(self, evento, *dados):
+        """Incrementa a versão e repassa um evento de alteração para todos os observadores."""
+        self.versao += 1
+        for callback in self._observadores:
+            callback(evento, *dados)
+
+    # ------------------------------------------------------------------
+    #  Nós
+    # ------------------------------------------------------------------
+
+    def limpar(self, e_direcionado=None):
+        """Remove todos os nós e arestas. Opcionalmente altera o tipo do grafo."""
+        if e_direcionado is not None:
+            self.e_direcionado = e_direcionado
+        self._rotulos = []                     # id -> rótulo (None indica um id livre).
+        self._indices = {}                     # rótulo -> id.
+        self._ids_livres = []                  # Ids liberados por remoções, reaproveitados em novas inserções.
+        self._x, self._y = array('d'), array('d')  # Posições dos nós (usadas pela visualização e por arquivos).
+        self._saida = []                       # id -> {id do vizinho: posição da aresta}.
+        # Em grafos não direcionados a adjacência de entrada é a mesma lista da de saída.
+        self._entrada = [] if self.e_direcionado else self._saida
+        self._origens, self._destinos = array('q'), array('q')  # Extremidades de cada aresta (ids).
+        self._pesos = []                       # Peso de cada aresta (preserva int/float).
+        self._notificar('limpo')
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __contains__(self, rotulo):
+        return rotulo in self._indices
+
+    def rotulos(self):
+        """Retorna os rótulos dos nós na ordem de inserção."""
+        return list(self._indices)
+
+    def indice(self, rotulo):
+        """Retorna o id interno de um nó, ou None se ele não existir."""
+        return self._indices.get(rotulo)
+
+    def posicao(self, rotulo):
+        """Retorna a posição (x, y) associada a um nó."""
+        i = self._indices[rotulo]
+        return self._x[i], self._y[i]
+
+    def mover_no(self, rotulo, x, y):
+        """Atualiza a posição armazenada de um nó (não emite notificação)."""
+        i = self._indices[rotulo]
+        self._x[i], self._y[i] = x, y
+
+    def adicionar_no(self, rotulo, x=0.0, y=0.0):
+        """Adiciona um nó e retorna seu id. Se o rótulo já existir, retorna o id existente."""
+        if rotulo in self._indices:
+            return self._indices[rotulo]
+        if self._ids_livres:
+            i = self._ids_livres.pop()  # Reaproveita um id liberado.
+            self._rotulos[i] = rotulo
+            self._x[i], self._y[i] = x, y
+        else:
+            i = len(self._rotulos)
+            self._rotulos.append(rotulo)
+            self._x.append(x)
+            self._y.append(y)
+            self._saida.append({})
+            if self.e_direcionado:
+                self._entrada.append({})
+        self._indices[rotulo] = i
+        self._notificar('no_adicionado', rotulo, x, y)
+        return i
+
+    def remover_no(self, rotulo):
+        """Remove um nó e todas as arestas ligadas a ele."""
+        i = self._indices.get(rotulo)
+        if i is None:
+            return False
+        # Copia as posições antes de remover, pois a remoção altera os dicionários de adjacência.
+        posicoes = set(self._saida[i].values()) | set(self._entrada[i].values())
+        # Remove da maior para a menor posição para que a troca com a última aresta não invalide as demais.
+        for p in sorted(posicoes, reverse=True):
+            origem, destino = self._rotulos[self._origens[p]], self._rotulos[self._destinos[p]]
+            self._remover_aresta_na_posicao(p)
+            self._notificar('aresta_removida', origem, destino)
+        del self._indices[rotulo]
+        self._rotulos[i] = None
+        self._ids_livres.append(i)
+        self._notificar('no_removido', rotulo)
+        return True
+
+    def renomear_no(self, rotulo_atual, novo_rotulo):
+        """Altera o rótulo de um nó. As arestas referenciam ids, então nada mais precisa mudar."""
+        if novo_rotulo in self._indices:
+            raise ValueError(f"O rótulo '{novo_rotulo}' já está em uso.")
+        i = self._indices.pop(rotulo_atual)
+        self._indices[novo_rotulo] = i
+        self._rotulos[i] = novo_rotulo
+        self._notificar('no_renomeado', rotulo_atual, novo_rotulo)
+
+    # ------------------------------------------------------------------
+    #  Arestas
+    # ------------------------------------------------------------------
+
+    def numero_arestas(self):
+        """Retorna o número de arestas do grafo."""
+        return len(self._pesos)
+
+    def _posicao_aresta(self, rotulo1, rotulo2):
+        """Retorna a posição da aresta rotulo1 -> rotulo2 nos arrays, ou None."""
+        i, j = self._indices.get(rotulo1), self._indices.get(rotulo2)
+        if i is None or j is None:
+            return None
+        return self._saida[i].get(j)
+
+    def tem_aresta(self, rotulo1, rotulo2):
+        """Indica se existe a aresta rotulo1 -> rotulo2 (em qualquer sentido, se não direcionado)."""
+        return self._posicao_aresta(rotulo1, rotulo2) is not None
+
+    def peso(self, rotulo1, rotulo2, padrao=None):
+        """Retorna o peso da aresta rotulo1 -> rotulo2, ou `padrao` se ela não existir."""
+        p = self._posicao_aresta(rotulo1, rotulo2)
+        return padrao if p is None else self._pesos[p]
+
+    def adicionar_aresta(self, rotulo1, rotulo2, peso=1):
+        """Adiciona uma aresta. Retorna False se algum nó não existir ou a aresta já existir."""
+        i, j = self._indices.get(rotulo1), self._indices.get(rotulo2)
+        if i is None or j is None or j in self._saida[i]:
+            return False
+        p = len(self._pesos)
+        self._origens.append(i)
+        self._destinos.append(j)
+        self._pesos.append(peso)
+        self._saida[i][j] = p
+        self._entrada[j][i] = p  # Em grafos não direcionados registra o sentido inverso.
+        self._notificar('aresta_adicionada', rotulo1, rotulo2, peso)
+        return True
+
+    def adicionar_arestas(self, arestas):
+        """Adiciona em lote arestas (origem, destino, peso). Retorna quantas foram inseridas."""
+        adicionar = self.adicionar_aresta
+        return sum(1 for origem, destino, peso in arestas if adicionar(origem, destino, peso))
+
+    def carregar_indexado(self, rotulos, xs, ys, origens, destinos, pesos, e_direcionado=None):
+        """
+        Inverso de `exportar_indexado`: substitui todo o conteúdo do grafo por nós (rótulos e posições
+        por id 0..n-1) e arestas dadas por ids. Os arrays internos são montados diretamente, sem
+        consultas por rótulo; arestas repetidas são ignoradas, como em `adicionar_aresta`.
+        Observadores recebem os eventos de sempre (limpo, no_adicionado, aresta_adicionada); sem
+        observadores, a versão avança uma única vez. Retorna quantas arestas foram inseridas.
+        """
+        rotulos = list(rotulos)
+        indices = dict(zip(rotulos, range(len(rotulos))))
+        if len(indices) != len(rotulos):
+            raise ValueError("Os rótulos dos nós devem ser distintos.")
+        self.limpar(e_direcionado)
+        n = len(rotulos)
+        self._rotulos, self._indices = rotulos, indices
+        self._x, self._y = array('d', xs), array('d', ys)
+        saida = self._saida = [{} for _ in range(n)]
+        entrada = self._entrada = [{} for _ in range(n)] if self.e_direcionado else saida
+        mais_origem, mais_destino, mais_peso = self._origens.append, self._destinos.append, self._pesos.append
+        p = 0 # Posição da próxima aresta nos arrays.
+        for i, j, peso in zip(origens, destinos, pesos):
+            linha = saida[i]
+            if j in linha:
+                continue # Aresta repetida (ou o sentido inverso, se não direcionado).
+            linha[j] = entrada[j][i] = p
+            mais_origem(i)
+            mais_destino(j)
+            mais_peso(peso)
+            p += 1
+
+        if self._observadores:
+            for rotulo, x, y in zip(rotulos, self._x, self._y):
+                self._notificar('no_adicionado', rotulo, x, y)
+            for i, j, peso in zip(self._origens, self._destinos, self._pesos):
+                self._notificar('aresta_adicionada', rotulos[i], rotulos[j], peso)
+        else:
+            self.versao += 1
+        return p
+
+    def remover_aresta(self, rotulo1, rotulo2):
+        """Remove a aresta rotulo1 -> rotulo2. Retorna False se ela não existir."""
+        p = self._posicao_aresta(rotulo1, rotulo2)
+        if p is None:
+            return False
+        # Notifica com a orientação em que a aresta foi inserida.
+        origem, destino = self._rotulos[self._origens[p]], self._rotulos[self._destinos[p]]
+        self._remover_aresta_na_posicao(p)
+        self._notificar('aresta_removida', origem, destino)
+        return True
+
+    def _remover_aresta_na_posicao(self, p):
+        """Remove a aresta da posição p trocando-a com a última, mantendo os arrays compactos."""
+        i, j = self._origens[p], self._destinos[p]
+        self._saida[i].pop(j, None)
+        self._entrada[j].pop(i, None)
+        ultima = len(self._pesos) - 1
+        if p != ultima:
+            # Move a última aresta para a posição liberada e atualiza a adjacência dela.
+            ui, uj = self._origens[ultima], self._destinos[ultima]
+            self._origens[p], self._destinos[p], self._pesos[p] = ui, uj, self._pesos[ultima]
+            self._saida[ui][uj] = p
+            self._entrada[uj][ui] = p
+        self._origens.pop()
+        self._destinos.pop()
+        self._pesos.pop()
+
+    def definir_peso(self, rotulo1, rotulo2, peso):
+        """Altera o peso de uma aresta existente. Retorna False se ela não existir."""
+        p = self._posicao_aresta(rotulo1, rotulo2)
+        if p is None:
+            return False
+        self._pesos[p] = peso
+        origem, destino = self._rotulos[self._origens[p]], self._rotulos[self._destinos[p]]
+        self._notificar('peso_alterado', origem, destino, peso)
+        return True
+
+    def vizinhos(self, rotulo):
+        """Retorna uma lista de (rótulo do vizinho, peso) das arestas que saem do nó."""
+        i = self._indices[rotulo]
+        return [(self._rotulos[j], self._pesos[p]) for j, p in self._saida[i].items()]
+
+    def arestas(self):
+        """Itera sobre as arestas como tuplas (origem, destino, peso)."""
+        rotulos = self._rotulos
+        for i, j, peso in zip(self._origens, self._destinos, self._pesos):
+            yield rotulos[i], rotulos[j], peso
+
+    def matriz_adjacencia(self):
+        """Gera a matriz de adjacência densa, com os rótulos em ordem alfabética."""
+        rotulos = sorted(self._indices)  # Obtém os rótulos dos nós em ordem alfabética.
+        tamanho = len(rotulos)
+        # Converte ids internos diretamente para a linha/coluna da matriz.
+        linha_do_id = {self._indices[rotulo]: k for k, rotulo in enumerate(rotulos)}
+        mat = [[0] * tamanho for _ in range(tamanho)]
+        for i, j, peso in zip(self._origens, self._destinos, self._pesos):
+            a, b = linha_do_id[i], linha_do_id[j]
+            mat[a][b] = peso
+            if not self.e_direcionado:
+                mat[b][a] = peso  # Se não for direcionado, a matriz é simétrica.
+        return rotulos, mat
+
+    def adjacencia_esparsa(self):
+        """
+        Exporta a adjacência no formato CSR (linhas comprimidas), sem alocar a matriz densa.
+
+        Retorna (rotulos, indptr, indices, pesos): os vizinhos da linha k ficam em
+        indices[indptr[k]:indptr[k + 1]], com os pesos nas mesmas posições de `pesos`.
+        Rótulos em ordem alfabética; em grafos não direcionados cada aresta aparece nos dois sentidos.
+        """
+        rotulos = sorted(self._indices)  # Mesma ordem de linhas/colunas da matriz densa.
+        linha_do_id = {self._indices[rotulo]: k for k, rotulo in enumerate(rotulos)}
+        indptr, indices, pesos = array('q', [0]), array('q'), []
+        for rotulo in rotulos:
+            # Vizinhos da linha ordenados por coluna, como em uma matriz esparsa canônica.
+            linha = sorted((linha_do_id[j], self._pesos[p]) for j, p in self._saida[self._indices[rotulo]].items())
+            for coluna, peso in linha:
+                indices.append(coluna)
+                pesos.append(peso)
+            indptr.append(len(indices))
+        return rotulos, indptr, indices, pesos
+
+    def exportar_indexado(self):
+        """
+        Exporta o grafo com ids compactos (0..n-1, na ordem dos ids internos, sem lacunas de remoções).
+
+        Retorna (rotulos, xs, ys, origens, destinos, pesos): rótulos e posições por id compacto e,
+        para cada aresta (na orientação em que foi inserida), os ids compactos das extremidades e o peso.
+        """
+        compacto = {}  # id interno -> id compacto.
+        rotulos, xs, ys = [], array('d'), array('d')
+        for i, rotulo in enumerate(self._rotulos):
+            if rotulo is not None:
+                compacto[i] = len(rotulos)
+                rotulos.append(rotulo)
+                xs.append(self._x[i])
+                ys.append(self._y[i])
+        origens = array('q', (compacto[i] for i in self._origens))
+        destinos = array('q', (compacto[j] for j in self._destinos))
+        return rotulos, xs, ys, origens, destinos, list(self._pesos)
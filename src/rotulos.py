@@ -0,0 +1,105 @@
+from itertools import islice, product
+from string import ascii_uppercase
+
+# =================================================================================
+#  RÓTULOS SEQUENCIAIS DOS NÓS (SEM PYQT5)
+# =================================================================================
+# Os nós criados pelo aplicativo recebem rótulos A..Z, AA..AZ, BA..., ZZ, AAA... (numeração
+# bijetiva em base 26: o índice 0 é 'A', o 25 é 'Z' e o 26 é 'AA'). Não há limite de nós.
+
+def rotulo_sequencial(indice):
+    """Rótulo de um índice sequencial (0 -> 'A', 25 -> 'Z', 26 -> 'AA', ...)."""
+    rotulo = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        rotulo = ascii_uppercase[resto] + rotulo
+    return rotulo
+
+def indice_sequencial(rotulo):
+    """Inverso de `rotulo_sequencial`: o índice do rótulo, ou None se não for um rótulo sequencial."""
+    if not rotulo or not isinstance(rotulo, str) or not rotulo.isascii() or not rotulo.isupper() or not rotulo.isalpha():
+        return None
+    indice = 0
+    for letra in rotulo:
+        indice = indice * 26 + (ord(letra) - ord('A') + 1)
+    return indice - 1
+
+def gerar_rotulos(n):
+    """Os n primeiros rótulos sequenciais (A, B, ... Z, AA, AB...), gerados por comprimento sem divisões."""
+    rotulos = []
+    comprimento = 1
+    while len(rotulos) < n:
+        # Os rótulos de um mesmo comprimento seguem a ordem do produto cartesiano das letras.
+        rotulos.extend(islice(map(''.join, product(ascii_uppercase, repeat=comprimento)), n - len(rotulos)))
+        comprimento += 1
+    return rotulos
+
+def resolver_rotulo(texto, nos):
+    """
+    Rótulo de um nó digitado pelo usuário: o texto exato se estiver em `nos` (qualquer contêiner com `in`);
+    senão, o texto em maiúsculas, se existir (os rótulos gerados são A, B, C...); senão, o texto exato.
+    """
+    if texto in nos:
+        return texto
+    maiusculo = texto.upper()
+    return maiusculo if maiusculo in nos else texto
+
+class AlocadorRotulos:
+    """
+    Fornece rótulos sequenciais livres para novos nós de um `Grafo`, em O(1) amortizado.
+
+    Um contador percorre a sequência A, B, ... Z, AA... uma única vez, pulando rótulos já usados
+    no grafo (ex.: digitados pelo usuário). Rótulos sequenciais liberados por remoções ou
+    renomeações vão para uma lista de livres (sem repetições) e são reaproveitados antes de o
+    contador avançar, como os ids livres do núcleo. O alocador observa o grafo, então basta criá-lo
+    uma vez.
+    """
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.reiniciar()
+        grafo.observar(self._ao_alterar_grafo)
+
+    def reiniciar(self):
+        """Volta ao início da sequência (grafo limpo)."""
+        self._proximo = 0  # Índice sequencial do próximo rótulo nunca fornecido.
+        self._livres = []  # Índices liberados (abaixo de _proximo), reaproveitados em novas alocações.
+        self._em_livres = set()  # Os mesmos índices, para não registrar um índice duas vezes.
+
+    def alocar(self, excluir=()):
+        """Retorna um rótulo que não está em uso no grafo nem em `excluir` (não adiciona o nó)."""
+        while self._livres:
+            indice = self._livres.pop()
+            self._em_livres.discard(indice)
+            rotulo = rotulo_sequencial(indice)
+            # O rótulo pode ter voltado a ser usado (ex.: renomeação) depois de liberado.
+            if rotulo not in self.grafo and rotulo not in excluir:
+                return rotulo
+        # Cada índice é visitado uma única vez pelo contador: custo amortizado O(1).
+        while True:
+            rotulo = rotulo_sequencial(self._proximo)
+            self._proximo += 1
+            if rotulo not in self.grafo and rotulo not in excluir:
+                return rotulo
+
+    def alocar_varios(self, n):
+        """Retorna n rótulos livres distintos entre si."""
+        rotulos = {}  # Dicionário ordenado: preserva a ordem de alocação e serve de conjunto para `excluir`.
+        for _ in range(n):
+            rotulos[self.alocar(rotulos)] = None
+        return list(rotulos)
+
+    def liberar(self, rotulo):
+        """Devolve um rótulo à lista de livres (somente rótulos sequenciais já fornecidos pelo contador)."""
+        indice = indice_sequencial(rotulo)
+        if indice is not None and indice < self._proximo and indice not in self._em_livres:
+            self._livres.append(indice)
+            self._em_livres.add(indice)
+
+    def _ao_alterar_grafo(self, evento, *dados):
+        """Libera os rótulos de nós removidos ou renomeados; recomeça a sequência quando o grafo é limpo."""
+        if evento in ('no_removido', 'no_renomeado'):
+            self.liberar(dados[0]) # Rótulo removido ou antigo.
+        elif evento == 'limpo':
+            self.reiniciar()
@@ -0,0 +1,54 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from analise_grafo import calcular_analise_rotas, MAX_ROTAS_PADRAO, TEMPO_LIMITE_PADRAO, ROTAS_MELHORES_PADRAO
+
+# =================================================================================
+#  CÁLCULO DE ROTAS EM SEGUNDO PLANO
+# =================================================================================
+
+class SinaisTrabalhadorRotas(QObject):
+    """Sinais emitidos pelo TrabalhadorRotas (QRunnable não pode declarar sinais próprios)."""
+    rotasParciais = pyqtSignal(list)  # Lote de rotas (caminho, custo) encontradas.
+    progresso = pyqtSignal(int)       # Quantidade de rotas encontradas até o momento.
+    concluido = pyqtSignal(dict)      # Análise completa (ou parcial, se cancelada).
+    erro = pyqtSignal(str)            # Mensagem de erro, se o cálculo falhar.
+
+
+class TrabalhadorRotas(QRunnable):
+    """
+    Executa `calcular_analise_rotas` em uma thread do QThreadPool, para que o loop de eventos
+    do Qt nunca fique bloqueado. Recebe uma cópia do grafo de análise, então o usuário pode
+    continuar editando o grafo enquanto o cálculo acontece.
+    """
+
+    def __init__(self, G, origem, destino, max_nos=None, max_rotas=MAX_ROTAS_PADRAO,
+                 tempo_limite=TEMPO_LIMITE_PADRAO, k=ROTAS_MELHORES_PADRAO):
+        super().__init__()
+        self.G, self.origem, self.destino = G, origem, destino
+        self.max_nos, self.max_rotas, self.tempo_limite, self.k = max_nos, max_rotas, tempo_limite, k
+        self.sinais = SinaisTrabalhadorRotas()
+        self._cancelar = threading.Event()  # Sinalizado pelo botão "Cancelar".
+        self._encontradas = 0               # Rotas entregues até o momento.
+
+    def cancelar(self):
+        """Pede a interrupção do cálculo; a análise parcial ainda é entregue por `concluido`."""
+        self._cancelar.set()
+
+    def foi_cancelado(self):
+        """Indica se o cancelamento foi solicitado."""
+        return self._cancelar.is_set()
+
+    def _ao_encontrar_rotas(self, lote):
+        """Repassa um lote de rotas para a interface e atualiza o progresso."""
+        self._encontradas += len(lote)
+        self.sinais.rotasParciais.emit(lote)
+        self.sinais.progresso.emit(self._encontradas)
+
+    def run(self):
+        try:
+            analise = calcular_analise_rotas(self.G, self.origem, self.destino, self.max_nos, self.max_rotas,
+                                             self.tempo_limite, self.k, cancelar=self._cancelar,
+                                             ao_encontrar_rotas=self._ao_encontrar_rotas)
+            self.sinais.concluido.emit(analise)
+        except Exception as e:
+            self.sinais.erro.emit(str(e))
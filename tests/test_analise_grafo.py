@@ -0,0 +1,114 @@
+import random
+import time
+
+import networkx as nx
+import pytest
+
+from analise_grafo import EnumeradorRotas, obter_rota_mais_longa, resumir_rotas_paralelo
+
+
+def grafo_aleatorio(semente, e_direcionado, n=9, p=0.35):
+    rng = random.Random(semente)
+    G = nx.gnp_random_graph(n, p, seed=semente, directed=e_direcionado)
+    for u, v in G.edges:
+        G[u][v]['weight'] = rng.randint(1, 20)
+    return G
+
+
+def rotas_forca_bruta(G, origem, destino):
+    """Todas as rotas simples com custo, pelo NetworkX."""
+    return [(caminho, nx.path_weight(G, caminho, 'weight')) for caminho in nx.all_simple_paths(G, origem, destino)]
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+def test_enumerador_equivale_ao_networkx(e_direcionado):
+    for semente in range(20):
+        G = grafo_aleatorio(semente, e_direcionado)
+        enumerador = EnumeradorRotas(G, 0, 1)
+        assert sorted(enumerador) == sorted(caminho for caminho, _ in rotas_forca_bruta(G, 0, 1))
+        assert not enumerador.truncado
+        curtas = EnumeradorRotas(G, 0, 1, max_nos=3)
+        assert sorted(curtas) == sorted(nx.all_simple_paths(G, 0, 1, cutoff=3))
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+def test_enumerador_acumula_o_custo_de_cada_rota(e_direcionado):
+    for semente in range(20):
+        G = grafo_aleatorio(semente, e_direcionado)
+        assert sorted(EnumeradorRotas(G, 0, 1, com_custo=True)) == sorted(rotas_forca_bruta(G, 0, 1))
+
+
+def test_enumerador_respeita_limites():
+    G = nx.complete_graph(8)
+    nx.set_edge_attributes(G, 1, 'weight')
+    enumerador = EnumeradorRotas(G, 0, 1, max_rotas=10)
+    assert len(list(enumerador)) == 10
+    assert enumerador.truncado and enumerador.motivo == 'max_rotas' and enumerador.total == 10
+    baratas = EnumeradorRotas(G, 0, 1, custo_maximo=2)
+    assert all(len(caminho) <= 3 for caminho in baratas) and baratas.total == 7
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+@pytest.mark.parametrize('processos', [1, 2])
+def test_resumir_rotas_paralelo_equivale_a_forca_bruta(e_direcionado, processos):
+    for semente in range(12):
+        G = grafo_aleatorio(semente, e_direcionado)
+        rotas = rotas_forca_bruta(G, 0, 1)
+        resumo = resumir_rotas_paralelo(G, 0, 1, k=5, processos=processos)
+        assert resumo['total'] == len(rotas)
+        assert not resumo['truncado']
+        custos = sorted(custo for _, custo in rotas)
+        assert [custo for _, custo in resumo['melhores']] == custos[:5]
+        assert all(nx.path_weight(G, caminho, 'weight') == custo for caminho, custo in resumo['melhores'])
+        if rotas:
+            assert resumo['mais_curta'][1] == custos[0]
+            assert resumo['mais_longa'][1] == custos[-1]
+            assert resumo['mais_longa'] in rotas
+        else:
+            assert resumo['mais_curta'] is None and resumo['mais_longa'] is None
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+def test_rota_mais_longa_equivale_a_forca_bruta(e_direcionado):
+    for semente in range(40):
+        G = grafo_aleatorio(semente, e_direcionado)
+        rotas = rotas_forca_bruta(G, 0, 1)
+        rota = obter_rota_mais_longa(G, 0, 1)
+        if not rotas:
+            assert rota is None
+            continue
+        assert rota['exato']
+        assert rota['custo'] == max(custo for _, custo in rotas)
+        assert (rota['caminho'], rota['custo']) in rotas
+
+
+def test_rota_mais_longa_em_dag():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from([('s', 'a', 1), ('a', 't', 1), ('s', 'b', 5), ('b', 'a', 5), ('s', 't', 3)])
+    assert obter_rota_mais_longa(G, 's', 't') == {'caminho': ['s', 'b', 'a', 't'], 'custo': 11, 'exato': True}
+
+
+def test_rota_mais_longa_com_tempo_limite_nao_retorna_none():
+    # s–c0–t mais uma clique de 25 nós pendurada em c0: a única rota é s, c0, t, mas uma busca sem poda
+    # percorreria a clique inteira antes de concluir.
+    G = nx.complete_graph([f"c{i}" for i in range(25)])
+    nx.set_edge_attributes(G, 1, 'weight')
+    G.add_edge('s', 'c0', weight=1)
+    G.add_edge('c0', 't', weight=1)
+    inicio = time.monotonic()
+    rota = obter_rota_mais_longa(G, 's', 't', tempo_limite=0.5)
+    assert time.monotonic() - inicio < 5
+    assert rota is not None
+    assert rota['caminho'] == ['s', 'c0', 't'] and rota['custo'] == 2
+
+
+def test_rota_mais_longa_interrompida_devolve_rota_valida():
+    G = nx.complete_graph(30)
+    rng = random.Random(3)
+    for u, v in G.edges:
+        G[u][v]['weight'] = rng.randint(1, 50)
+    rota = obter_rota_mais_longa(G, 0, 1, tempo_limite=0.2)
+    assert rota is not None
+    assert rota['caminho'][0] == 0 and rota['caminho'][-1] == 1
+    assert len(set(rota['caminho'])) == len(rota['caminho'])
+    assert nx.path_weight(G, rota['caminho'], 'weight') == rota['custo']
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from formato_grafo import abrir_grafo, carregar_grafo, salvar_grafo
+from nucleo_grafo import Grafo
+
+
+def grafo_aleatorio(e_direcionado, pesos_inteiros, semente=0):
+    rng = random.Random(semente)
+    grafo = Grafo(e_direcionado)
+    for i in range(30):
+        grafo.adicionar_no(f"N{i}", rng.uniform(-500, 500), rng.uniform(-500, 500))
+    grafo.adicionar_no("São Paulo")  # Rótulos não ASCII.
+    for _ in range(120):
+        peso = rng.randint(1, 99) if pesos_inteiros else rng.uniform(0.1, 99.9)
+        grafo.adicionar_aresta(f"N{rng.randrange(30)}", rng.choice([f"N{rng.randrange(30)}", "São Paulo"]), peso)
+    grafo.remover_no("N3")
+    return grafo
+
+
+def arestas(grafo):
+    if grafo.e_direcionado:
+        return sorted(grafo.arestas())
+    return sorted((min(u, v), max(u, v), peso) for u, v, peso in grafo.arestas())
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+@pytest.mark.parametrize('pesos_inteiros', [True, False])
+def test_salvar_e_abrir_preserva_o_grafo(tmp_path, e_direcionado, pesos_inteiros):
+    grafo = grafo_aleatorio(e_direcionado, pesos_inteiros)
+    caminho = tmp_path / "g.grafo"
+    salvar_grafo(caminho, grafo)
+
+    binario = abrir_grafo(caminho)
+    assert binario.e_direcionado == e_direcionado
+    assert binario.pesos_inteiros == pesos_inteiros
+    copia = binario.para_grafo()
+    assert copia.rotulos() == grafo.rotulos()
+    assert arestas(copia) == arestas(grafo)
+    assert all(type(peso) is (int if pesos_inteiros else float) for _, _, peso in copia.arestas())
+    assert all(copia.posicao(r) == grafo.posicao(r) for r in grafo.rotulos())
+
+    G = binario.para_networkx()
+    assert G.is_directed() == e_direcionado
+    assert G.number_of_nodes() == len(grafo) and G.number_of_edges() == grafo.numero_arestas()
+
+
+def test_salvar_e_abrir_grafo_vazio(tmp_path):
+    caminho = tmp_path / "vazio.grafo"
+    salvar_grafo(caminho, Grafo(True))
+    copia = carregar_grafo(caminho)
+    assert len(copia) == 0 and copia.numero_arestas() == 0 and copia.e_direcionado
+
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "lixo.grafo"
+    caminho.write_bytes(b"nao e um grafo" * 20)
+    with pytest.raises(ValueError):
+        abrir_grafo(caminho)
@@ -0,0 +1,30 @@
+import networkx as nx
+import pytest
+
+from formato_grafo import carregar_grafo
+from geradores import gerar_barabasi_albert, gerar_dag, gerar_gnm
+
+
+@pytest.mark.parametrize('gerar', [
+    lambda semente: gerar_gnm(200, 600, semente=semente),
+    lambda semente: gerar_gnm(100, 900, direcionado=True, semente=semente),
+    lambda semente: gerar_barabasi_albert(200, 3, semente=semente),
+    lambda semente: gerar_dag(150, 500, semente=semente),
+])
+def test_grafo_gerado_e_reprodutivel_e_grava(tmp_path, gerar):
+    gerado = gerar(5)
+    assert (gerar(5).origens == gerado.origens).all() and (gerar(5).pesos == gerado.pesos).all()
+
+    grafo = gerado.para_grafo()
+    assert grafo.numero_arestas() == gerado.numero_arestas  # Sem arestas repetidas nem laços.
+    assert all(u != v for u, v, _ in grafo.arestas())
+
+    caminho = tmp_path / "gerado.grafo"
+    gerado.salvar(caminho)
+    assert sorted(carregar_grafo(caminho).arestas()) == sorted(grafo.arestas())
+
+
+def test_dag_gerado_nao_tem_ciclos():
+    gerado = gerar_dag(300, 2000, semente=1)
+    assert gerado.e_direcionado
+    assert nx.is_directed_acyclic_graph(nx.DiGraph(zip(gerado.origens.tolist(), gerado.destinos.tolist())))
@@ -0,0 +1,70 @@
+import pytest
+
+from formato_grafo import carregar_grafo
+from importador import ImportadorArestas
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+def test_importador_remove_duplicadas_e_grava(tmp_path, e_direcionado):
+    lista = tmp_path / "arestas.csv"
+    lista.write_text("origem,destino,peso\n"
+                     "a,b,2\n"
+                     "b,c,1.5\n"
+                     "# comentário\n"
+                     "b,a,7\n"      # Repete a-b se não direcionado.
+                     "a,b,9\n"      # Sempre repetida: vale a primeira ocorrência.
+                     "c,d\n", encoding='utf-8')
+    importador = ImportadorArestas(e_direcionado)
+    estatisticas = importador.importar(str(lista))
+    esperadas = {('a', 'b'): 2, ('b', 'c'): 1.5, ('c', 'd'): 1}
+    if e_direcionado:
+        esperadas[('b', 'a')] = 7
+    assert estatisticas['arestas'] == len(esperadas)
+    assert estatisticas['duplicadas'] == 5 - len(esperadas)
+
+    grafo = importador.para_grafo()
+    assert {(u, v): peso for u, v, peso in grafo.arestas()} == esperadas
+
+    caminho = tmp_path / "arestas.grafo"
+    importador.salvar(caminho)
+    assert sorted(carregar_grafo(caminho).arestas()) == sorted(grafo.arestas())
+
+
+def importar_texto(tmp_path, texto, nome="arestas.csv", **opcoes):
+    lista = tmp_path / nome
+    lista.write_text(texto, encoding='utf-8')
+    importador = ImportadorArestas(**opcoes)
+    importador.importar(str(lista))
+    return sorted(importador.para_grafo().arestas())
+
+
+def test_cabecalho_sem_coluna_de_peso(tmp_path):
+    assert importar_texto(tmp_path, "source,target\na,b\nb,c\n") == [('a', 'b', 1), ('b', 'c', 1)]
+    # Nomes de coluna quaisquer exigem cabecalho=True; com cabecalho=False a primeira linha é uma aresta.
+    assert importar_texto(tmp_path, "de,para\na,b\n", cabecalho=True) == [('a', 'b', 1)]
+    assert importar_texto(tmp_path, "source,target\na,b\n", cabecalho=False) == [('a', 'b', 1),
+                                                                               ('source', 'target', 1)]
+
+
+def test_cabecalho_depois_de_comentario_e_linha_vazia(tmp_path):
+    texto = "# exportado em 2026\n\norigem,destino,peso\na,b,3\n"
+    assert importar_texto(tmp_path, texto) == [('a', 'b', 3)]
+
+
+def test_erro_informa_a_linha_do_arquivo(tmp_path):
+    texto = "# comentário\n\norigem,destino,peso\na,b,3\n\nb,c,x\n"
+    with pytest.raises(ValueError, match="Linha 6 inválida"):
+        importar_texto(tmp_path, texto)
+    # Sem cabeçalho, um peso inválido na primeira linha também é um erro.
+    with pytest.raises(ValueError, match="Linha 2 inválida"):
+        importar_texto(tmp_path, "\na,b,x\n", cabecalho=False)
+
+
+def test_separado_por_espacos_com_linhas_vazias(tmp_path):
+    texto = "a b 2\n\n\n   \nb c\n"
+    lista = tmp_path / "arestas.txt"
+    lista.write_text(texto, encoding='utf-8')
+    importador = ImportadorArestas()
+    estatisticas = importador.importar(str(lista), tamanho_bloco=2)  # Um bloco só de linhas vazias.
+    assert sorted(importador.para_grafo().arestas()) == [('a', 'b', 2), ('b', 'c', 1)]
+    assert estatisticas['linhas'] == 5
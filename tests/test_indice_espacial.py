@@ -0,0 +1,59 @@
+import random
+
+from indice_espacial import MAX_CELULAS_POR_CHAVE, GradeEspacial
+from layout_grafo import posicoes_circulares
+
+
+def pontos_do_segmento(x0, y0, x1, y1, passos=50):
+    return [(x0 + (x1 - x0) * k / passos, y0 + (y1 - y0) * k / passos) for k in range(passos + 1)]
+
+
+def test_arestas_longas_em_layout_grande_ocupam_memoria_limitada():
+    # Layout padrão de 20 mil nós (raio de ~160 mil unidades): uma aresta sorteada cruza milhares de células.
+    posicoes = posicoes_circulares(20_000).tolist()
+    rng = random.Random(0)
+    grade = GradeEspacial()
+    segmentos = {}
+    for chave in range(2000):
+        (x0, y0), (x1, y1) = rng.sample(posicoes, 2)
+        segmentos[chave] = (x0, y0, x1, y1)
+        grade.inserir_segmento(chave, x0, y0, x1, y1, margem=14)
+    assert len(grade) == 2000
+    assert grade.numero_registros <= MAX_CELULAS_POR_CHAVE * len(segmentos)
+    assert grade.longas  # As arestas que cruzam o círculo ficam fora das células.
+    for chave, (x0, y0, x1, y1) in list(segmentos.items())[:200]:
+        x, y = (x0 + x1) / 2, (y0 + y1) / 2
+        assert chave in grade.consultar(x - 1, y - 1, x + 1, y + 1)
+
+
+def test_consulta_nunca_omite_um_segmento_que_cruza_o_retangulo():
+    rng = random.Random(1)
+    grade = GradeEspacial(tamanho_celula=10.0, max_celulas=8)
+    segmentos = {}
+    for chave in range(300):
+        x0, y0 = rng.uniform(0, 400), rng.uniform(0, 400)
+        comprimento = rng.choice([5, 20, 300])
+        x1, y1 = x0 + rng.uniform(-comprimento, comprimento), y0 + rng.uniform(-comprimento, comprimento)
+        segmentos[chave] = (x0, y0, x1, y1)
+        grade.inserir_segmento(chave, x0, y0, x1, y1)
+    assert grade.longas and len(grade.longas) < len(segmentos)
+    for _ in range(200):
+        qx, qy, lado = rng.uniform(0, 400), rng.uniform(0, 400), rng.uniform(1, 40)
+        resultado = grade.consultar(qx, qy, qx + lado, qy + lado)
+        for chave, segmento in segmentos.items():
+            if any(qx <= x <= qx + lado and qy <= y <= qy + lado for x, y in pontos_do_segmento(*segmento)):
+                assert chave in resultado
+
+
+def test_reinserir_e_remover():
+    grade = GradeEspacial(tamanho_celula=10.0, max_celulas=4)
+    grade.inserir_caixa('a', 0, 0, 100, 100)  # 121 células: longa.
+    assert grade.longas == {'a'} and grade.numero_registros == 0
+    grade.inserir_caixa('a', 0, 0, 5, 5)      # Reinserida curta.
+    assert not grade.longas and grade.numero_registros == 1
+    assert grade.consultar(50, 50, 60, 60) == set()
+    grade.inserir_segmento('b', 0, 0, 1000, 1000)
+    assert 'b' in grade.consultar(500, 500, 501, 501)
+    grade.remover('b')
+    grade.remover('a')
+    assert len(grade) == 0 and not grade.longas and grade.consultar(0, 0, 1000, 1000) == set()
@@ -0,0 +1,19 @@
+import numpy as np
+
+from layout_grafo import ESPACAMENTO_NOS, posicoes_circulares
+
+
+def test_posicoes_circulares_padrao():
+    posicoes = posicoes_circulares(1000)
+    raio = ESPACAMENTO_NOS * 1000 / (2 * np.pi)
+    assert posicoes.shape == (1000, 2)
+    assert (posicoes >= -1e-9).all()  # O círculo encosta nos eixos.
+    assert np.allclose(np.hypot(*(posicoes - raio).T), raio)
+    assert np.allclose(posicoes_circulares(3)[0], [500.0, 250.0])  # Raio mínimo de 250.
+    assert posicoes_circulares(0).shape == (0, 2)
+
+
+def test_posicoes_circulares_com_centro_e_raio():
+    posicoes = posicoes_circulares(8, (100.0, -40.0), 30.0)
+    assert np.allclose(np.hypot(posicoes[:, 0] - 100.0, posicoes[:, 1] + 40.0), 30.0)
+    assert np.allclose(posicoes[0], [130.0, -40.0])
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Módulos que scripts, processos de trabalho e ferramentas de linha de comando importam sem a interface.
+MODULOS_SEM_PYQT5 = ['nucleo_grafo', 'analise_grafo', 'consultas_rotas', 'formato_grafo', 'importador', 'rotulos',
+                     'geradores', 'layout_grafo']
+
+
+def modulos_carregados(modulo):
+    """Importa `modulo` em um interpretador novo em que o PyQt5 não pode ser importado; retorna sys.modules."""
+    codigo = ("import sys; sys.modules['PyQt5'] = None; "  # Qualquer 'import PyQt5...' falha.
+              f"import {modulo}; print(' '.join(sys.modules))")
+    resultado = subprocess.run([sys.executable, '-c', codigo], cwd=SRC, capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    return set(resultado.stdout.split())
+
+
+@pytest.mark.parametrize('modulo', MODULOS_SEM_PYQT5)
+def test_modulo_importa_sem_pyqt5(modulo):
+    assert modulo in modulos_carregados(modulo)
+
+
+def test_analise_grafo_adia_networkx_e_numpy():
+    carregados = modulos_carregados('analise_grafo')
+    assert 'networkx' not in carregados and 'numpy' not in carregados
@@ -0,0 +1,131 @@
+import random
+
+import networkx as nx
+import pytest
+
+from nucleo_grafo import Grafo
+
+
+def para_networkx(grafo):
+    """Graph/DiGraph do NetworkX com os mesmos nós e arestas (com peso) do núcleo."""
+    G = nx.DiGraph() if grafo.e_direcionado else nx.Graph()
+    G.add_nodes_from(grafo.rotulos())
+    G.add_weighted_edges_from(grafo.arestas())
+    return G
+
+
+def assert_equivalentes(grafo, G):
+    assert len(grafo) == G.number_of_nodes()
+    assert grafo.numero_arestas() == G.number_of_edges()
+    assert set(grafo.rotulos()) == set(G.nodes)
+    H = para_networkx(grafo)
+    assert nx.utils.edges_equal(H.edges(data='weight'), G.edges(data='weight'))
+    for rotulo in G.nodes:
+        assert sorted(grafo.vizinhos(rotulo)) == sorted((v, d['weight']) for v, d in G.adj[rotulo].items())
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+@pytest.mark.parametrize('semente', range(5))
+def test_mutacoes_aleatorias_equivalem_ao_networkx(e_direcionado, semente):
+    rng = random.Random(semente)
+    grafo = Grafo(e_direcionado)
+    G = nx.DiGraph() if e_direcionado else nx.Graph()
+    proximo = 0
+    for _ in range(600):
+        nos = list(G.nodes)
+        operacao = rng.random()
+        if operacao < 0.25 or len(nos) < 2:
+            rotulo = f"N{proximo}"
+            proximo += 1
+            grafo.adicionar_no(rotulo, rng.random(), rng.random())
+            G.add_node(rotulo)
+        elif operacao < 0.6:
+            u, v = rng.sample(nos, 2)
+            peso = rng.choice([rng.randint(1, 9), round(rng.uniform(0.5, 9.5), 2)])
+            assert grafo.adicionar_aresta(u, v, peso) == (not G.has_edge(u, v))
+            if not G.has_edge(u, v):
+                G.add_edge(u, v, weight=peso)
+        elif operacao < 0.75:
+            u, v = rng.sample(nos, 2)
+            assert grafo.remover_aresta(u, v) == G.has_edge(u, v)
+            if G.has_edge(u, v):
+                G.remove_edge(u, v)
+        elif operacao < 0.85:
+            rotulo = rng.choice(nos)
+            assert grafo.remover_no(rotulo)
+            G.remove_node(rotulo)
+        elif operacao < 0.93 and G.number_of_edges():
+            u, v = rng.choice(list(G.edges))
+            assert grafo.definir_peso(u, v, 42)
+            G[u][v]['weight'] = 42
+        else:
+            rotulo, novo = rng.choice(nos), f"R{proximo}"
+            proximo += 1
+            grafo.renomear_no(rotulo, novo)
+            nx.relabel_nodes(G, {rotulo: novo}, copy=False)
+    assert_equivalentes(grafo, G)
+
+
+def test_observadores_recebem_os_eventos():
+    eventos = []
+    grafo = Grafo()
+    grafo.observar(lambda evento, *dados: eventos.append((evento,) + dados))
+    grafo.adicionar_no('A')
+    grafo.adicionar_no('B', 1.0, 2.0)
+    grafo.adicionar_aresta('A', 'B', 3)
+    grafo.definir_peso('B', 'A', 4)
+    grafo.renomear_no('B', 'C')
+    grafo.remover_no('A')
+    assert eventos == [('no_adicionado', 'A', 0.0, 0.0), ('no_adicionado', 'B', 1.0, 2.0),
+                       ('aresta_adicionada', 'A', 'B', 3), ('peso_alterado', 'A', 'B', 4),
+                       ('no_renomeado', 'B', 'C'), ('aresta_removida', 'A', 'C'), ('no_removido', 'A')]
+
+
+def test_versao_avanca_somente_com_alteracoes():
+    grafo = Grafo()
+    versoes = [grafo.versao]
+    for alteracao in (lambda: grafo.adicionar_no('A'), lambda: grafo.adicionar_no('B'),
+                      lambda: grafo.adicionar_aresta('A', 'B', 2), lambda: grafo.definir_peso('A', 'B', 5),
+                      lambda: grafo.renomear_no('B', 'C'), lambda: grafo.remover_aresta('A', 'C'),
+                      lambda: grafo.remover_no('C'), grafo.limpar):
+        alteracao()
+        versoes.append(grafo.versao)
+    assert versoes == sorted(set(versoes))  # Estritamente crescente, inclusive ao limpar.
+    grafo.adicionar_no('A')
+    versao = grafo.versao
+    assert not grafo.adicionar_aresta('A', 'X') and not grafo.remover_aresta('A', 'X')
+    assert not grafo.definir_peso('A', 'X', 1) and not grafo.remover_no('X')
+    grafo.adicionar_no('A')  # Já existe.
+    assert grafo.versao == versao
+
+
+@pytest.mark.parametrize('e_direcionado', [False, True])
+def test_exportar_e_carregar_indexado(e_direcionado):
+    rng = random.Random(7)
+    grafo = Grafo(e_direcionado)
+    for i in range(40):
+        grafo.adicionar_no(f"N{i}", i, -i)
+    for _ in range(150):
+        grafo.adicionar_aresta(f"N{rng.randrange(40)}", f"N{rng.randrange(40)}", rng.randint(1, 9))
+    for i in range(0, 40, 3):
+        grafo.remover_no(f"N{i}")  # Deixa lacunas nos ids internos.
+
+    copia = Grafo()
+    inseridas = copia.carregar_indexado(*grafo.exportar_indexado(), e_direcionado=e_direcionado)
+    assert inseridas == grafo.numero_arestas()
+    assert copia.e_direcionado == e_direcionado
+    assert_equivalentes(copia, para_networkx(grafo))
+    assert all(copia.posicao(r) == grafo.posicao(r) for r in grafo.rotulos())
+
+
+def test_carregar_indexado_ignora_repetidas_e_notifica():
+    eventos = []
+    grafo = Grafo()
+    grafo.observar(lambda evento, *dados: eventos.append(evento))
+    inseridas = grafo.carregar_indexado(['A', 'B', 'C'], [0, 1, 2], [0, 0, 0], [0, 1, 0], [1, 0, 2], [5, 6, 7])
+    assert inseridas == 2  # B-A repete A-B em um grafo não direcionado.
+    assert grafo.peso('B', 'A') == 5
+    assert eventos == ['limpo', 'no_adicionado', 'no_adicionado', 'no_adicionado',
+                       'aresta_adicionada', 'aresta_adicionada']
+    with pytest.raises(ValueError):
+        grafo.carregar_indexado(['A', 'A'], [0, 0], [0, 0], [], [], [])
@@ -0,0 +1,54 @@
+import random
+
+from nucleo_grafo import Grafo
+from rotulos import AlocadorRotulos, gerar_rotulos, indice_sequencial, resolver_rotulo, rotulo_sequencial
+
+
+def test_sequencia_de_rotulos():
+    rotulos = gerar_rotulos(800)
+    assert rotulos[:3] == ['A', 'B', 'C'] and rotulos[25:28] == ['Z', 'AA', 'AB'] and rotulos[701] == 'ZZ'
+    assert rotulos[702] == 'AAA'
+    assert rotulos == [rotulo_sequencial(i) for i in range(800)]
+    assert [indice_sequencial(r) for r in rotulos] == list(range(800))
+    assert indice_sequencial('a') is None and indice_sequencial('A1') is None and indice_sequencial('') is None
+
+
+def test_resolver_rotulo():
+    nos = {'A', 'b', 'Cidade'}
+    assert resolver_rotulo('A', nos) == 'A'
+    assert resolver_rotulo('a', nos) == 'A'
+    assert resolver_rotulo('b', nos) == 'b'
+    assert resolver_rotulo('cidade', nos) == 'cidade'  # Sem correspondência: o texto como digitado.
+
+
+def test_alocador_nao_repete_rotulos_liberados_duas_vezes():
+    grafo = Grafo()
+    alocador = AlocadorRotulos(grafo)
+    for rotulo in alocador.alocar_varios(3):
+        grafo.adicionar_no(rotulo)
+    grafo.remover_no('A')
+    grafo.renomear_no('B', 'A')  # Libera B.
+    grafo.remover_no('A')        # Libera A de novo.
+    rotulos = alocador.alocar_varios(3)
+    assert len(set(rotulos)) == 3
+    assert not set(rotulos) & set(grafo.rotulos())
+
+
+def test_alocador_sob_alteracoes_aleatorias():
+    rng = random.Random(0)
+    grafo = Grafo()
+    alocador = AlocadorRotulos(grafo)
+    for _ in range(2000):
+        operacao = rng.random()
+        if operacao < 0.5 or not len(grafo):
+            for rotulo in alocador.alocar_varios(rng.randint(1, 3)):
+                assert rotulo not in grafo
+                grafo.adicionar_no(rotulo)
+        elif operacao < 0.8:
+            grafo.remover_no(rng.choice(grafo.rotulos()))
+        else:
+            novo = rng.choice([rotulo_sequencial(rng.randrange(60)), f"x{rng.randrange(60)}"])
+            if novo not in grafo:
+                grafo.renomear_no(rng.choice(grafo.rotulos()), novo)
+    grafo.limpar()
+    assert alocador.alocar() == 'A'